@@ -4,3 +4,9 @@ class ClientConfig(AppConfig):
     
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.client'
+
+    # SQLite drops the search triggers whenever a migration rebuilds the table; they are restored after every migrate.
+    def ready(self):
+        from core.search import repair_after_migrate
+        from .logic.selectors import CLIENT_SEARCH
+        repair_after_migrate(self, CLIENT_SEARCH)
@@ -5,10 +5,22 @@ from .models import Client
 # Form to handle Client creation and updates
 
 class ClientForm(forms.ModelForm):
+
+    # Uniqueness is checked by the service layer, on normalized values, in a single query; a duplicate
+    # stored concurrently is caught there too and comes back as the same form error.
+    def validate_unique(self):
+        pass
+
     class Meta:
         
         # Link the form to the Client model.
         model = Client
         
         # Define user-editable fields.
-        fields = ['client_name', 'client_email', 'client_number']
\ No newline at end of file
+        fields = ['client_name', 'client_email', 'client_number']
+
+# Form to upload a file of clients to import.
+class ClientImportForm(forms.Form):
+
+    # CSV with a header row, or a JSON array of objects.
+    file = forms.FileField(label="Arquivo (CSV ou JSON)")
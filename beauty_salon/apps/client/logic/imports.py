@@ -0,0 +1,34 @@
+# Project imports.
+from core.imports import import_in_chunks
+
+# Local application imports.
+from ..models import Client
+from .services import CREATE_CONFLICT_MESSAGES, validate_client_data
+
+# Rows validated and inserted together.
+IMPORT_CHUNK_SIZE = 1000
+
+# Columns read from each imported record.
+IMPORT_FIELDS = ('client_name', 'client_email', 'client_number')
+
+# Messages for values repeated inside the same file.
+DUPLICATE_MESSAGES = {
+    'client_email': "Este e-mail está repetido no arquivo.",
+    'client_number': "Este número está repetido no arquivo.",
+}
+
+
+# Imports clients in chunks: one lookup query and one bulk insert per chunk.
+def import_clients(records, *, chunk_size: int = IMPORT_CHUNK_SIZE, start_row: int = 0, on_chunk=None) -> dict:
+    return import_in_chunks(
+        records,
+        model=Client,
+        fields=IMPORT_FIELDS,
+        validate=validate_client_data,
+        conflict_messages=CREATE_CONFLICT_MESSAGES,
+        duplicate_messages=DUPLICATE_MESSAGES,
+        race_message="Este e-mail ou número já está em uso.",
+        chunk_size=chunk_size,
+        start_row=start_row,
+        on_chunk=on_chunk,
+    )
@@ -1,13 +1,51 @@
 # Django imports.
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.db.models.query import QuerySet
 
+# Project imports.
+from core.search import SearchIndex, search_filter
+from core.validation import format_phone_prefix, normalize_email, only_digits
+
 # Local application imports.
 from ..models import Client
 
-# Retrieves all clients from the database.
-def client_list() -> QuerySet[Client]:
-    return Client.objects.all().order_by('client_name')
+# Shortest term the autocomplete searches for, and the most results it returns.
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_LIMIT = 10
+
+# Columns covered by the client search index (see migration 0004_client_search).
+CLIENT_SEARCH = SearchIndex(
+    table='client',
+    text_columns=('client_name', 'client_email'),
+    digit_columns=('client_number',),
+)
+
+# Retrieves all clients from the database, optionally only those matching a search.
+def client_list(*, search: str = '') -> QuerySet[Client]:
+    return search_filter(Client.objects.all(), CLIENT_SEARCH, search).order_by('client_name')
 
 # Retrieves a single client by their primary key.
 def get_client(*, pk: int) -> Client:
-    return Client.objects.get(pk=pk)
\ No newline at end of file
+    return Client.objects.get(pk=pk)
+
+# Finds clients whose name, email or phone starts with the term, in one indexed query.
+def search_clients(*, term: str, limit: int = AUTOCOMPLETE_LIMIT) -> list:
+    term = (term or '').strip()
+    if len(term) < AUTOCOMPLETE_MIN_LENGTH:
+        return []
+
+    # Name and email prefixes, compared the way the prefix indexes store them.
+    lookup = Q(name_key__startswith=term.upper()) | Q(client_email__startswith=normalize_email(term))
+
+    # Terms made of phone characters also match the stored, formatted number.
+    digits = only_digits(term)
+    if len(digits) >= AUTOCOMPLETE_MIN_LENGTH and not any(char.isalpha() for char in term):
+        lookup |= Q(client_number__startswith=format_phone_prefix(digits))
+
+    return list(
+        Client.objects.annotate(name_key=Upper('client_name'))
+        .filter(lookup)
+        .order_by('client_name', 'pk')
+        .values('pk', 'client_name', 'client_email', 'client_number')[:limit]
+    )
@@ -1,24 +1,45 @@
-# Python imports.
-import re
+# Django imports.
+from django.db import transaction
+
+# Project imports.
+from core.cache import bump_data_version
+from core.validation import (
+    email_domain_error,
+    find_conflicts,
+    format_phone,
+    is_full_name,
+    normalize_email,
+    only_digits,
+    reporting_conflicts,
+)
+from core.tracking import changed_fields, save_changed
 
 # Local application imports.
+from apps.scheduling.logic import rollups
+from apps.scheduling.models import Scheduling
 from ..models import Client
 from .exceptions import ValidationError
 
-# Define allowed email domains for validation.
-ALLOWED_DOMAINS = ["gmail", "hotmail", "outlook"]
+# Messages for each unique field already in use, on creation and on update.
+CREATE_CONFLICT_MESSAGES = {
+    'client_email': "Este e-mail já está em uso.",
+    'client_number': "Este número já está em uso.",
+}
+UPDATE_CONFLICT_MESSAGES = {
+    'client_email': "Este E-mail já está cadastrado por outro cliente.",
+    'client_number': "Este número já está cadastrado por outro cliente.",
+}
 
-# Handles the business logic for creating a new client.
-def client_create(*, client_name: str, client_email: str, client_number: str) -> Client:
+# Normalizes the client data and checks the rules that do not touch the database.
+def validate_client_data(*, client_name: str, client_email: str, client_number: str) -> tuple:
     # A list to aggregate validation errors.
     errors = []
-    
-    # Sanitize phone number to contain only digits for validation.
-    cleaned_number = re.sub(r'\D', '', client_number)
 
+    # Sanitize phone number to contain only digits for validation.
+    cleaned_number = only_digits(client_number)
 
     # Check if the client's name is a full name (at least two words).
-    if len(client_name.strip().split()) < 2:
+    if not is_full_name(client_name):
         errors.append("O nome do cliente deve ser completo.")
     
     # Check if the phone number has the correct amount of digits.
@@ -26,85 +47,86 @@ def client_create(*, client_name: str, client_email: str, client_number: str) ->
         errors.append("O número de telefone deve ter 11 dígitos (ex: (XX) XXXXX-XXXX).")
     
     # Check if the email domain is in the allowed list.
-    try: 
-        domain_part = client_email.split('@')[1]
-        main_domain = domain_part.split('.')[0]
-        if main_domain.lower() not in ALLOWED_DOMAINS:
-            errors.append(f"O domínio '{main_domain}' não é permitido. Use gmail, hotmail ou outlook.")
-    # Catches emails without an '@' symbol.
-    except IndexError:
-        errors.append("Formato de E-mail inválido.")
-    
-    # Check if the email is already in use.
-    if Client.objects.filter(client_email=client_email).exists():
-        errors.append("Este e-mail já está em uso.")
+    domain_error = email_domain_error(client_email)
+    if domain_error:
+        errors.append(domain_error)
+
+    # Values as they are stored: trimmed name, lowercase email and formatted number.
+    data = {
+        'client_name': client_name.strip(),
+        'client_email': normalize_email(client_email),
+        'client_number': format_phone(cleaned_number),
+    }
+    return errors, data
+
+# Handles the business logic for creating a new client.
+def client_create(*, client_name: str, client_email: str, client_number: str) -> Client:
+    # Normalize the input and check the field rules.
+    errors, data = validate_client_data(
+        client_name=client_name, client_email=client_email, client_number=client_number
+    )
+
+    # Check, in one query, whether the email or the number is already in use.
+    if not errors:
+        conflicts = find_conflicts(
+            Client.objects, {field: data[field] for field in CREATE_CONFLICT_MESSAGES}
+        )
+        errors.extend(message for field, message in CREATE_CONFLICT_MESSAGES.items() if field in conflicts)
 
     # If any validation failed, raise an exception with the full list of errors.
     if errors:
         raise ValidationError(errors)
     
-    # Reformat the cleaned number to a standard presentation format.
-    formatted_number = f"({cleaned_number[0:2]}) {cleaned_number[2:7]}-{cleaned_number[7:11]}"
-    
-    # If all validations pass, create the new client.
-    client = Client.objects.create(
-        client_name=client_name,
-        client_email=client_email,
-        client_number=formatted_number
-    )
+    # If all validations pass, create the new client; a duplicate stored meanwhile is reported like the ones found above.
+    unique_values = {field: data[field] for field in CREATE_CONFLICT_MESSAGES}
+    with reporting_conflicts(Client.objects, unique_values, CREATE_CONFLICT_MESSAGES, ValidationError):
+        client = Client.objects.create(**data)
+    bump_data_version(Client)
     return client
 
 # Handles the business logic for updating an existing client.
 def client_update(*, client: Client, data: dict) -> Client:
 
-    # A list to aggregate validation errors.
-    errors = []
-
-    # Safely retrieve new data from the input dictionary.
-    client_name = data.get('client_name', client.client_name)
-    client_email = data.get('client_email', client.client_email)
-    client_number = data.get('client_number', client.client_number)
-
-    # Sanitize phone number to contain only digits for validation.
-    cleaned_number = re.sub(r'\D', '', client_number)
-    
-    # Check if the client's name is a full name (at least two words).
-    if len(client_name.strip().split()) < 2:
-        errors.append("O nome do cliente deve ser completo.")
+    # Normalize the new data, falling back to the current values, and check the field rules.
+    errors, cleaned = validate_client_data(
+        client_name=data.get('client_name', client.client_name),
+        client_email=data.get('client_email', client.client_email),
+        client_number=data.get('client_number', client.client_number),
+    )
 
-    # Check if the phone number has the correct amount of digits.
-    if len(cleaned_number) != 11:
-        errors.append("O número de telefone deve ter 11 dígitos.")
+    # Fields whose normalized value differs from the stored one.
+    changed = changed_fields(client, cleaned)
 
-    # Check if the email domain is in the allowed list.
-    try:
-        domain_part = client_email.split('@')[1]
-        main_domain = domain_part.split('.')[0]
-        if main_domain.lower() not in ALLOWED_DOMAINS:
-            errors.append(f"O domínio '{main_domain}' não é permitido. Use gmail, hotmail ou outlook.")
-    # Catches emails without an '@' symbol.
-    except IndexError:
-        errors.append("Formato de E-mail inválido.")
-    
-    # Check if the email is already in use by another client.
-    if Client.objects.filter(client_email=client_email).exclude(pk=client.pk).exists(): 
-        errors.append("Este E-mail já está cadastrado por outro cliente.")
+    # Check, in one query, whether another client already uses a changed email or number.
+    if not errors:
+        conflicts = find_conflicts(
+            Client.objects,
+            {field: cleaned[field] for field in UPDATE_CONFLICT_MESSAGES if field in changed},
+            exclude_pk=client.pk,
+        )
+        errors.extend(message for field, message in UPDATE_CONFLICT_MESSAGES.items() if field in conflicts)
 
     # If any validation failed, raise an exception with the full list of errors.
     if errors:
         raise ValidationError(errors)
     
-    # Reformat the cleaned number to a standard presentation format.
-    formatted_number = f"({cleaned_number[0:2]}) {cleaned_number[2:7]}-{cleaned_number[7:11]}"
-    
-    # If validations pass, update the client instance fields.
-    client.client_name = client_name
-    client.client_email = client_email
-    client.client_number = formatted_number
-    client.save()
+    # If validations pass, update the client instance fields and write only the changed columns, reporting a duplicate stored meanwhile.
+    for field, value in cleaned.items():
+        setattr(client, field, value)
+    unique_values = {field: cleaned[field] for field in UPDATE_CONFLICT_MESSAGES if field in changed}
+    with reporting_conflicts(Client.objects, unique_values, UPDATE_CONFLICT_MESSAGES, ValidationError, exclude_pk=client.pk):
+        saved = save_changed(client, changed)
+    if saved:
+        bump_data_version(Client)
 
     return client
 
 # Handles the deletion of a client instance.
+@transaction.atomic
 def client_delete(*, client: Client):
-    client.delete()
\ No newline at end of file
+    # The completed schedulings deleted with the client leave the revenue rollup.
+    rollups.remove_client(client_id=client.pk)
+    client.delete()
+
+    # The client's schedulings are deleted with it.
+    bump_data_version(Client, Scheduling)
\ No newline at end of file
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Index serving the case-insensitive name prefix search of the autocomplete. The pattern operator
+# class lets LIKE 'prefix%' use it under any collation; it only exists on PostgreSQL, so other
+# databases keep scanning the (small) table. The email and phone prefix searches need no index of
+# their own: Django already creates a varchar_pattern_ops "_like" index for each unique CharField.
+PREFIX_INDEXES = {
+    'client_name_prefix_idx': 'UPPER(client_name) text_pattern_ops',
+}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, expression in PREFIX_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON client ({expression})')
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0002_alter_client_client_email_alter_client_client_name_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
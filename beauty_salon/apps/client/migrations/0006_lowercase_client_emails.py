@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower, Now
+
+
+# Lowercases the stored emails, as normalize_email does for new ones, so the exact-match conflict check finds them.
+def lowercase_emails(apps, schema_editor):
+    Client = apps.get_model('client', 'Client')
+    mixed_case = Client.objects.annotate(folded=Lower('client_email')).exclude(client_email=F('folded')).order_by('id')
+    for row in mixed_case.iterator():
+        folded = row.client_email.lower()
+
+        # Another client already stores the address in lowercase: the conflict check finds that row, so this one is left as is.
+        if Client.objects.filter(client_email=folded).exists():
+            continue
+        Client.objects.filter(pk=row.pk).update(client_email=folded, updated_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0005_client_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
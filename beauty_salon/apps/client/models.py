@@ -1,15 +1,22 @@
 
 # Django imports.
 from django.db import models
+from django.db.models.functions import Now
+
+# Project imports.
+from core.tracking import LoadedValuesMixin
 
 # Defines the Client data model.
-class Client(models.Model):
+class Client(LoadedValuesMixin, models.Model):
 
     # Fields of the model.
     client_name = models.CharField("Nome do Cliente", max_length=256, null=False)
     client_email = models.EmailField("E-mail", max_length=256, unique=True, null=False)
     client_number = models.CharField("Número do Cliente", max_length=20, unique=True, null=False)
 
+    # Time of the last change, read by the conditional GETs; rows inserted without it take the database time.
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True, db_default=Now())
+
     # String representation of the model.
     def __str__(self):
         return self.client_name
@@ -0,0 +1,224 @@
+# Python imports.
+import io
+import json
+from importlib import import_module
+from unittest import mock
+
+# Django imports.
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Project imports.
+from apps.scheduling.forms import SchedulingForm
+from core.imports import iter_records
+from core.search import repair_search_index
+from .logic import selectors, services
+from .logic.exceptions import ValidationError
+from .logic.imports import import_clients
+from .forms import ClientForm
+from .models import Client
+
+
+# Checks the uniqueness rules of the client services.
+class ClientUniquenessTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_row = services.client_create(
+            client_name="Bruno Lima", client_email="bruno@gmail.com", client_number="85977770000",
+        )
+
+    # The phone number is compared in its stored format.
+    def test_create_rejects_taken_number(self):
+        with self.assertNumQueries(1):
+            with self.assertRaises(ValidationError) as raised:
+                services.client_create(
+                    client_name="Carla Dias", client_email="carla@gmail.com", client_number="(85) 97777-0000",
+                )
+        self.assertEqual(raised.exception.errors, ["Este número já está em uso."])
+
+    def test_update_reports_other_clients_email(self):
+        other = services.client_create(
+            client_name="Carla Dias", client_email="carla@gmail.com", client_number="85966660000",
+        )
+        with self.assertRaises(ValidationError) as raised:
+            services.client_update(client=other, data={'client_email': "Bruno@gmail.com"})
+        self.assertEqual(raised.exception.errors, ["Este E-mail já está cadastrado por outro cliente."])
+
+    # Emails stored before normalization are lowercased by a migration, so the exact-match check finds them.
+    def test_mixed_case_emails_are_lowercased(self):
+        Client.objects.create(client_name="Ana Maria", client_email="Ana@gmail.com", client_number="(85) 95555-1234")
+        import_module('apps.client.migrations.0006_lowercase_client_emails').lowercase_emails(django_apps, None)
+        with self.assertRaises(ValidationError) as raised:
+            services.client_create(client_name="Ana Souza", client_email="ana@gmail.com", client_number="85955550000")
+        self.assertEqual(raised.exception.errors, ["Este e-mail já está em uso."])
+
+    # A duplicate stored between the check and the insert comes back as a form error, not a server error.
+    def test_concurrent_duplicate_is_a_form_error(self):
+        with mock.patch.object(services, 'find_conflicts', return_value=set()):
+            response = self.client.post(reverse('client:client-create'), {
+                'client_name': "Bruna Lima", 'client_email': "bruno@gmail.com", 'client_number': "85944440000",
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['form'].non_field_errors(), ["Este e-mail já está em uso."])
+        self.assertFalse(Client.objects.filter(client_name="Bruna Lima").exists())
+
+    # The form writes the posted values onto the instance; the service still compares them with the stored row.
+    def test_update_writes_only_changed_fields(self):
+        client = Client.objects.get(pk=self.client_row.pk)
+        form = ClientForm({'client_name': "Bruno Lima", 'client_email': "bruno@gmail.com", 'client_number': "85977770000"}, instance=client)
+        self.assertTrue(form.is_valid())
+        with self.assertNumQueries(0):
+            services.client_update(client=client, data=form.cleaned_data)
+
+        # A changed name is written alone, without the uniqueness query.
+        with CaptureQueriesContext(connection) as queries:
+            services.client_update(client=client, data={'client_name': "Bruno Lima Souza"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('client_email', queries[0]['sql'])
+        self.assertEqual(Client.objects.get(pk=client.pk).client_name, "Bruno Lima Souza")
+
+
+# Checks the chunked bulk import of clients.
+class ClientImportTests(TestCase):
+
+    def test_import_reports_invalid_and_duplicate_rows(self):
+        services.client_create(
+            client_name="Bruno Lima", client_email="bruno@gmail.com", client_number="85977770000",
+        )
+        stream = io.StringIO(
+            "client_name,client_email,client_number\n"
+            "Ana Souza,ana@gmail.com,85911110000\n"
+            "Carla,carla@gmail.com,85922220000\n"
+            "Daniel Rocha,ANA@gmail.com,85933330000\n"
+            "Eduarda Melo,eduarda@gmail.com,(85) 97777-0000\n"
+            "Felipe Dias,felipe@outlook.com,85944440000\n"
+        )
+
+        # One lookup, plus one insert (inside a savepoint), per chunk.
+        with self.assertNumQueries(4):
+            result = import_clients(iter_records(stream, 'csv'), chunk_size=10)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([row for row, _ in result['errors']], [2, 3, 4])
+        self.assertEqual(result['errors'][2][1], ["Este número já está em uso."])
+        self.assertTrue(Client.objects.filter(client_email="felipe@outlook.com", client_number="(85) 94444-0000").exists())
+
+    def test_json_upload_view(self):
+        upload = SimpleUploadedFile("clientes.json", json.dumps([
+            {"client_name": "Ana Souza", "client_email": "ana@gmail.com", "client_number": "85911110000"},
+            {"client_name": "Bruno Lima", "client_email": "bruno@yahoo.com", "client_number": "85922220000"},
+        ]).encode())
+        response = self.client.post(reverse('client:client-import'), {'file': upload})
+
+        self.assertEqual(response.context['created'], 1)
+        self.assertEqual(response.context['error_count'], 1)
+
+
+# Checks the client autocomplete used by the scheduling form.
+class ClientAutocompleteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for name, email, number in (
+            ("Ana Souza", "ana.souza@gmail.com", "85911110000"),
+            ("Bruno Lima", "bruno@gmail.com", "85922220000"),
+            ("Mariana Costa", "mari@hotmail.com", "11933330000"),
+        ):
+            services.client_create(client_name=name, client_email=email, client_number=number)
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, term: str) -> list:
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('client:client-autocomplete'), {'q': term})
+        return [result['name'] for result in response.json()['results']]
+
+    # Names, emails and phone numbers all match by prefix.
+    def test_prefix_search(self):
+        self.assertEqual(self.search("an"), ["Ana Souza"])
+        self.assertEqual(self.search("MARI"), ["Mariana Costa"])
+        self.assertEqual(self.search("(85) 9"), ["Ana Souza", "Bruno Lima"])
+        self.assertEqual(self.search("8592"), ["Bruno Lima"])
+
+    def test_short_terms_are_not_searched(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('client:client-autocomplete'), {'q': "a"})
+        self.assertEqual(response.json(), {'results': []})
+
+    # The scheduling form no longer lists every client.
+    def test_scheduling_form_renders_without_client_options(self):
+        client = Client.objects.get(client_name="Bruno Lima")
+        rendered = str(SchedulingForm(initial={'client': client.pk})['client'])
+        self.assertNotIn("Ana Souza", rendered)
+        self.assertIn('value="Bruno Lima · (85) 92222-0000"', rendered)
+
+
+# Checks the indexed client search of the list page.
+class ClientSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for name, email, number in (
+            ("José Conceição", "jose@gmail.com", "85911110000"),
+            ("Joana Souza", "joana.souza@hotmail.com", "85922220000"),
+            ("Márcia Lima", "marcia@outlook.com", "11933330000"),
+        ):
+            services.client_create(client_name=name, client_email=email, client_number=number)
+
+    def search(self, term: str) -> list:
+        return list(selectors.client_list(search=term).values_list('client_name', flat=True))
+
+    # Accents are ignored on both sides, and every word must match.
+    def test_accent_insensitive_words(self):
+        self.assertEqual(self.search("jose conceicao"), ["José Conceição"])
+        self.assertEqual(self.search("MARCIA"), ["Márcia Lima"])
+        self.assertEqual(self.search("souza"), ["Joana Souza"])
+        self.assertEqual(self.search("jo"), ["Joana Souza", "José Conceição"])
+
+    def test_phone_digits_and_updates(self):
+        self.assertEqual(self.search("(11) 9333"), ["Márcia Lima"])
+
+        client = Client.objects.get(client_name="Márcia Lima")
+        services.client_update(client=client, data={'client_name': "Márcia Andrade"})
+        self.assertEqual(self.search("andrade"), ["Márcia Andrade"])
+        self.assertEqual(self.search("lima"), [])
+
+    # Both backends match anywhere in the document, not only at the start of a word.
+    def test_substring_of_the_phone(self):
+        self.assertEqual(self.search("9111"), ["José Conceição"])
+        self.assertEqual(self.search("ouz"), ["Joana Souza"])
+
+    # SQLite without the trigram tokenizer searches the columns without an index, and without folding accents.
+    def test_fallback_before_sqlite_trigrams(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Only SQLite depends on its version for the search.")
+        with mock.patch.object(connection.Database, 'sqlite_version_info', (3, 31, 1)):
+            self.assertEqual(self.search("souza"), ["Joana Souza"])
+            self.assertEqual(self.search("9111"), ["José Conceição"])
+
+    # A table rebuild drops the SQLite triggers; the repair restores them and indexes the rows written meanwhile.
+    def test_repair_restores_dropped_triggers(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("The FTS5 triggers only exist on SQLite.")
+
+        with connection.cursor() as cursor:
+            for name in selectors.CLIENT_SEARCH.fts_triggers.values():
+                cursor.execute(f'DROP TRIGGER {name}')
+        services.client_create(client_name="Renata Alves", client_email="renata@gmail.com", client_number="85944440000")
+        self.assertEqual(self.search("renata"), [])
+
+        self.assertTrue(repair_search_index(connection, selectors.CLIENT_SEARCH))
+        self.assertEqual(self.search("renata"), ["Renata Alves"])
+        self.assertFalse(repair_search_index(connection, selectors.CLIENT_SEARCH))
+
+    def test_list_view_keeps_the_search_in_the_page_links(self):
+        response = self.client.get(reverse('client:client-list'), {'q': "conceição"})
+        self.assertEqual([client.client_name for client in response.context['page_obj']], ["José Conceição"])
+        self.assertEqual(response.context['search'], "conceição")
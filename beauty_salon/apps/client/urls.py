@@ -8,6 +8,8 @@ app_name = 'client'
 urlpatterns = [
     path('', ClientListView.as_view(), name='client-list'),
     path('create/', ClientCreateView.as_view(), name='client-create'),
+    path('import/', ClientImportView.as_view(), name='client-import'),
+    path('autocomplete/', ClientAutocompleteView.as_view(), name='client-autocomplete'),
     path('<int:pk>/update/', ClientUpdateView.as_view(), name='client-update'),
     path('<int:pk>/delete/', ClientDeleteView.as_view(), name='client-delete'),
 ]
\ No newline at end of file
@@ -1,32 +1,49 @@
 
 # Django imports.
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
+from django.template.response import TemplateResponse
 from django.views import View
 from django.core.paginator import Paginator
 
 # Local application imports.
-from .forms import ClientForm
+from core.imports import import_upload
+from core.conditional import conditional_by_instance, conditional_by_slice
+from core.pagecache import cache_page_by_version
+from .forms import ClientForm, ClientImportForm
+from .models import Client
 from .logic import selectors, services
-from .logic.exceptions import ValidationError  
+from .logic.exceptions import ValidationError
+from .logic.imports import import_clients
+
+# Rejected rows listed on the import result page.
+IMPORT_ERRORS_SHOWN = 200
+
+# Clients the list page is cut from, filtered by the optional search.
+def client_slice(request):
+    return selectors.client_list(search=request.GET.get('q', '').strip())
 
 # Handles the display and pagination of the client list.
 class ClientListView(View):
 
+    @conditional_by_slice(client_slice, Client)
+    @cache_page_by_version(Client)
     def get(self, request):
 
-        # Fetch all clients via the selector.
-        all_clients = selectors.client_list()
+        # Fetch the clients via the selector, filtered by the optional search.
+        search = request.GET.get('q', '').strip()
+        all_clients = selectors.client_list(search=search)
         
         # Paginate the results, showing 9 clients per page.
         paginator = Paginator(all_clients, 9) 
         page_number = request.GET.get('page')
         page_obj = paginator.get_page(page_number)
         
-        # Pass the page object to the template.
-        context = {'page_obj': page_obj}
+        # Pass the page object and the search to the template.
+        context = {'page_obj': page_obj, 'search': search}
 
         # Render the template.
-        return render(request, 'client/client_list.html', context)
+        return TemplateResponse(request, 'client/client_list.html', context)
 
 # Handles the creation of a new client.
 class ClientCreateView(View):
@@ -64,6 +81,7 @@ class ClientCreateView(View):
 class ClientUpdateView(View):
 
     # Displays the form pre-filled with existing client data.
+    @conditional_by_instance(Client)
     def get(self, request, pk: int):
 
         # Initialize the form with the existing client data.
@@ -108,4 +126,56 @@ class ClientDeleteView(View):
 
         services.client_delete(client=client)
 
-        return redirect('client:client-list')
\ No newline at end of file
+        return redirect('client:client-list')
+
+# Handles the bulk import of clients from an uploaded CSV or JSON file.
+class ClientImportView(View):
+
+    # Displays the upload form.
+    def get(self, request):
+
+        return render(request, 'client/client_import.html', {'form': ClientImportForm()})
+
+    # Imports the uploaded file and shows the per-row report.
+    def post(self, request):
+
+        form = ClientImportForm(request.POST, request.FILES)
+        context = {'form': form}
+
+        if form.is_valid():
+            try:
+
+                # Imports the uploaded file in chunks.
+                result = import_upload(form.cleaned_data['file'], import_clients)
+                context.update({
+                    'created': result['created'],
+                    'error_count': len(result['errors']),
+                    'errors': result['errors'][:IMPORT_ERRORS_SHOWN],
+                    'form': ClientImportForm(),
+                })
+            except ValueError as e:
+
+                # Unreadable files are reported on the form.
+                form.add_error('file', f"Não foi possível ler o arquivo: {e}")
+
+        return render(request, 'client/client_import.html', context)
+
+# Returns, as JSON, the clients matching a name, email or phone prefix.
+class ClientAutocompleteView(View):
+
+    # Handles GET requests with ?q=<term>.
+    def get(self, request):
+
+        # Search the clients via the selector.
+        clients = selectors.search_clients(term=request.GET.get('q', ''))
+
+        results = [
+            {
+                'id': client['pk'],
+                'name': client['client_name'],
+                'email': client['client_email'],
+                'number': client['client_number'],
+            }
+            for client in clients
+        ]
+        return JsonResponse({'results': results})
@@ -0,0 +1,27 @@
+# Django imports.
+from django import forms
+from django.urls import reverse
+
+# Local application imports.
+from .models import Client
+
+# Form widget that picks a client through the autocomplete endpoint instead of a full <select>.
+class ClientAutocompleteWidget(forms.Widget):
+
+    template_name = 'client/widgets/client_autocomplete.html'
+
+    # Adds the search URL and the label of the selected client.
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['search_url'] = reverse('client:client-autocomplete')
+        context['widget']['label'] = self.label_for(context['widget']['value'])
+        return context
+
+    # Returns "name · phone" of the selected client, looked up by primary key only.
+    def label_for(self, value) -> str:
+        try:
+            pk = int(value)
+        except (TypeError, ValueError):
+            return ''
+        client = Client.objects.filter(pk=pk).values_list('client_name', 'client_number').first()
+        return f"{client[0]} · {client[1]}" if client else ''
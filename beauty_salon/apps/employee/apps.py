@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class EmployeeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.employee'
+
+    # SQLite drops the search triggers whenever a migration rebuilds the table; they are restored after every migrate.
+    def ready(self):
+        from core.search import repair_after_migrate
+        from .logic.selectors import EMPLOYEE_SEARCH
+        repair_after_migrate(self, EMPLOYEE_SEARCH)
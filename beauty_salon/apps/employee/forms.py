@@ -5,6 +5,11 @@ from .models import Employee
 # Form to handle Employee creation and updates.
 class EmployeeForm(forms.ModelForm):
 
+    # Uniqueness is checked by the service layer, on normalized values, in a single query; a duplicate
+    # stored concurrently is caught there too and comes back as the same form error.
+    def validate_unique(self):
+        pass
+
     # Meta class to configure the form.
     class Meta:
         
@@ -12,4 +17,10 @@ class EmployeeForm(forms.ModelForm):
         model = Employee
         
         # Define user-editable fields.
-        fields = ['employee_name', 'employee_email', 'employee_number', 'employee_cpf']
\ No newline at end of file
+        fields = ['employee_name', 'employee_email', 'employee_number', 'employee_cpf']
+
+# Form to upload a file of employees to import.
+class EmployeeImportForm(forms.Form):
+
+    # CSV with a header row, or a JSON array of objects.
+    file = forms.FileField(label="Arquivo (CSV ou JSON)")
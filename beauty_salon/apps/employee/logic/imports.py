@@ -0,0 +1,35 @@
+# Project imports.
+from core.imports import import_in_chunks
+
+# Local application imports.
+from ..models import Employee
+from .services import CREATE_CONFLICT_MESSAGES, validate_employee_data
+
+# Rows validated and inserted together.
+IMPORT_CHUNK_SIZE = 1000
+
+# Columns read from each imported record.
+IMPORT_FIELDS = ('employee_name', 'employee_email', 'employee_number', 'employee_cpf')
+
+# Messages for values repeated inside the same file.
+DUPLICATE_MESSAGES = {
+    'employee_email': "Este e-mail está repetido no arquivo.",
+    'employee_number': "Este número está repetido no arquivo.",
+    'employee_cpf': "Este CPF está repetido no arquivo.",
+}
+
+
+# Imports employees in chunks: CPF check digits, phone and email domain are validated for every row.
+def import_employees(records, *, chunk_size: int = IMPORT_CHUNK_SIZE, start_row: int = 0, on_chunk=None) -> dict:
+    return import_in_chunks(
+        records,
+        model=Employee,
+        fields=IMPORT_FIELDS,
+        validate=validate_employee_data,
+        conflict_messages=CREATE_CONFLICT_MESSAGES,
+        duplicate_messages=DUPLICATE_MESSAGES,
+        race_message="Este e-mail, número ou CPF já está em uso.",
+        chunk_size=chunk_size,
+        start_row=start_row,
+        on_chunk=on_chunk,
+    )
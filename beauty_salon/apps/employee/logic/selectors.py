@@ -1,11 +1,24 @@
 # Django and project imports.
 from django.db.models.query import QuerySet
+from core.cache import versioned
+from core.search import SearchIndex, search_filter
 from ..models import Employee
 
-# Retrieves all employees from the database.
-def employee_list() -> QuerySet[Employee]:
-    return Employee.objects.all().order_by('employee_name')
+# Columns covered by the employee search index (see migration 0002_employee_search).
+EMPLOYEE_SEARCH = SearchIndex(
+    table='employee',
+    text_columns=('employee_name', 'employee_email'),
+    digit_columns=('employee_number', 'employee_cpf'),
+)
+
+# Retrieves all employees from the database, optionally only those matching a search.
+def employee_list(*, search: str = '') -> QuerySet[Employee]:
+    return search_filter(Employee.objects.all(), EMPLOYEE_SEARCH, search).order_by('employee_name')
 
 # Retrieves a single employee by their primary key.
 def get_employee(*, pk: int) -> Employee:
-    return Employee.objects.get(pk=pk)
\ No newline at end of file
+    return Employee.objects.get(pk=pk)
+
+# Retrieves every employee, ordered by name, from the versioned catalog cache.
+def employee_catalog() -> list[Employee]:
+    return versioned(Employee, 'catalog', lambda: list(employee_list()))
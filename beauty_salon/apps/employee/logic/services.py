@@ -1,25 +1,55 @@
-# Python imports.
-import re
+# Django imports.
+from django.db import transaction
+from django.utils import timezone
+
+# Project imports.
+from core.cache import bump_data_version
+from core.validation import (
+    email_domain_error,
+    find_conflicts,
+    format_cpf,
+    format_phone,
+    is_full_name,
+    is_valid_cpf,
+    normalize_email,
+    only_digits,
+    reporting_conflicts,
+)
+from core.tracking import changed_fields, save_changed
 
 # Local application imports.
+from apps.scheduling.logic import rollups
+from apps.scheduling.models import Scheduling
 from ..models import Employee
 from .exceptions import ValidationError
 
-# Define allowed email domains for validation.
-ALLOWED_DOMAINS = ["gmail", "hotmail", "outlook"]
-
-# Handles the business logic for creating a new employee.
-def employee_create(*, employee_name: str, employee_email: str, employee_number: str, employee_cpf: str) -> Employee:
+# Messages for each unique field already in use, on creation and on update.
+CREATE_CONFLICT_MESSAGES = {
+    'employee_email': "Este e-mail já está em uso.",
+    'employee_number': "Este número já está em uso.",
+    'employee_cpf': "Este CPF já está em uso.",
+}
+UPDATE_CONFLICT_MESSAGES = {
+    'employee_email': "Este E-mail já está cadastrado por outro funcionário.",
+    'employee_number': "Este número já está cadastrado por outro funcionário.",
+    'employee_cpf': "Este CPF já está cadastrado por outro funcionário.",
+}
+
+# Message for a cpf whose check digits do not match.
+INVALID_CPF_MESSAGE = "O CPF informado é inválido."
+
+# Normalizes the employee data and checks the rules that do not touch the database.
+def validate_employee_data(*, employee_name: str, employee_email: str, employee_number: str, employee_cpf: str,
+                           check_cpf_digits: bool = True) -> tuple:
     # A list to aggregate validation errors.
     errors = []
     
     # Sanitize number and cpf to contain only digits for validation.
-    cleaned_number = re.sub(r'\D', '', employee_number)
-    cleaned_cpf = re.sub(r'\D', '', employee_cpf)
-
+    cleaned_number = only_digits(employee_number)
+    cleaned_cpf = only_digits(employee_cpf)
 
     # Check if the employee's name is a full name (at least two words).
-    if len(employee_name.strip().split()) < 2:
+    if not is_full_name(employee_name):
         errors.append("O nome do funcionário deve ser completo.")
     
     # Check if the phone number has the correct amount of digits.
@@ -29,113 +59,109 @@ def employee_create(*, employee_name: str, employee_email: str, employee_number:
     # Check if the cpf has the correct amount of digits.
     if len(cleaned_cpf) != 11:
         errors.append("O CPF deve ter 11 dígitos.")
+
+    # Check the cpf check digits.
+    elif check_cpf_digits and not is_valid_cpf(cleaned_cpf):
+        errors.append(INVALID_CPF_MESSAGE)
     
     # Check if the email domain is in the allowed list.
-    try: 
-        domain_part = employee_email.split('@')[1]
-        main_domain = domain_part.split('.')[0]
-        if main_domain.lower() not in ALLOWED_DOMAINS:
-            errors.append(f"O domínio '{main_domain}' não é permitido. Use gmail, hotmail ou outlook.")
-    # Catches emails without an '@' symbol.
-    except IndexError:
-        errors.append("Formato de E-mail inválido.")
-    
-    # Check if the email is already in use.
-    if Employee.objects.filter(employee_email=employee_email).exists():
-        errors.append("Este e-mail já está em uso.")
+    domain_error = email_domain_error(employee_email)
+    if domain_error:
+        errors.append(domain_error)
+
+    # Values as they are stored: trimmed name, lowercase email, formatted number and cpf.
+    data = {
+        'employee_name': employee_name.strip(),
+        'employee_email': normalize_email(employee_email),
+        'employee_number': format_phone(cleaned_number),
+        'employee_cpf': format_cpf(cleaned_cpf),
+    }
+    return errors, data
 
-    # Check if the number is already in use.
-    if Employee.objects.filter(employee_number=employee_number).exists():
-        errors.append("Este número já está em uso.")
-    
-    # Check if the cpf is already in use.
-    if Employee.objects.filter(employee_cpf=employee_cpf).exists():
-        errors.append("Este CPF já está em uso.")
+# Handles the business logic for creating a new employee.
+def employee_create(*, employee_name: str, employee_email: str, employee_number: str, employee_cpf: str) -> Employee:
+    # Normalize the input and check the field rules.
+    errors, data = validate_employee_data(
+        employee_name=employee_name,
+        employee_email=employee_email,
+        employee_number=employee_number,
+        employee_cpf=employee_cpf,
+    )
+
+    # Check, in one query, whether the email, the number or the cpf is already in use.
+    if not errors:
+        conflicts = find_conflicts(
+            Employee.objects, {field: data[field] for field in CREATE_CONFLICT_MESSAGES}
+        )
+        errors.extend(message for field, message in CREATE_CONFLICT_MESSAGES.items() if field in conflicts)
 
     # If any validation failed, raise an exception with the full list of errors.
     if errors:
         raise ValidationError(errors)
     
-    # Reformat the cleaned number and cpf to a standard presentation format.
-    formatted_number = f"({cleaned_number[0:2]}) {cleaned_number[2:7]}-{cleaned_number[7:11]}"
-    formatted_cpf = f"{cleaned_cpf[0:3]}.{cleaned_cpf[3:6]}.{cleaned_cpf[6:9]}-{cleaned_cpf[9:11]}"
-    
-    # If all validations pass, create the new employee.
-    employee = Employee.objects.create(
-        employee_name=employee_name,
-        employee_email=employee_email,
-        employee_number=formatted_number,
-        employee_cpf=formatted_cpf
-    )
+    # If all validations pass, create the new employee; a duplicate stored meanwhile is reported like the ones found above.
+    unique_values = {field: data[field] for field in CREATE_CONFLICT_MESSAGES}
+    with reporting_conflicts(Employee.objects, unique_values, CREATE_CONFLICT_MESSAGES, ValidationError):
+        employee = Employee.objects.create(**data)
+
+    # Invalidate the cached catalog.
+    bump_data_version(Employee)
     return employee
 
 # Handles the business logic for updating an existing employee.
 def employee_update(*, employee: Employee, data: dict) -> Employee:
 
-    # A list to aggregate validation errors.
-    errors = []
-
-    # Safely retrieve new data from the input dictionary.
-    employee_name = data.get('employee_name', employee.employee_name)
-    employee_email = data.get('employee_email', employee.employee_email)
-    employee_number = data.get('employee_number', employee.employee_number)
-    employee_cpf = data.get('employee_cpf', employee.employee_cpf)
+    # Normalize the new data, falling back to the current values, and check the field rules.
+    errors, cleaned = validate_employee_data(
+        employee_name=data.get('employee_name', employee.employee_name),
+        employee_email=data.get('employee_email', employee.employee_email),
+        employee_number=data.get('employee_number', employee.employee_number),
+        employee_cpf=data.get('employee_cpf', employee.employee_cpf),
+        check_cpf_digits=False,
+    )
 
-    # Sanitize number and cpf to contain only digits for validation.
-    cleaned_number = re.sub(r'\D', '', employee_number)
-    cleaned_cpf = re.sub(r'\D', '', employee_cpf)
-    
-    # Check if the employee's name is a full name (at least two words).
-    if len(employee_name.strip().split()) < 2:
-        errors.append("O nome do funcionário deve ser completo.")
+    # Fields whose normalized value differs from the stored one.
+    changed = changed_fields(employee, cleaned)
 
-    # Check if the phone number has the correct amount of digits.
-    if len(cleaned_number) != 11:
-        errors.append("O número de telefone deve ter 11 dígitos.")
-    
-    # Check if the cpf has the correct amount of digits.
-    if len(cleaned_cpf) != 11:
-        errors.append("O CPF deve ter 11 dígitos.")
+    # Employees registered before the check digit rule must stay editable, so only a new cpf has its digits checked.
+    cpf_digits = only_digits(cleaned['employee_cpf'])
+    if 'employee_cpf' in changed and len(cpf_digits) == 11 and not is_valid_cpf(cpf_digits):
+        errors.append(INVALID_CPF_MESSAGE)
 
-    # Check if the email domain is in the allowed list.
-    try:
-        domain_part = employee_email.split('@')[1]
-        main_domain = domain_part.split('.')[0]
-        if main_domain.lower() not in ALLOWED_DOMAINS:
-            errors.append(f"O domínio '{main_domain}' não é permitido. Use gmail, hotmail ou outlook.")
-    # Catches emails without an '@' symbol.
-    except IndexError:
-        errors.append("Formato de E-mail inválido.")
-    
-    # Check if the email is already in use by another employee.
-    if Employee.objects.filter(employee_email=employee_email).exclude(pk=employee.pk).exists(): 
-        errors.append("Este E-mail já está cadastrado por outro funcionário.")
-    
-    # Check if the number is already in use by another employee.
-    if Employee.objects.filter(employee_number=employee_number).exclude(pk=employee.pk).exists(): 
-        errors.append("Este número já está cadastrado por outro funcionário.")
-    
-    # Check if the cpf is already in use by another employee.
-    if Employee.objects.filter(employee_cpf=employee_cpf).exclude(pk=employee.pk).exists(): 
-        errors.append("Este CPF já está cadastrado por outro funcionário.")
+    # Check, in one query, whether another employee already uses a changed email, number or cpf.
+    if not errors:
+        conflicts = find_conflicts(
+            Employee.objects,
+            {field: cleaned[field] for field in UPDATE_CONFLICT_MESSAGES if field in changed},
+            exclude_pk=employee.pk,
+        )
+        errors.extend(message for field, message in UPDATE_CONFLICT_MESSAGES.items() if field in conflicts)
 
     # If any validation failed, raise an exception with the full list of errors.
     if errors:
         raise ValidationError(errors)
     
-    # Reformat the cleaned number and cpf to a standard presentation format.
-    formatted_number = f"({cleaned_number[0:2]}) {cleaned_number[2:7]}-{cleaned_number[7:11]}"
-    formatted_cpf = f"{cleaned_cpf[0:3]}.{cleaned_cpf[3:6]}.{cleaned_cpf[6:9]}-{cleaned_cpf[9:11]}"
-    
-    # If validations pass, update the employee instance fields.
-    employee.employee_name = employee_name
-    employee.employee_email = employee_email
-    employee.employee_number = formatted_number
-    employee.employee_cpf = formatted_cpf
-    employee.save()
+    # If validations pass, update the employee instance fields and write only the changed columns, reporting a duplicate stored meanwhile.
+    for field, value in cleaned.items():
+        setattr(employee, field, value)
+    unique_values = {field: cleaned[field] for field in UPDATE_CONFLICT_MESSAGES if field in changed}
+    with reporting_conflicts(Employee.objects, unique_values, UPDATE_CONFLICT_MESSAGES, ValidationError, exclude_pk=employee.pk):
+        saved = save_changed(employee, changed)
+    if saved:
+        bump_data_version(Employee)
 
     return employee
 
 # Handles the deletion of a employee instance.
+@transaction.atomic
 def employee_delete(*, employee: Employee):
-    employee.delete()
\ No newline at end of file
+
+    # The employee's revenue buckets are merged into the ones without a professional.
+    rollups.unassign_professional(professional_id=employee.pk)
+
+    # The delete nulls the professional of the employee's schedulings without saving them, so their change time is moved here.
+    employee.schedulings.update(updated_at=timezone.now())
+    employee.delete()
+
+    # The employee's schedulings lose their professional.
+    bump_data_version(Employee, Scheduling)
\ No newline at end of file
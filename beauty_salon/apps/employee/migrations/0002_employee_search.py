@@ -0,0 +1,109 @@
+from django.db import migrations
+
+# Accented letters folded by search_normalize(), in both cases, and what they fold to.
+ACCENTED = 'áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ'
+UNACCENTED = 'aaaaaeeeeiiiiooooouuuucnaaaaaeeeeiiiiooooouuuucn'
+
+# Normalized document of a row, as of this migration; the search queries the same expression.
+DOCUMENT_SQL = (
+    "search_normalize(employee_name || ' ' || employee_email || ' ' || replace(replace(replace(replace(replace(employee_number, '(', ''), ')', ''), ' ', ''), '-', ''), '.', '') || ' ' || replace(replace(replace(replace(replace(employee_cpf, '(', ''), ')', ''), ' ', ''), '-', ''), '.', ''))"
+)
+
+# Trigram index on the document, built when pg_trgm is available.
+TRIGRAM_INDEX = 'employee_search_trgm_idx'
+
+# Searched columns on SQLite, as of this migration: text columns, then formatted numbers searched by their digits.
+TEXT_COLUMNS = ('employee_name', 'employee_email')
+DIGIT_COLUMNS = ('employee_number', 'employee_cpf')
+
+# FTS5 table holding the normalized document of each row on SQLite, and the triggers keeping it in sync.
+FTS_TABLE = 'employee_search'
+TRIGGERS = {event: f'{FTS_TABLE}_{event}' for event in ('insert', 'delete', 'update')}
+
+# The FTS5 trigram tokenizer needs SQLite 3.34; older versions search without an index (see core.search).
+TRIGRAM_SQLITE_VERSION = (3, 34, 0)
+
+
+# SQL of the normalized document of a row (lowercase, no accents, digits without punctuation). SQLite has
+# no translate(), so the accents are folded by replace() chains, nested in subqueries to stay within the
+# depth its parser accepts.
+def document_sql(prefix: str = '') -> str:
+    columns = [f'{prefix}{column}' for column in TEXT_COLUMNS]
+    for column in DIGIT_COLUMNS:
+        expression = f'{prefix}{column}'
+        for char in '() -.':
+            expression = f"replace({expression}, '{char}', '')"
+        columns.append(expression)
+    query = "SELECT lower({}) AS document".format(" || ' ' || ".join(columns))
+    pairs = list(zip(ACCENTED, UNACCENTED))
+    for start in range(0, len(pairs), 16):
+        expression = 'document'
+        for accented, unaccented in pairs[start:start + 16]:
+            expression = f"replace({expression}, '{accented}', '{unaccented}')"
+        query = f"SELECT {expression} AS document FROM ({query})"
+    return f"({query})"
+
+
+# Creates the search structures: a trigram index on PostgreSQL, a trigram FTS5 table on SQLite. Both
+# match substrings of the same normalized document ("9111" finds "(85) 91111-0000").
+def create_employee_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        create_postgresql_search(schema_editor)
+    elif vendor == 'sqlite' and schema_editor.connection.Database.sqlite_version_info >= TRIGRAM_SQLITE_VERSION:
+        create_sqlite_search(schema_editor)
+
+
+def drop_employee_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+    elif vendor == 'sqlite':
+        for name in TRIGGERS.values():
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+# PostgreSQL: an accent folding function and a trigram index on the document.
+def create_postgresql_search(schema_editor):
+
+    # An immutable accent folding function, so it can be indexed (unaccent() is not immutable).
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION search_normalize(text) RETURNS text AS "
+        f"$$ SELECT translate(lower($1), '{ACCENTED}', '{UNACCENTED}') $$ "
+        "LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE"
+    )
+
+    # Without pg_trgm the search still works, unindexed.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        has_trigrams = cursor.fetchone() is not None
+    if has_trigrams:
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON employee USING gin (({DOCUMENT_SQL}) gin_trgm_ops)'
+        )
+
+
+# SQLite: an FTS5 table with the trigram tokenizer, filled and kept in sync by triggers.
+def create_sqlite_search(schema_editor):
+    schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document, tokenize = 'trigram')")
+    schema_editor.execute(f'INSERT INTO {FTS_TABLE} (rowid, document) SELECT id, {document_sql()} FROM employee')
+
+    # Table rebuilds by later migrations drop these triggers; core.search restores them after every migrate.
+    insert = f'INSERT INTO {FTS_TABLE} (rowid, document) VALUES (new.id, {document_sql("new.")});'
+    delete = f'DELETE FROM {FTS_TABLE} WHERE rowid = old.id;'
+    bodies = {'insert': insert, 'delete': delete, 'update': delete + ' ' + insert}
+    for event, name in TRIGGERS.items():
+        schema_editor.execute(f'CREATE TRIGGER {name} AFTER {event.upper()} ON employee BEGIN {bodies[event]} END')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_employee_search, drop_employee_search),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower, Now
+
+
+# Lowercases the stored emails, as normalize_email does for new ones, so the exact-match conflict check finds them.
+def lowercase_emails(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    mixed_case = Employee.objects.annotate(folded=Lower('employee_email')).exclude(employee_email=F('folded')).order_by('id')
+    for row in mixed_case.iterator():
+        folded = row.employee_email.lower()
+
+        # Another employee already stores the address in lowercase: the conflict check finds that row, so this one is left as is.
+        if Employee.objects.filter(employee_email=folded).exists():
+            continue
+        Employee.objects.filter(pk=row.pk).update(employee_email=folded, updated_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0003_employee_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,12 @@
 # Django imports.
 from django.db import models
+from django.db.models.functions import Now
+
+# Project imports.
+from core.tracking import LoadedValuesMixin
 
 # Defines the Employee data model.
-class Employee(models.Model):
+class Employee(LoadedValuesMixin, models.Model):
 
     # Field for the employee's name.
     employee_name = models.CharField("Name of Employee",max_length=256, null=False)
@@ -16,6 +20,9 @@ class Employee(models.Model):
     # Field for the employee's CPF (Brazilian ID).
     employee_cpf = models.CharField("CPF of Employee",max_length=14, unique=True, null=False)
 
+    # Time of the last change, read by the conditional GETs.
+    updated_at = models.DateTimeField("Updated at", auto_now=True, db_default=Now())
+
     # String representation of the model.
     def __str__(self):
         # Returns the employee's name.
@@ -1,3 +1,151 @@
+# Python imports.
+from unittest import mock
+
+# Django imports.
 from django.test import TestCase
 
-# Create your tests here.
+# Project imports.
+from core.management.commands.seeddata import build_cpf
+from .logic import selectors, services
+from .logic.exceptions import ValidationError
+from .logic.imports import import_employees
+from .models import Employee
+
+
+# Checks the uniqueness rules of the employee services.
+class EmployeeUniquenessTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = services.employee_create(
+            employee_name="Ana Souza",
+            employee_email="ana@gmail.com",
+            employee_number="85988880000",
+            employee_cpf="52998224725",
+        )
+
+    # Raw input collides with the stored, formatted values, and every collision is reported by one query.
+    def test_create_reports_every_conflict_in_one_query(self):
+        with self.assertNumQueries(1):
+            with self.assertRaises(ValidationError) as raised:
+                services.employee_create(
+                    employee_name="Outra Pessoa",
+                    employee_email=" ANA@gmail.com",
+                    employee_number="(85) 98888-0000",
+                    employee_cpf="529.982.247-25",
+                )
+        self.assertEqual(raised.exception.errors, [
+            "Este e-mail já está em uso.",
+            "Este número já está em uso.",
+            "Este CPF já está em uso.",
+        ])
+
+    def test_update_ignores_own_values(self):
+        services.employee_update(employee=self.employee, data={'employee_name': "Ana Souza Lima"})
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).employee_name, "Ana Souza Lima")
+
+    # A cpf stored before the check digit rule stays editable, but a new cpf must have valid digits.
+    def test_update_checks_digits_of_a_new_cpf(self):
+        Employee.objects.filter(pk=self.employee.pk).update(employee_cpf="111.222.333-44")
+        employee = Employee.objects.get(pk=self.employee.pk)
+        services.employee_update(employee=employee, data={'employee_name': "Ana Souza Lima"})
+        with self.assertRaises(ValidationError) as raised:
+            services.employee_update(employee=employee, data={'employee_cpf': "111.222.333-45"})
+        self.assertEqual(raised.exception.errors, ["O CPF informado é inválido."])
+
+    # A cpf stored by another employee between the check and the update is reported like the check would.
+    def test_concurrent_duplicate_on_update(self):
+        other = services.employee_create(
+            employee_name="Bia Lima", employee_email="bia@gmail.com", employee_number="85977770000", employee_cpf="11144477735",
+        )
+        with mock.patch.object(services, 'find_conflicts', return_value=set()):
+            with self.assertRaises(ValidationError) as raised:
+                services.employee_update(employee=other, data={'employee_cpf': "529.982.247-25"})
+        self.assertEqual(raised.exception.errors, ["Este CPF já está cadastrado por outro funcionário."])
+
+    # Unchanged values are neither checked nor written; a changed unique value is checked, then written under a savepoint.
+    def test_update_skips_unchanged_fields(self):
+        employee = Employee.objects.get(pk=self.employee.pk)
+        with self.assertNumQueries(0):
+            services.employee_update(employee=employee, data={'employee_cpf': "529.982.247-25", 'employee_email': "ANA@gmail.com"})
+        with self.assertNumQueries(4):
+            services.employee_update(employee=employee, data={'employee_email': "ana.souza@gmail.com"})
+        self.assertEqual(Employee.objects.get(pk=employee.pk).employee_email, "ana.souza@gmail.com")
+
+    def test_stored_values_are_normalized(self):
+        self.assertEqual(self.employee.employee_number, "(85) 98888-0000")
+        self.assertEqual(self.employee.employee_cpf, "529.982.247-25")
+
+    def test_create_rejects_invalid_check_digits(self):
+        with self.assertRaises(ValidationError) as raised:
+            services.employee_create(
+                employee_name="Outra Pessoa",
+                employee_email="outra@gmail.com",
+                employee_number="85977770000",
+                employee_cpf="111.111.111-11",
+            )
+        self.assertEqual(raised.exception.errors, ["O CPF informado é inválido."])
+
+
+# Checks the chunked bulk import of employees.
+class EmployeeImportTests(TestCase):
+
+    # Builds an import record with unique values.
+    def record(self, index: int, **overrides) -> dict:
+        record = {
+            'employee_name': f"Profissional Numero {index}",
+            'employee_email': f"prof{index}@gmail.com",
+            'employee_number': f"8598{index:07d}",
+            'employee_cpf': build_cpf(index + 1),
+        }
+        record.update(overrides)
+        return record
+
+    def test_import_validates_and_deduplicates(self):
+        records = [
+            self.record(1),
+            self.record(2, employee_cpf="529.982.247-26"),
+            self.record(3, employee_cpf=build_cpf(2)),
+            self.record(4, employee_email="PROF1@gmail.com"),
+            self.record(5),
+        ]
+
+        # One lookup, plus one insert (inside a savepoint), per chunk.
+        with self.assertNumQueries(8):
+            result = import_employees(records, chunk_size=3)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['errors'], [
+            (2, ["O CPF informado é inválido."]),
+            (3, ["Este CPF está repetido no arquivo."]),
+            (4, ["Este e-mail está repetido no arquivo."]),
+        ])
+
+    # A resumed import skips the rows of the chunks already committed.
+    def test_import_resumes_after_last_committed_row(self):
+        records = [self.record(index) for index in range(1, 8)]
+        progress = []
+        import_employees(records[:4], chunk_size=2, on_chunk=lambda row, created: progress.append(row))
+        self.assertEqual(progress, [2, 4])
+
+        result = import_employees(records, chunk_size=2, start_row=progress[-1])
+        self.assertEqual(result, {'created': 3, 'errors': []})
+        self.assertEqual(Employee.objects.count(), 7)
+
+
+# Checks the indexed employee search of the list page.
+class EmployeeSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        services.employee_create(
+            employee_name="Antônio Araújo",
+            employee_email="antonio@gmail.com",
+            employee_number="85988880000",
+            employee_cpf="529.982.247-25",
+        )
+
+    def test_search_by_accentless_name_and_cpf(self):
+        self.assertEqual(selectors.employee_list(search="antonio araujo").count(), 1)
+        self.assertEqual(selectors.employee_list(search="529.982").count(), 1)
+        self.assertEqual(selectors.employee_list(search="maria").count(), 0)
@@ -8,6 +8,7 @@ app_name = 'employee'
 urlpatterns = [
     path('', EmployeeListView.as_view(), name='employee-list'),
     path('create/', EmployeeCreateView.as_view(), name='employee-create'),
+    path('import/', EmployeeImportView.as_view(), name='employee-import'),
     path('<int:pk>/update/', EmployeeUpdateView.as_view(), name='employee-update'),
     path('<int:pk>/delete/', EmployeeDeleteView.as_view(), name='employee-delete'),
 ]
\ No newline at end of file
@@ -1,32 +1,48 @@
 # Django imports.
 from django.shortcuts import render, redirect
+from django.template.response import TemplateResponse
 from django.views import View
 from django.core.paginator import Paginator
 
 # Local application imports.
-from .forms import EmployeeForm
+from core.imports import import_upload
+from core.conditional import conditional_by_instance, conditional_by_slice
+from core.pagecache import cache_page_by_version
+from .forms import EmployeeForm, EmployeeImportForm
+from .models import Employee
 from .logic import selectors, services
-from .logic.exceptions import ValidationError 
+from .logic.exceptions import ValidationError
+from .logic.imports import import_employees
+
+# Rejected rows listed on the import result page.
+IMPORT_ERRORS_SHOWN = 200
+
+# Employees the list page is cut from, filtered by the optional search.
+def employee_slice(request):
+    return selectors.employee_list(search=request.GET.get('q', '').strip())
 
 # Handles the display and pagination of the employee list.
 class EmployeeListView(View):
 
     # Fetches all employees and paginates them.
+    @conditional_by_slice(employee_slice, Employee)
+    @cache_page_by_version(Employee)
     def get(self, request):
 
-        # Fetch all employees via the selector.
-        all_employees = selectors.employee_list()
+        # Fetch the matching employees, or all of them from the cached catalog.
+        search = request.GET.get('q', '').strip()
+        all_employees = selectors.employee_list(search=search) if search else selectors.employee_catalog()
         
         # Paginate the results, showing 9 employees per page.
         paginator = Paginator(all_employees, 9) 
         page_number = request.GET.get('page')
         page_obj = paginator.get_page(page_number)
         
-        # Pass the page object to the template.
-        context = {'page_obj': page_obj}
+        # Pass the page object and the search to the template.
+        context = {'page_obj': page_obj, 'search': search}
 
         # Render the template.
-        return render(request, 'employee/employee_list.html', context)
+        return TemplateResponse(request, 'employee/employee_list.html', context)
 
 # Handles the creation of a new employee.
 class EmployeeCreateView(View):
@@ -64,6 +80,7 @@ class EmployeeCreateView(View):
 class EmployeeUpdateView(View):
 
     # Displays the form pre-filled with existing employee data.
+    @conditional_by_instance(Employee)
     def get(self, request, pk: int):
 
         # Initialize the form with the existing employee data.
@@ -109,4 +126,36 @@ class EmployeeDeleteView(View):
 
         services.employee_delete(employee=employee)
 
-        return redirect('employee:employee-list')
\ No newline at end of file
+        return redirect('employee:employee-list')
+
+# Handles the bulk import of employees from an uploaded CSV or JSON file.
+class EmployeeImportView(View):
+
+    # Displays the upload form.
+    def get(self, request):
+
+        return render(request, 'employee/employee_import.html', {'form': EmployeeImportForm()})
+
+    # Imports the uploaded file and shows the per-row report.
+    def post(self, request):
+
+        form = EmployeeImportForm(request.POST, request.FILES)
+        context = {'form': form}
+
+        if form.is_valid():
+            try:
+
+                # Imports the uploaded file in chunks.
+                result = import_upload(form.cleaned_data['file'], import_employees)
+                context.update({
+                    'created': result['created'],
+                    'error_count': len(result['errors']),
+                    'errors': result['errors'][:IMPORT_ERRORS_SHOWN],
+                    'form': EmployeeImportForm(),
+                })
+            except ValueError as e:
+
+                # Unreadable files are reported on the form.
+                form.add_error('file', f"Não foi possível ler o arquivo: {e}")
+
+        return render(request, 'employee/employee_import.html', context)
@@ -12,12 +12,13 @@ class SalonServiceForm(forms.ModelForm):
         model = SalonService
         
         # Defines the fields to be included in the form.
-        fields = ['name_of_service', 'value_of_service']
+        fields = ['name_of_service', 'value_of_service', 'duration_of_service']
 
         # Custom labels for the form fields.
         labels = {
             'name_of_service': 'Nome do Serviço',
             'value_of_service': 'Valor do Serviço',
+            'duration_of_service': 'Duração (minutos)',
         }
 
         # Specifies custom widgets and their attributes for form fields.
@@ -27,4 +28,8 @@ class SalonServiceForm(forms.ModelForm):
                 'step': '0.01',        
                 'placeholder': 'R$ 0.00'
             }),
+            'duration_of_service': forms.NumberInput(attrs={
+                'min': '1',
+                'step': '5',
+            }),
         }
\ No newline at end of file
@@ -1,5 +1,6 @@
 # Django and project imports.
 from django.db.models.query import QuerySet
+from core.cache import versioned
 from ..models import SalonService
 
 # Retrieves a list of all salon services, ordered by their name.
@@ -8,4 +9,8 @@ def salon_service_list() -> QuerySet[SalonService]:
 
 # Retrieves a single salon service by its primary key (pk).
 def get_salon_service(*, pk: int) -> SalonService:
-    return SalonService.objects.get(pk=pk)
\ No newline at end of file
+    return SalonService.objects.get(pk=pk)
+
+# Retrieves every salon service, ordered by name, from the versioned catalog cache.
+def salon_service_catalog() -> list[SalonService]:
+    return versioned(SalonService, 'catalog', lambda: list(salon_service_list()))
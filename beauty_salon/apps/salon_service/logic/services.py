@@ -1,10 +1,12 @@
 # Django and project imports.
 from decimal import Decimal
+from core.cache import bump_data_version
+from apps.scheduling.models import Scheduling
 from ..models import SalonService
 from .exceptions import ValidationError
 
 # Creates a new salon service after validating the input data.
-def create_salon_service(*, name_of_service: str, value_of_service: Decimal) -> SalonService:
+def create_salon_service(*, name_of_service: str, value_of_service: Decimal, duration_of_service: int = 30) -> SalonService:
 
     # List of validation errors.
     errors = []
@@ -17,6 +19,10 @@ def create_salon_service(*, name_of_service: str, value_of_service: Decimal) ->
     if value_of_service <= Decimal("0.0"):
         errors.append('O valor do serviço deve ser maior que R$ 0,00.')
 
+    # Check if the duration of the service is at least one minute.
+    if duration_of_service is None or duration_of_service <= 0:
+        errors.append('A duração do serviço deve ser de pelo menos 1 minuto.')
+
     # Raises a custom exception if any validation errors are found.
     if errors:
         raise ValidationError(errors)
@@ -24,9 +30,13 @@ def create_salon_service(*, name_of_service: str, value_of_service: Decimal) ->
     # Create a new salon service instance.
     salon_service = SalonService.objects.create(
         name_of_service=name_of_service,
-        value_of_service=value_of_service
+        value_of_service=value_of_service,
+        duration_of_service=duration_of_service
     )
 
+    # Invalidate the cached catalog.
+    bump_data_version(SalonService)
+
     # Return the created salon service instance.
     return salon_service
 
@@ -39,6 +49,7 @@ def update_service(*, salon_service: SalonService, data: dict) -> SalonService:
     # Get the values of the salon service to be updated.
     name_of_service = data.get('name_of_service', salon_service.name_of_service)
     value_of_service = data.get('value_of_service', salon_service.value_of_service)
+    duration_of_service = data.get('duration_of_service', salon_service.duration_of_service)
 
     # Validate the name of the service.
     if not name_of_service or not name_of_service.strip():
@@ -47,6 +58,10 @@ def update_service(*, salon_service: SalonService, data: dict) -> SalonService:
     # Check if the value of the service is greater than zero.
     if value_of_service <= Decimal('0.0'):
         errors.append('O valor do serviço não pode ser zerado ou negativo.')
+
+    # Check if the duration of the service is at least one minute.
+    if duration_of_service is None or duration_of_service <= 0:
+        errors.append('A duração do serviço deve ser de pelo menos 1 minuto.')
     
     # Raises a custom exception if any validation errors are found.
     if errors:
@@ -55,10 +70,16 @@ def update_service(*, salon_service: SalonService, data: dict) -> SalonService:
     # Update the salon service instance.
     salon_service.name_of_service = name_of_service
     salon_service.value_of_service = value_of_service
+    salon_service.duration_of_service = duration_of_service
 
     # Return the updated salon service instance.
-    return salon_service.save()
+    salon_service.save()
+    bump_data_version(SalonService)
+    return salon_service
 
 # Deletes a specific salon service instance.
 def delete_service(*, salon_service: SalonService):
-    salon_service.delete()
\ No newline at end of file
+    salon_service.delete()
+
+    # The schedulings of the service are deleted with it.
+    bump_data_version(SalonService, Scheduling)
\ No newline at end of file
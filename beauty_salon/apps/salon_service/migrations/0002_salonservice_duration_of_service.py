@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_service', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salonservice',
+            name='duration_of_service',
+            field=models.PositiveIntegerField(default=30, verbose_name='Duration of service'),
+        ),
+    ]
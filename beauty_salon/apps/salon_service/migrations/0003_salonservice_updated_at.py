@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:23
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salon_service', '0002_salonservice_duration_of_service'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salonservice',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now(), verbose_name='Updated at'),
+        ),
+    ]
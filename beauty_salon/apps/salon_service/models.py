@@ -1,5 +1,6 @@
 # Django and project imports
 from django.db import models
+from django.db.models.functions import Now
 
 # Model representing a service offered by a salon.
 class SalonService(models.Model):
@@ -10,6 +11,12 @@ class SalonService(models.Model):
     # The monetary value of the service.
     value_of_service = models.DecimalField("Value of service", max_digits=8,decimal_places=2, null=False)
 
+    # How long the service takes, in minutes.
+    duration_of_service = models.PositiveIntegerField("Duration of service", default=30, null=False)
+
+    # Time of the last change, read by the conditional GETs.
+    updated_at = models.DateTimeField("Updated at", auto_now=True, db_default=Now())
+
     # Returns a string representation of the object.
     def __str__(self):
         
@@ -1,3 +1,39 @@
+# Python imports.
+from decimal import Decimal
+
+# Django imports.
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+# Project imports.
+from apps.scheduling.forms import SchedulingForm
+from .logic import selectors, services
+
+
+# Checks the versioned catalog cache of salon services.
+class SalonServiceCatalogTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.service = services.create_salon_service(name_of_service="Corte", value_of_service=Decimal("50.00"))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_catalog_is_cached_until_a_service_changes(self):
+        with self.assertNumQueries(1):
+            selectors.salon_service_catalog()
+        with self.assertNumQueries(0):
+            self.assertEqual([service.name_of_service for service in selectors.salon_service_catalog()], ["Corte"])
+
+        services.update_service(salon_service=self.service, data={'name_of_service': "Corte Feminino"})
+        with self.assertNumQueries(1):
+            self.assertEqual(selectors.salon_service_catalog()[0].name_of_service, "Corte Feminino")
+
+    # The scheduling form renders its service and professional options without queries once cached.
+    def test_scheduling_form_reads_the_catalogs(self):
+        SchedulingForm()
+        form = SchedulingForm()
+        with self.assertNumQueries(0):
+            rendered = str(form['salon_service']) + str(form['professional'])
+        self.assertIn(f'<option value="{self.service.pk}">Corte</option>', rendered)
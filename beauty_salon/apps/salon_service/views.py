@@ -1,11 +1,17 @@
 
 # Django imports.
 from django.shortcuts import render, redirect
+from django.template.response import TemplateResponse
 from django.views import View
 from django.core.paginator import Paginator
 
+# Project imports.
+from core.conditional import conditional_by_instance, conditional_by_slice
+from core.pagecache import cache_page_by_version
+
 # Local application imports.
 from .forms import SalonServiceForm
+from .models import SalonService
 from .logic import selectors, services
 from .logic.exceptions import ValidationError
 
@@ -14,10 +20,12 @@ from .logic.exceptions import ValidationError
 class SalonServiceListView(View):
 
     # Handles GET requests to display the list.
+    @conditional_by_slice(lambda request: selectors.salon_service_list(), SalonService)
+    @cache_page_by_version(SalonService)
     def get(self, request):
 
-        # Fetch all salon services via the selector.
-        all_services = selectors.salon_service_list()
+        # Fetch all salon services from the cached catalog.
+        all_services = selectors.salon_service_catalog()
 
         # Paginate the results, showing 9 services per page.
         paginator = Paginator(all_services, 9)
@@ -28,7 +36,7 @@ class SalonServiceListView(View):
         context = {'page_obj': page_obj}
 
         # Render the template.
-        return render(request, 'salon_service/salon_service_list.html', context)
+        return TemplateResponse(request, 'salon_service/salon_service_list.html', context)
     
 # View for creating a new salon service.
 class SalonServiceCreateView(View):
@@ -67,6 +75,7 @@ class SalonServiceCreateView(View):
 class SalonServiceUpdateView(View):
 
     # Handles GET requests to display the update form with pre-filled data.
+    @conditional_by_instance(SalonService)
     def get(self, request, pk: int):
         salon_service = selectors.get_salon_service(pk=pk)
         form = SalonServiceForm(instance=salon_service)
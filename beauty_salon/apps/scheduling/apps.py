@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
 
 
 class SchedulingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.scheduling'
+
+    # Loads the availability index of each server process before its first request, when enabled.
+    def ready(self):
+        if settings.AVAILABILITY_WARM_UP:
+            request_started.connect(warm_up_availability, dispatch_uid='warm-up-availability')
+
+
+# Rebuilds the availability index once; the database is not read while the apps are still loading.
+def warm_up_availability(**kwargs):
+    from .logic.availability import availability
+    request_started.disconnect(dispatch_uid='warm-up-availability')
+    availability.rebuild()
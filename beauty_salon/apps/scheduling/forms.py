@@ -1,5 +1,8 @@
 # Django and project imports.
 from django import forms
+from apps.client.widgets import ClientAutocompleteWidget
+from apps.employee.logic.selectors import employee_catalog
+from apps.salon_service.logic.selectors import salon_service_catalog
 from .models import Scheduling
 
 # Form to handle Scheduling creation and updates.
@@ -11,6 +14,12 @@ class SchedulingForm(forms.ModelForm):
         if self.instance and self.instance.pk:
             self.fields['client'].disabled = True
 
+        # Render the professional and service options from the cached catalogs;
+        # submitted values are still validated against the database.
+        for name, catalog in (('professional', employee_catalog()), ('salon_service', salon_service_catalog())):
+            field = self.fields[name]
+            field.choices = [('', field.empty_label)] + [(item.pk, str(item)) for item in catalog]
+
     class Meta:
         # Link the form to the Scheduling model.
         model = Scheduling
@@ -20,6 +29,7 @@ class SchedulingForm(forms.ModelForm):
 
         # Add widgets for better user experience.
         widgets = {
+            'client': ClientAutocompleteWidget(),
             'date': forms.DateInput(format=('%Y-%m-%d'), attrs={'type': 'date'}),
             'time': forms.TimeInput(attrs={'type': 'time'}),
         }
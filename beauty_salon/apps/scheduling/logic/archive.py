@@ -0,0 +1,54 @@
+# Python imports.
+from datetime import date as Date
+
+# Django imports.
+from django.db import transaction
+from django.utils import timezone
+
+# Project imports.
+from core.cache import bump_data_version
+from ..models import ArchivedScheduling, Scheduling
+
+# Final statuses; active schedulings (Scheduled, In Progress) always stay in the live table.
+ARCHIVED_STATUSES = ('Concluído', 'Cancelado')
+
+# Columns copied from the live table to the archive.
+ARCHIVE_FIELDS = ('id', 'client_id', 'professional_id', 'salon_service_id', 'date', 'time', 'status', 'updated_at')
+
+# Rows moved per transaction.
+ARCHIVE_BATCH_SIZE = 1000
+
+
+# Moves the completed and canceled schedulings dated before `before` to the archive table.
+def archive_schedulings(*, before: Date, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Each batch is copied and deleted in its own short transaction, with the rows
+    locked and their status re-checked, so a scheduling edited meanwhile is left
+    in place. The daily revenue rollup is not touched: it keeps counting the
+    archived rows. Returns the number of rows moved.
+    """
+    eligible = Scheduling.objects.filter(date__lt=before, status__in=ARCHIVED_STATUSES)
+    moved = 0
+
+    while True:
+        ids = list(eligible.order_by('date', 'time', 'id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+
+        with transaction.atomic():
+            rows = list(eligible.select_for_update().filter(id__in=ids).values(*ARCHIVE_FIELDS))
+            if rows:
+                archived_at = timezone.now()
+                ArchivedScheduling.objects.bulk_create([
+                    ArchivedScheduling(archived_at=archived_at, **row) for row in rows
+                ])
+                Scheduling.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+
+        # Rows that changed status since the id query are skipped; stop if nothing is left to move.
+        if len(ids) < batch_size:
+            break
+
+    if moved:
+        bump_data_version(Scheduling, ArchivedScheduling)
+    return moved
@@ -0,0 +1,168 @@
+# Python imports.
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, time
+from itertools import accumulate
+
+# Django imports.
+from django.conf import settings
+from django.utils import timezone
+
+# Project imports.
+from ..models import Scheduling
+
+# Statuses that keep a professional busy.
+BUSY_STATUSES = ('Agendado', 'Executando')
+
+
+# Converts a time of day into minutes since midnight.
+def to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+# Converts minutes since midnight back into a time of day.
+def to_time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+# Reads an 'HH:MM' setting as minutes since midnight.
+def _setting_minutes(name: str) -> int:
+    return to_minutes(datetime.strptime(getattr(settings, name), '%H:%M').time())
+
+
+# Returns the salon's opening window and slot step, in minutes.
+def business_hours() -> tuple:
+    return (
+        _setting_minutes('SALON_OPENING_TIME'),
+        _setting_minutes('SALON_CLOSING_TIME'),
+        settings.SCHEDULING_SLOT_MINUTES,
+    )
+
+
+# Booked intervals of one professional on one day, kept sorted by start.
+class DaySchedule:
+    """
+    Stores [start, end) intervals in minutes sorted by start, alongside the running
+    maximum of their ends. A candidate [start, end) is free when every interval that
+    starts before `end` has already finished by `start`, which is one bisect plus one
+    lookup in the running maximum, so overlapping legacy bookings are handled too.
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+        self._reindex()
+
+    # Recomputes the running maximum of the interval ends.
+    def _reindex(self):
+        self.starts = [start for start, _end, _pk in self.intervals]
+        self.max_ends = list(accumulate((end for _start, end, _pk in self.intervals), max))
+
+    def __len__(self):
+        return len(self.intervals)
+
+    # Inserts a booking.
+    def add(self, start: int, end: int, scheduling_id: int):
+        insort(self.intervals, (start, end, scheduling_id))
+        self._reindex()
+
+    # Removes a booking, if present.
+    def discard(self, scheduling_id: int):
+        self.intervals = [interval for interval in self.intervals if interval[2] != scheduling_id]
+        self._reindex()
+
+    # Checks whether [start, end) overlaps no booking, ignoring `exclude_id`.
+    def is_free(self, start: int, end: int, *, exclude_id: int = None) -> bool:
+        if exclude_id is not None:
+            return DaySchedule(
+                interval for interval in self.intervals if interval[2] != exclude_id
+            ).is_free(start, end)
+
+        # Intervals [0, index) start before the candidate ends.
+        index = bisect_left(self.starts, end)
+        return index == 0 or self.max_ends[index - 1] <= start
+
+    # Lists the start of every free slot of `duration` minutes inside [opening, closing).
+    def free_slots(self, duration: int, opening: int, closing: int, step: int) -> list:
+        return [
+            start
+            for start in range(opening, closing - duration + 1, step)
+            if self.is_free(start, start + duration)
+        ]
+
+
+# In-memory interval index of busy slots per (professional, date).
+class AvailabilityIndex:
+    """
+    Answers "is this slot free" and "which slots are free" from memory. Each
+    (professional, date) bucket is loaded from the database the first time it is
+    asked for; `rebuild()` loads every upcoming booking at once, to warm the index
+    up. Each process keeps its own copy, so the write path refreshes the affected
+    bucket from the database before trusting it.
+    """
+
+    def __init__(self):
+        self._days = {}
+        self._rebuilt_from = None
+        self._lock = threading.RLock()
+
+    # Fetches the busy intervals matching the filters, grouped per (professional, date).
+    @staticmethod
+    def _load(**filters) -> dict:
+        rows = Scheduling.objects.filter(
+            status__in=BUSY_STATUSES, professional__isnull=False, **filters
+        ).values_list('pk', 'professional_id', 'date', 'time', 'salon_service__duration_of_service')
+
+        days = {}
+        for pk, professional_id, day, start_time, duration in rows:
+            start = to_minutes(start_time)
+            days.setdefault((professional_id, day), []).append((start, start + duration, pk))
+        return {key: DaySchedule(intervals) for key, intervals in days.items()}
+
+    # Reloads every upcoming booking from the database.
+    def rebuild(self):
+        today = timezone.localdate()
+        days = self._load(date__gte=today)
+        with self._lock:
+            self._days = days
+            self._rebuilt_from = today
+
+    # Reloads the bookings of a single professional on a single day; the bucket then counts as loaded.
+    def refresh(self, *, professional_id: int, day: date) -> DaySchedule:
+        schedule = self._load(professional_id=professional_id, date=day).get((professional_id, day), DaySchedule())
+        with self._lock:
+            self._days[(professional_id, day)] = schedule
+        return schedule
+
+    # Drops everything; the next lookups reload from the database.
+    def clear(self):
+        with self._lock:
+            self._days = {}
+            self._rebuilt_from = None
+
+    # Returns the schedule of a professional on a day, loading that bucket if needed.
+    def day_schedule(self, *, professional_id: int, day: date) -> DaySchedule:
+        with self._lock:
+            schedule = self._days.get((professional_id, day))
+            if schedule is not None:
+                return schedule
+
+            # After a rebuild, a missing upcoming bucket is a day without bookings.
+            if self._rebuilt_from is not None and day >= self._rebuilt_from:
+                return DaySchedule()
+        return self.refresh(professional_id=professional_id, day=day)
+
+    # Checks whether a professional is free for `duration` minutes from `start_time`.
+    def is_free(self, *, professional_id: int, day: date, start_time: time, duration: int, exclude_id: int = None) -> bool:
+        start = to_minutes(start_time)
+        schedule = self.day_schedule(professional_id=professional_id, day=day)
+        return schedule.is_free(start, start + duration, exclude_id=exclude_id)
+
+    # Lists the start times at which a professional can take a service of `duration` minutes.
+    def free_slots(self, *, professional_id: int, day: date, duration: int) -> list:
+        opening, closing, step = business_hours()
+        schedule = self.day_schedule(professional_id=professional_id, day=day)
+        return [to_time(start) for start in schedule.free_slots(duration, opening, closing, step)]
+
+
+# Process-wide availability index.
+availability = AvailabilityIndex()
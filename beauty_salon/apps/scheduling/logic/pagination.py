@@ -0,0 +1,152 @@
+# Python imports.
+import base64
+import binascii
+from datetime import date, time
+
+# Django imports.
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
+# Ordering used to seek through schedulings; the id breaks ties between equal slots.
+KEYSET_ORDERING = ('date', 'time', 'id')
+
+# Cursor directions.
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+# Encodes a direction and an optional (date, time, id) key into an opaque cursor.
+def encode_cursor(direction: str, key: tuple = None) -> str:
+    raw = direction
+    if key is not None:
+        raw = f"{direction}|{key[0].isoformat()}|{key[1].isoformat()}|{key[2]}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+# Decodes an opaque cursor, returning (None, None) for a missing or tampered value.
+def decode_cursor(cursor: str) -> tuple:
+    if not cursor:
+        return None, None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        direction, *parts = raw.split('|')
+        if direction not in (NEXT, PREVIOUS):
+            return None, None
+        if not parts:
+            return direction, None
+        return direction, (date.fromisoformat(parts[0]), time.fromisoformat(parts[1]), int(parts[2]))
+    except (binascii.Error, UnicodeDecodeError, ValueError, IndexError):
+        return None, None
+
+
+# A single page of rows, mirroring the parts of django.core.paginator.Page the templates use.
+class KeysetPage:
+
+    def __init__(self, object_list: list, *, has_next: bool, has_previous: bool):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    # Cursor of the page that follows the last row.
+    @property
+    def next_cursor(self) -> str:
+        if not self._has_next or not self.object_list:
+            return ''
+        last = self.object_list[-1]
+        return encode_cursor(NEXT, (last.date, last.time, last.pk))
+
+    # Cursor of the page that precedes the first row.
+    @property
+    def previous_cursor(self) -> str:
+        if not self._has_previous:
+            return ''
+
+        # A stale or tampered cursor can point past the last row; step back to the last page.
+        if not self.object_list:
+            return self.last_cursor
+        first = self.object_list[0]
+        return encode_cursor(PREVIOUS, (first.date, first.time, first.pk))
+
+    # Cursor of the last page, read backwards from the end of the index.
+    @property
+    def last_cursor(self) -> str:
+        return encode_cursor(PREVIOUS)
+
+
+# Seek (keyset) paginator over schedulings ordered by (date, time, id).
+class KeysetPaginator:
+    """
+    Paginates without COUNT(*) or OFFSET: every page is a range read that starts
+    right after (or before) the key encoded in the cursor, so deep pages cost the
+    same as the first one.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    # Builds the condition selecting rows strictly after (or before) a key.
+    @staticmethod
+    def _seek(key: tuple, direction: str) -> Q:
+        key_date, key_time, key_id = key
+        lookup = 'gt' if direction == NEXT else 'lt'
+        bound = 'gte' if direction == NEXT else 'lte'
+
+        # The redundant bound on date lets the database start a range scan on the index.
+        return Q(**{f'date__{bound}': key_date}) & (
+            Q(**{f'date__{lookup}': key_date})
+            | Q(date=key_date, **{f'time__{lookup}': key_time})
+            | Q(date=key_date, time=key_time, **{f'id__{lookup}': key_id})
+        )
+
+    # Returns the page addressed by the cursor, falling back to the first page.
+    def get_page(self, cursor: str = None) -> KeysetPage:
+        direction, key, queryset = self._page_query(cursor)
+        return self._build_page(list(queryset), direction, key)
+
+    # Same as get_page, reading the rows through the async ORM.
+    async def aget_page(self, cursor: str = None) -> KeysetPage:
+        direction, key, queryset = self._page_query(cursor)
+        return self._build_page([row async for row in queryset.aiterator()], direction, key)
+
+    # Builds the query of the page addressed by the cursor: one row more than a page, to detect the next one.
+    def _page_query(self, cursor: str) -> tuple:
+        direction, key = decode_cursor(cursor)
+        size = self.per_page
+
+        # Reading backwards: walk the reversed ordering and flip the rows afterwards.
+        if direction == PREVIOUS:
+            queryset = self.queryset.order_by(*(f'-{field}' for field in KEYSET_ORDERING))
+            if key is not None:
+                queryset = queryset.filter(self._seek(key, PREVIOUS))
+            return direction, key, queryset[:size + 1]
+
+        # Reading forwards, from the start or from the key in the cursor.
+        queryset = self.queryset.order_by(*KEYSET_ORDERING)
+        if direction == NEXT and key is not None:
+            queryset = queryset.filter(self._seek(key, NEXT))
+        return direction, key, queryset[:size + 1]
+
+    # Turns the rows read by _page_query into a page.
+    def _build_page(self, rows: list, direction: str, key: tuple) -> KeysetPage:
+        size = self.per_page
+        if direction == PREVIOUS:
+            has_previous = len(rows) > size
+            rows = rows[:size][::-1]
+            return KeysetPage(rows, has_next=bool(rows) and key is not None, has_previous=has_previous)
+        return KeysetPage(rows[:size], has_next=len(rows) > size, has_previous=direction == NEXT)
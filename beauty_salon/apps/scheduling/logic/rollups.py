@@ -0,0 +1,180 @@
+# Python imports.
+from collections import Counter
+from datetime import date as Date
+from decimal import Decimal
+
+# Django imports.
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+# Project imports.
+from apps.salon_service.models import SalonService
+from ..models import DailyRevenue, Scheduling, SchedulingHistory
+
+# Status whose schedulings count as revenue.
+COMPLETED = 'Concluído'
+
+# Rows inserted per bulk_create call when rebuilding.
+REBUILD_BATCH_SIZE = 2000
+
+
+# Adds (sign > 0) or removes (sign < 0) that many completed schedulings from their daily bucket.
+def apply_completed(*, date: Date, professional_id: int, salon_service_id: int, value: Decimal, sign: int) -> None:
+    _add_to_bucket(
+        date=date, professional_id=professional_id, salon_service_id=salon_service_id,
+        completed_count=sign, revenue=sign * value,
+    )
+
+
+# Adds a count and a revenue, either of which may be negative, to a daily bucket.
+def _add_to_bucket(*, date: Date, professional_id: int, salon_service_id: int, completed_count: int, revenue: Decimal) -> None:
+    # A missing professional (deleted employee) is a bucket of its own; a partial unique constraint keeps it single.
+    bucket = DailyRevenue.objects.filter(
+        date=date, professional_id=professional_id, salon_service_id=salon_service_id
+    )
+    changes = {'completed_count': F('completed_count') + completed_count, 'revenue': F('revenue') + revenue}
+
+    # Most changes hit an existing bucket.
+    if bucket.update(**changes):
+        return
+
+    # Otherwise create it; a concurrent insert of the same bucket falls back to the update.
+    try:
+        with transaction.atomic():
+            DailyRevenue.objects.create(
+                date=date,
+                professional_id=professional_id,
+                salon_service_id=salon_service_id,
+                completed_count=completed_count,
+                revenue=revenue,
+            )
+    except IntegrityError:
+        bucket.update(**changes)
+
+
+# Updates the rollup after a scheduling moved from its stored state to its current one.
+def record_transition(*, previous: dict, scheduling: Scheduling) -> None:
+    was_completed = previous['status'] == COMPLETED
+    is_completed = scheduling.status == COMPLETED
+
+    # Nothing to do when the scheduling stays outside the report, or stays in the same bucket.
+    same_bucket = (
+        previous['date'] == scheduling.date
+        and previous['professional_id'] == scheduling.professional_id
+        and previous['salon_service_id'] == scheduling.salon_service_id
+    )
+    if was_completed == is_completed and (not is_completed or same_bucket):
+        return
+
+    if was_completed:
+        apply_completed(
+            date=previous['date'],
+            professional_id=previous['professional_id'],
+            salon_service_id=previous['salon_service_id'],
+            value=SalonService.objects.values_list('value_of_service', flat=True).get(pk=previous['salon_service_id']),
+            sign=-1,
+        )
+    if is_completed:
+        apply_completed(
+            date=scheduling.date,
+            professional_id=scheduling.professional_id,
+            salon_service_id=scheduling.salon_service_id,
+            value=scheduling.salon_service.value_of_service,
+            sign=1,
+        )
+
+
+# Updates the rollup after the stored rows `previous` all moved to `status` in one statement.
+def record_bulk_transition(*, previous: list, status: str) -> None:
+
+    # Net change of each bucket, so every bucket is written once.
+    changes = Counter()
+    for row in previous:
+        sign = (status == COMPLETED) - (row['status'] == COMPLETED)
+        if sign:
+            changes[(row['date'], row['professional_id'], row['salon_service_id'])] += sign
+    if not changes:
+        return
+
+    values = dict(SalonService.objects.filter(
+        pk__in={salon_service_id for _day, _professional_id, salon_service_id in changes}
+    ).values_list('pk', 'value_of_service'))
+    for (day, professional_id, salon_service_id), sign in changes.items():
+        if sign:
+            apply_completed(
+                date=day,
+                professional_id=professional_id,
+                salon_service_id=salon_service_id,
+                value=values[salon_service_id],
+                sign=sign,
+            )
+
+
+# Removes the completed schedulings of a client about to be deleted, live and archived, from the rollup.
+def remove_client(*, client_id: int) -> None:
+    """
+    Deleting a client cascades to their schedulings without going through the
+    services, so their revenue is taken out of the buckets beforehand.
+    """
+    rows = SchedulingHistory.objects.filter(client_id=client_id, status=COMPLETED).values(
+        'date', 'professional_id', 'salon_service_id'
+    ).annotate(
+        completed_count=Count('id'),
+        revenue=Sum('salon_service__value_of_service'),
+    ).order_by()
+    for row in rows:
+        _add_to_bucket(
+            date=row['date'],
+            professional_id=row['professional_id'],
+            salon_service_id=row['salon_service_id'],
+            completed_count=-row['completed_count'],
+            revenue=-row['revenue'],
+        )
+
+
+# Moves the buckets of an employee about to be deleted into the buckets without a professional.
+def unassign_professional(*, professional_id: int) -> None:
+    """
+    The delete would null their professional, which could make two buckets of
+    the same day and service; their totals are merged instead.
+    """
+    buckets = DailyRevenue.objects.select_for_update().filter(professional_id=professional_id)
+    for bucket in buckets:
+        _add_to_bucket(
+            date=bucket.date,
+            professional_id=None,
+            salon_service_id=bucket.salon_service_id,
+            completed_count=bucket.completed_count,
+            revenue=bucket.revenue,
+        )
+    buckets.delete()
+
+
+# Recomputes the rollup from the live and archived schedulings, for every day or for a date range.
+@transaction.atomic
+def rebuild_daily_revenue(*, start_date: Date = None, end_date: Date = None) -> int:
+    schedulings = SchedulingHistory.objects.filter(status=COMPLETED)
+    buckets = DailyRevenue.objects.all()
+    if start_date:
+        schedulings = schedulings.filter(date__gte=start_date)
+        buckets = buckets.filter(date__gte=start_date)
+    if end_date:
+        schedulings = schedulings.filter(date__lte=end_date)
+        buckets = buckets.filter(date__lte=end_date)
+
+    # Replaces the buckets of the range with a single aggregation over the schedulings.
+    buckets.delete()
+    rows = schedulings.values('date', 'professional_id', 'salon_service_id').annotate(
+        completed_count=Count('id'),
+        revenue=Sum('salon_service__value_of_service'),
+    ).order_by()
+
+    created = 0
+    batch = []
+    for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+        batch.append(DailyRevenue(**row))
+        if len(batch) == REBUILD_BATCH_SIZE:
+            created += len(DailyRevenue.objects.bulk_create(batch))
+            batch = []
+    created += len(DailyRevenue.objects.bulk_create(batch))
+    return created
@@ -1,9 +1,19 @@
+# Python imports.
+from datetime import date as Date, timedelta
+
 # Django imports.
-from django.db.models import Q
+from django.db.models import Case, CharField, Count, F, Max, Sum, Value, When, Window
+from django.db.models.functions import RowNumber
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
 # Project imports.
-from ..models import Scheduling
+from apps.employee.models import Employee
+from apps.salon_service.models import SalonService
+from core.cache import versioned
+from ..models import ArchivedScheduling, DailyRevenue, Scheduling, SchedulingHistory
+from .availability import BUSY_STATUSES, DaySchedule, business_hours, to_minutes, to_time
+from .pagination import KEYSET_ORDERING, KeysetPage
 
 # Defines a function to get a single scheduling.
 def get_scheduling(*, pk: int) -> Scheduling:
@@ -18,33 +28,239 @@ def client_has_active_scheduling(*, client_id: int) -> bool:
         status__in=['Agendado', 'Executando']
     ).exists()
 
+# Defines a function to get how long a salon service takes.
+def get_service_duration(*, salon_service_id: int) -> int:
+    # Retrieves the duration, in minutes, of the given service.
+    return SalonService.objects.values_list('duration_of_service', flat=True).get(pk=salon_service_id)
+
 # --- List Functions for Views ---
 
+# Columns rendered by the scheduling list templates (scheduling_seach.html and home.html).
+LIST_COLUMNS = (
+    'date',
+    'time',
+    'status',
+    'client__client_name',
+    'professional__employee_name',
+    'salon_service__name_of_service',
+)
+
+# Defines a function to project a queryset onto the columns used by the list templates.
+def _list_rows(queryset: QuerySet[Scheduling]) -> QuerySet[Scheduling]:
+    # Joins the related rows in the same query and loads only the rendered columns.
+    return queryset.select_related(
+        'client', 'professional', 'salon_service'
+    ).only(*LIST_COLUMNS)
+
 # Defines a function to list scheduled and canceled items.
 def list_scheduled_and_canceled() -> QuerySet[Scheduling]:
     # Retrieves all schedulings with 'Scheduled' or 'Canceled' status.
-    return Scheduling.objects.filter(
-        Q(status='Agendado') | Q(status='Cancelado')
-    ).order_by('date', 'time')
+    return _list_rows(Scheduling.objects.filter(
+        status__in=['Agendado', 'Cancelado']
+    )).order_by('date', 'time')
 
 # Defines a function to list completed and executing items.
 def list_completed_and_executing() -> QuerySet[Scheduling]:
     # Retrieves all schedulings with 'Completed' or 'Executing' status.
-    return Scheduling.objects.filter(
-        Q(status='Concluído') | Q(status='Executando')
-    ).order_by('date', 'time')
+    return _list_rows(Scheduling.objects.filter(
+        status__in=['Concluído', 'Executando']
+    )).order_by('date', 'time')
 
-# Defines a function to list only completed items, with an optional date filter.
-def list_completed_only(*, date: str = None) -> QuerySet[Scheduling]:
-    # Retrieves only schedulings with 'Completed' status, optionally filtered by date.
-    
-    # Starts the query by filtering for 'Completed' status.
-    queryset = Scheduling.objects.filter(status='Concluído')
+# Defines a function to list only completed items, with optional date filters.
+def list_completed_only(*, date: str = None, start_date: Date = None, end_date: Date = None) -> QuerySet[Scheduling]:
+    # Retrieves only schedulings with 'Completed' status, optionally filtered by a date or a date range.
+
+    # Starts from the live table, or from the history view when the range reaches into the archive.
+    source = _completed_source(earliest=_parse_date(date) or start_date)
+    queryset = source.objects.filter(status='Concluído')
     
     # Checks if a date was provided.
     if date:
         # If so, applies the date filter to the queryset.
         queryset = queryset.filter(date=date)
+
+    # Applies the bounds of the date range, if any.
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
         
-    # Orders the final queryset and returns it.
-    return queryset.order_by('date', 'time')
\ No newline at end of file
+    # Orders the final queryset and returns it; archived rows are flagged so they are not offered for editing.
+    queryset = _list_rows(queryset).order_by('date', 'time')
+    if source is SchedulingHistory:
+        queryset = queryset.only(*LIST_COLUMNS, 'archived')
+    return queryset
+
+# Defines a function to pick the model completed schedulings are read from.
+def _completed_source(*, earliest: Date = None):
+    # The history view (live rows plus archive) is read only when something is archived and the range
+    # starts on or before the last archived day; an unbounded range starts before every day.
+    archived_through = get_archived_through()
+    if archived_through is None or (earliest is not None and earliest > archived_through):
+        return Scheduling
+    return SchedulingHistory
+
+# Defines a function to parse an ISO date filter, returning None when it is missing or malformed.
+def _parse_date(value) -> Date:
+    # The export view passes dates already parsed.
+    if isinstance(value, Date):
+        return value
+    try:
+        return Date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+# Defines a function to get the last day that has archived schedulings.
+def get_archived_through() -> Date:
+    # Cached per archive version; None while the archive is empty.
+    return versioned(
+        ArchivedScheduling, 'archived-through',
+        lambda: (ArchivedScheduling.objects.aggregate(last=Max('date'))['last'],),
+    )[0]
+
+# Statuses shown on each panel of the home dashboard.
+DASHBOARD_PANELS = {
+    'scheduled': ('Agendado', 'Cancelado'),
+    'active': ('Concluído', 'Executando'),
+}
+
+# Defines a function to read the first page and the row count of every dashboard panel at once.
+def dashboard_first_pages(*, per_page: int, paginated: tuple = ()) -> dict:
+    # Returns {panel: (KeysetPage, total)}; one query numbers the rows of each panel and keeps the first ones.
+    # Panels in `paginated` are read through their cursor instead, so only their total is fetched here.
+    return _dashboard_pages(list(_dashboard_rows(per_page, paginated)), per_page)
+
+# Defines the async variant of dashboard_first_pages.
+async def adashboard_first_pages(*, per_page: int, paginated: tuple = ()) -> dict:
+    # Reads the same single query through the async ORM.
+    return _dashboard_pages([row async for row in _dashboard_rows(per_page, paginated).aiterator()], per_page)
+
+# Defines the dashboard query: each row numbered within its panel and tagged with the panel's total.
+def _dashboard_rows(per_page: int, paginated: tuple = ()) -> QuerySet[Scheduling]:
+    panel = Case(
+        *(When(status__in=statuses, then=Value(name)) for name, statuses in DASHBOARD_PANELS.items()),
+        output_field=CharField(),
+    )
+    statuses = [status for panel_statuses in DASHBOARD_PANELS.values() for status in panel_statuses]
+    return _list_rows(Scheduling.objects.filter(status__in=statuses)).annotate(
+        panel=panel,
+        panel_position=Window(RowNumber(), partition_by=[panel], order_by=[F(field).asc() for field in KEYSET_ORDERING]),
+        panel_total=Window(Count('pk'), partition_by=[panel]),
+    ).filter(panel_position__lte=Case(
+        # A paginated panel keeps a single row, which carries its total.
+        When(panel__in=paginated, then=Value(1)),
+        default=Value(per_page + 1),
+    )).order_by('panel', *KEYSET_ORDERING)
+
+# Defines a function to split the dashboard rows per panel; the extra row only tells whether a next page exists.
+def _dashboard_pages(rows: list, per_page: int) -> dict:
+    grouped = {name: [] for name in DASHBOARD_PANELS}
+    for row in rows:
+        grouped[row.panel].append(row)
+    return {
+        name: (
+            KeysetPage(panel_rows[:per_page], has_next=len(panel_rows) > per_page, has_previous=False),
+            panel_rows[0].panel_total if panel_rows else 0,
+        )
+        for name, panel_rows in grouped.items()
+    }
+
+# Columns of the completed schedulings export, in file order.
+EXPORT_COLUMNS = (
+    ('date', 'Data'),
+    ('time', 'Horário'),
+    ('client__client_name', 'Cliente'),
+    ('professional__employee_name', 'Profissional'),
+    ('salon_service__name_of_service', 'Serviço'),
+    ('salon_service__value_of_service', 'Valor'),
+    ('status', 'Status'),
+)
+
+# Defines a function to stream completed schedulings as plain tuples.
+def iter_completed_export(*, date: str = None, start_date: Date = None, end_date: Date = None, chunk_size: int = 2000):
+    # Yields the export columns row by row; PostgreSQL reads them through a server-side cursor.
+    queryset = list_completed_only(date=date, start_date=start_date, end_date=end_date)
+    return queryset.order_by('date', 'time', 'id').values_list(
+        *(field for field, _header in EXPORT_COLUMNS)
+    ).iterator(chunk_size=chunk_size)
+
+# --- Availability Search ---
+
+# Defines a function to list every open slot for a service over a date range.
+def list_free_slots(
+    *,
+    salon_service_id: int,
+    start_date: Date,
+    end_date: Date,
+    professional_ids: list = None
+) -> list:
+    # Returns one entry per (date, professional) with the start times that fit the service.
+
+    # Reads the service duration and the professionals to consider.
+    duration = get_service_duration(salon_service_id=salon_service_id)
+    professionals = Employee.objects.order_by('employee_name')
+    if professional_ids:
+        professionals = professionals.filter(pk__in=professional_ids)
+    professionals = list(professionals.values_list('pk', 'employee_name'))
+
+    # Fetches every busy booking of the window in a single query.
+    bookings = Scheduling.objects.filter(
+        status__in=BUSY_STATUSES,
+        date__range=(start_date, end_date),
+        professional_id__in=[pk for pk, _name in professionals],
+    ).values_list('pk', 'professional_id', 'date', 'time', 'salon_service__duration_of_service')
+
+    # Groups the bookings per (professional, date) in one pass.
+    intervals = {}
+    for pk, professional_id, day, start_time, booked_duration in bookings:
+        start = to_minutes(start_time)
+        intervals.setdefault((professional_id, day), []).append((start, start + booked_duration, pk))
+
+    # Slots already in the past are not offered.
+    opening, closing, step = business_hours()
+    now = timezone.localtime()
+    today, current_minute = now.date(), to_minutes(now.time())
+
+    # Sweeps each day of the window for each professional.
+    results = []
+    day = max(start_date, today)
+    while day <= end_date:
+        day_opening = opening
+        if day == today:
+            day_opening = opening + max(0, -(-(current_minute - opening) // step)) * step
+
+        for professional_id, professional_name in professionals:
+            schedule = DaySchedule(intervals.get((professional_id, day), ()))
+            starts = schedule.free_slots(duration, day_opening, closing, step)
+            if starts:
+                results.append({
+                    'date': day,
+                    'professional_id': professional_id,
+                    'professional_name': professional_name,
+                    'times': [to_time(start) for start in starts],
+                })
+        day += timedelta(days=1)
+
+    return results
+
+
+# --- Revenue Report ---
+
+# Grouping columns of the revenue report, by name.
+REVENUE_GROUPS = {
+    'day': ('date',),
+    'professional': ('professional_id', 'professional__employee_name'),
+    'service': ('salon_service_id', 'salon_service__name_of_service'),
+}
+
+# Defines a function to summarize revenue over a date range from the daily rollup.
+def revenue_report(*, start_date: Date, end_date: Date, group_by: str = 'day') -> list:
+    # Reads only the pre-aggregated buckets of the range, never the scheduling history.
+    columns = REVENUE_GROUPS[group_by]
+    return list(
+        DailyRevenue.objects.filter(date__range=(start_date, end_date))
+        .values(*columns)
+        .annotate(total_completed=Sum('completed_count'), total_revenue=Sum('revenue'))
+        .filter(total_completed__gt=0)
+        .order_by(*columns)
+    )
@@ -1,14 +1,48 @@
 # Python imports
 from datetime import date, time
 from django.utils import timezone
-from django.db import transaction
+from django.db import IntegrityError, connection, transaction
 
 # Project imports
+from apps.client.models import Client
+from apps.employee.models import Employee
+from core.cache import bump_data_version
+from core.tracking import changed_fields, save_changed
 from ..models import Scheduling
-from . import selectors
+from . import rollups, selectors, transitions
+from .availability import BUSY_STATUSES, availability
 from .exceptions import ValidationError
 
+# Message shown when the active-scheduling rule is broken
+ACTIVE_SCHEDULING_ERROR = "This client already has an active scheduling (Scheduled or In Progress)."
+
+# Serializes concurrent bookings of the same client, and of the same professional on the same day.
+# Must be called inside a transaction; the locks are released when it ends.
+def _lock_booking(*, client_id: int, professional_id: int, day: date) -> None:
+
+    # Row lock on the client, so its active-scheduling check cannot race
+    list(Client.objects.select_for_update().filter(pk=client_id).values_list('pk', flat=True))
+
+    if professional_id is None:
+        return
+
+    # Advisory lock keyed on (professional, date) on PostgreSQL, so other days stay unblocked
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s, %s)", [professional_id, day.toordinal()])
+    # Elsewhere, fall back to a row lock on the professional
+    else:
+        list(Employee.objects.select_for_update().filter(pk=professional_id).values_list('pk', flat=True))
+
+# Locks a scheduling row and reads the state it is stored with, ignoring any unsaved changes on an instance.
+# Must be called inside a transaction; concurrent updates of the same scheduling then see each other's result.
+def _lock_scheduling(*, pk: int) -> dict:
+    return Scheduling.objects.select_for_update().values(
+        'professional_id', 'salon_service_id', 'date', 'status'
+    ).get(pk=pk)
+
 # Scheduling creation
+@transaction.atomic
 def scheduling_create(
     *, 
     client_id: int, 
@@ -20,25 +54,45 @@ def scheduling_create(
     
     errors = []
 
+    # Hold the client and the professional's day until the booking commits
+    _lock_booking(client_id=client_id, professional_id=professional_id, day=date)
+
     # Rule: A client can only have one active scheduling
     if selectors.client_has_active_scheduling(client_id=client_id):
-        errors.append("This client already has an active scheduling (Scheduled or In Progress).")
+        errors.append(ACTIVE_SCHEDULING_ERROR)
 
     # Rule: Cannot schedule for past dates
     if date < timezone.now().date():
         errors.append("Appointments cannot be created on past dates.")
 
+    # Rule: The professional must be free for the whole duration of the service
+    if professional_id is not None:
+        duration = selectors.get_service_duration(salon_service_id=salon_service_id)
+        availability.refresh(professional_id=professional_id, day=date)
+        if not availability.is_free(professional_id=professional_id, day=date, start_time=time, duration=duration):
+            errors.append("The professional is already booked at this time.")
+
     if errors:
         raise ValidationError(errors)
 
-    scheduling = Scheduling.objects.create(
-        client_id=client_id,
-        professional_id=professional_id,
-        salon_service_id=salon_service_id,
-        date=date,
-        time=time,
-        status='Agendado'
-    )
+    # The unique constraint is the last line of defence; report it as a validation error
+    try:
+        scheduling = Scheduling.objects.create(
+            client_id=client_id,
+            professional_id=professional_id,
+            salon_service_id=salon_service_id,
+            date=date,
+            time=time,
+            status='Agendado'
+        )
+    except IntegrityError:
+        raise ValidationError([ACTIVE_SCHEDULING_ERROR])
+
+    # Invalidate the cached scheduling pages
+    bump_data_version(Scheduling)
+
+    # Keep the in-memory availability index in sync once the booking is committed
+    transaction.on_commit(lambda: availability.refresh(professional_id=professional_id, day=date))
 
     return scheduling
 
@@ -52,14 +106,61 @@ def scheduling_update(
     # Initialize the error list
     errors = [] 
 
-    # Update all valid fields, except for client_id
-    for field, value in data.items():
-        if field == 'client_id':
-            # This field cannot be changed
-            continue
-        setattr(scheduling, field, value)
+    # The client cannot be changed; only the fields that differ from the stored row are written
+    data = {field: value for field, value in data.items() if field not in ('client', 'client_id')}
+    changed = changed_fields(scheduling, data)
+    if not changed:
+        return scheduling
+
+    # Lock the row and read the state it is stored with, before this update
+    previous = _lock_scheduling(pk=scheduling.pk)
+
+    # Rule: The status can only follow the allowed transitions
+    status = data.get('status', previous['status'])
+    if not transitions.can_transition(previous['status'], status):
+        raise ValidationError([transitions.transition_error(previous['status'], status)])
+
+    # Update the changed fields
+    for field in changed:
+        setattr(scheduling, field, data[field])
+
+    # Hold the client and the professional's new day until the update commits
+    _lock_booking(client_id=scheduling.client_id, professional_id=scheduling.professional_id, day=scheduling.date)
+
+    # Rule: An active scheduling cannot overlap another booking of the same professional
+    if scheduling.status in BUSY_STATUSES and scheduling.professional_id is not None:
+        availability.refresh(professional_id=scheduling.professional_id, day=scheduling.date)
+        if not availability.is_free(
+            professional_id=scheduling.professional_id,
+            day=scheduling.date,
+            start_time=scheduling.time,
+            duration=scheduling.salon_service.duration_of_service,
+            exclude_id=scheduling.pk,
+        ):
+            errors.append("The professional is already booked at this time.")
+
+    if errors:
+        raise ValidationError(errors)
+
+    # Reactivating a scheduling can collide with another active one of the same client
+    try:
+        save_changed(scheduling, changed)
+    except IntegrityError:
+        raise ValidationError([ACTIVE_SCHEDULING_ERROR])
+
+    # Keep the daily revenue rollup in step with the status change
+    rollups.record_transition(previous=previous, scheduling=scheduling)
+
+    # Invalidate the cached scheduling pages
+    bump_data_version(Scheduling)
 
-    scheduling.save()
+    # Refresh both the old and the new slot in the availability index after commit
+    def refresh_availability():
+        for professional_id, day in {(previous['professional_id'], previous['date']), (scheduling.professional_id, scheduling.date)}:
+            if professional_id is not None:
+                availability.refresh(professional_id=professional_id, day=day)
+
+    transaction.on_commit(refresh_availability)
     
     return scheduling
 
@@ -69,14 +170,103 @@ def scheduling_update(
 def scheduling_cancel(*, scheduling: Scheduling) -> Scheduling:
     errors = []
 
+    # Lock the row and read the state it is stored with; the instance may be stale
+    previous = _lock_scheduling(pk=scheduling.pk)
+
     # Can only cancel if 'Scheduled' or 'In Progress'
-    if scheduling.status not in ['Agendado', 'Executando']:
+    if 'Cancelado' not in transitions.STATUS_TRANSITIONS[previous['status']]:
         errors.append("This scheduling is already in a final state and cannot be canceled.")
 
     if errors:
         raise ValidationError(errors)
 
     scheduling.status = 'Cancelado'
-    scheduling.save()
+    save_changed(scheduling, ['status'])
+
+    # Keep the daily revenue rollup in step with the status change
+    rollups.record_transition(previous=previous, scheduling=scheduling)
+
+    # Invalidate the cached scheduling pages
+    bump_data_version(Scheduling)
+
+    # Free the stored slot in the availability index once the cancellation is committed
+    if previous['professional_id'] is not None:
+        transaction.on_commit(lambda: availability.refresh(professional_id=previous['professional_id'], day=previous['date']))
     
-    return scheduling
\ No newline at end of file
+    return scheduling
+
+
+# Outcomes of each id of a bulk transition
+BULK_UPDATED = 'updated'
+BULK_UNCHANGED = 'unchanged'
+BULK_NOT_FOUND = 'not_found'
+BULK_NOT_ALLOWED = 'not_allowed'
+
+# Bulk status transition
+@transaction.atomic
+def scheduling_bulk_transition(*, ids: list, status: str) -> dict:
+    """
+    Moves every listed scheduling to `status` with a single UPDATE guarded by
+    the statuses allowed to reach it, and returns the outcome of each id.
+    Moves that make a scheduling active again (e.g. reopening a canceled one)
+    need the booking checks of scheduling_update and are reported as not allowed.
+    """
+    if status not in transitions.STATUSES:
+        raise ValidationError([f"Unknown status '{status}'."])
+
+    # Statuses that can reach the target without re-checking the booking rules
+    allowed = [
+        current for current in transitions.STATUSES
+        if current != status
+        and transitions.can_transition(current, status)
+        and not transitions.reactivates(current, status)
+    ]
+
+    # Lock the rows and read the state they are stored with
+    ids = list(dict.fromkeys(ids))
+    stored = {
+        row['id']: row
+        for row in Scheduling.objects.select_for_update().filter(pk__in=ids).values(
+            'id', 'status', 'date', 'professional_id', 'salon_service_id'
+        )
+    }
+
+    results = {}
+    moved = []
+    for pk in ids:
+        row = stored.get(pk)
+        if row is None:
+            results[pk] = BULK_NOT_FOUND
+        elif row['status'] == status:
+            results[pk] = BULK_UNCHANGED
+        elif row['status'] in allowed:
+            results[pk] = BULK_UPDATED
+            moved.append(row)
+        else:
+            results[pk] = BULK_NOT_ALLOWED
+
+    if not moved:
+        return results
+
+    # One statement for every row; update() skips auto_now, so the change time is set here
+    Scheduling.objects.filter(
+        pk__in=[row['id'] for row in moved], status__in=allowed
+    ).update(status=status, updated_at=timezone.now())
+
+    # Keep the daily revenue rollup in step with the status changes
+    rollups.record_bulk_transition(previous=moved, status=status)
+
+    # Invalidate the cached scheduling pages
+    bump_data_version(Scheduling)
+
+    # Refresh the touched days in the availability index after commit
+    days = {(row['professional_id'], row['date']) for row in moved if row['professional_id'] is not None}
+
+    def refresh_availability():
+        for professional_id, day in days:
+            availability.refresh(professional_id=professional_id, day=day)
+
+    transaction.on_commit(refresh_availability)
+
+    return results
+
@@ -0,0 +1,31 @@
+# Project imports.
+from ..models import STATUS_CHOICES
+from .availability import BUSY_STATUSES
+
+# Every status a scheduling can have.
+STATUSES = tuple(value for value, _label in STATUS_CHOICES)
+
+# Statuses a scheduling may move to from each status; keeping the current status is always allowed.
+STATUS_TRANSITIONS = {
+    'Agendado': ('Executando', 'Concluído', 'Cancelado'),
+    'Executando': ('Agendado', 'Concluído', 'Cancelado'),
+    # A booking marked completed by mistake can be reopened.
+    'Concluído': ('Executando',),
+    # A canceled booking can be booked again.
+    'Cancelado': ('Agendado',),
+}
+
+
+# Tells whether a scheduling may move from one status to another.
+def can_transition(current: str, target: str) -> bool:
+    return current == target or target in STATUS_TRANSITIONS.get(current, ())
+
+
+# Tells whether a move makes a scheduling active again, so the booking rules must be re-checked.
+def reactivates(current: str, target: str) -> bool:
+    return target in BUSY_STATUSES and current not in BUSY_STATUSES
+
+
+# Message of a rejected transition.
+def transition_error(current: str, target: str) -> str:
+    return f"A scheduling cannot move from '{current}' to '{target}'."
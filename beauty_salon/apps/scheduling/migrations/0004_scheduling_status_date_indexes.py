@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0002_alter_client_client_email_alter_client_client_name_and_more'),
+        ('employee', '0001_initial'),
+        ('salon_service', '0001_initial'),
+        ('scheduling', '0003_remove_scheduling_unique_scheduling_per_client_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(condition=models.Q(('status__in', ['Agendado', 'Cancelado'])), fields=['date', 'time', 'id'], name='scheduling_booked_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(condition=models.Q(('status__in', ['Concluído', 'Executando'])), fields=['date', 'time', 'id'], name='scheduling_active_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(condition=models.Q(('status', 'Concluído')), fields=['date', 'time', 'id'], name='scheduling_completed_date_idx'),
+        ),
+    ]
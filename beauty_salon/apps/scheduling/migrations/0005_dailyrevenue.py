@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0001_initial'),
+        ('salon_service', '0002_salonservice_duration_of_service'),
+        ('scheduling', '0004_scheduling_status_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('completed_count', models.IntegerField(default=0, verbose_name='Atendimentos concluídos')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Receita')),
+                ('professional', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_revenues', to='employee.employee', verbose_name='Profissional')),
+                ('salon_service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_revenues', to='salon_service.salonservice', verbose_name='Serviço')),
+            ],
+            options={
+                'db_table': 'scheduling_daily_revenue',
+                'constraints': [models.UniqueConstraint(fields=('date', 'professional', 'salon_service'), name='unique_daily_revenue_bucket'), models.UniqueConstraint(condition=models.Q(('professional__isnull', True)), fields=('date', 'salon_service'), name='unique_daily_revenue_unassigned_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Columns shared by the live and the archived schedulings.
+HISTORY_COLUMNS = 'id, client_id, professional_id, salon_service_id, "date", "time", status, updated_at'
+
+# Read-only view over both tables; the planner pushes filters into each branch and its indexes.
+HISTORY_VIEW_SQL = (
+    f'CREATE VIEW scheduling_history AS '
+    f'SELECT {HISTORY_COLUMNS}, FALSE AS archived FROM scheduling '
+    f'UNION ALL '
+    f'SELECT {HISTORY_COLUMNS}, TRUE AS archived FROM scheduling_archive'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0005_client_updated_at'),
+        ('employee', '0003_employee_updated_at'),
+        ('salon_service', '0003_salonservice_updated_at'),
+        ('scheduling', '0006_scheduling_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedScheduling',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField(verbose_name='Data')),
+                ('time', models.TimeField(verbose_name='Horário')),
+                ('status', models.CharField(choices=[('Agendado', 'Agendado'), ('Concluído', 'Concluído'), ('Executando', 'Executando'), ('Cancelado', 'Cancelado')], max_length=20, verbose_name='Status do Agendamento')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('archived_at', models.DateTimeField(verbose_name='Arquivado em')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_schedulings', to='client.client', verbose_name='Cliente')),
+                ('professional', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_schedulings', to='employee.employee', verbose_name='Profissional')),
+                ('salon_service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_schedulings', to='salon_service.salonservice', verbose_name='Serviço')),
+            ],
+            options={
+                'db_table': 'scheduling_archive',
+                'indexes': [models.Index(fields=['date', 'time', 'id'], name='scheduling_archive_date_idx')],
+            },
+        ),
+        migrations.RunSQL(HISTORY_VIEW_SQL, 'DROP VIEW IF EXISTS scheduling_history'),
+        migrations.CreateModel(
+            name='SchedulingHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('time', models.TimeField(verbose_name='Horário')),
+                ('status', models.CharField(choices=[('Agendado', 'Agendado'), ('Concluído', 'Concluído'), ('Executando', 'Executando'), ('Cancelado', 'Cancelado')], max_length=20, verbose_name='Status do Agendamento')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('archived', models.BooleanField()),
+            ],
+            options={
+                'db_table': 'scheduling_history',
+                'managed': False,
+            },
+        ),
+    ]
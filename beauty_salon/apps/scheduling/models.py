@@ -1,11 +1,13 @@
 # Django imports.
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Now
 
 # Project imports.
 from apps.client.models import Client
 from apps.employee.models import Employee
 from apps.salon_service.models import SalonService
+from core.tracking import LoadedValuesMixin
 
 # A list of possible statuses for a scheduling.
 STATUS_CHOICES = (
@@ -16,7 +18,7 @@ STATUS_CHOICES = (
 )
 
 # Defines the Scheduling data model.
-class Scheduling(models.Model):
+class Scheduling(LoadedValuesMixin, models.Model):
 
     # FK of the client that will receive the service.
     client = models.ForeignKey(
@@ -55,6 +57,9 @@ class Scheduling(models.Model):
         verbose_name='Status do Agendamento'
     )
 
+    # Time of the last change, read by the conditional GETs.
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True, db_default=Now())
+
     # String representation of the model.
     def __str__(self):
         return f"Scheduling for {self.client.client_name} with {self.professional.employee_name} at {self.date} {self.time}"
@@ -72,4 +77,143 @@ class Scheduling(models.Model):
                 condition=~Q(status__in=['Concluído', 'Cancelado']),
                 name='unique_active_scheduling_per_client'
             )
-        ]
\ No newline at end of file
+        ]
+
+        # Partial indexes matching the list selectors: each one covers a status
+        # group in (date, time, id) order, so the lists are read as index range
+        # scans instead of being filtered and sorted.
+        indexes = [
+            models.Index(
+                fields=['date', 'time', 'id'],
+                condition=Q(status__in=['Agendado', 'Cancelado']),
+                name='scheduling_booked_date_idx'
+            ),
+            models.Index(
+                fields=['date', 'time', 'id'],
+                condition=Q(status__in=['Concluído', 'Executando']),
+                name='scheduling_active_date_idx'
+            ),
+            models.Index(
+                fields=['date', 'time', 'id'],
+                condition=Q(status='Concluído'),
+                name='scheduling_completed_date_idx'
+            ),
+        ]
+
+# Defines the pre-aggregated revenue of completed schedulings per day, professional and service.
+class DailyRevenue(models.Model):
+
+    # Day the schedulings were performed.
+    date = models.DateField("Data", null=False)
+
+    # Professional who performed them.
+    professional = models.ForeignKey(
+        Employee,
+        on_delete=models.SET_NULL,
+        related_name='daily_revenues',
+        verbose_name='Profissional',
+        null=True
+    )
+
+    # Service performed.
+    salon_service = models.ForeignKey(
+        SalonService,
+        on_delete=models.CASCADE,
+        related_name='daily_revenues',
+        verbose_name='Serviço'
+    )
+
+    # Number of completed schedulings and the sum of their service values.
+    completed_count = models.IntegerField("Atendimentos concluídos", default=0)
+    revenue = models.DecimalField("Receita", max_digits=14, decimal_places=2, default=0)
+
+    # String representation of the model.
+    def __str__(self):
+        return f"Revenue of {self.date}: {self.revenue}"
+
+    # Model metadata options.
+    class Meta:
+        app_label = 'scheduling'
+        db_table = 'scheduling_daily_revenue'
+
+        # One row per (date, professional, service); NULLs are distinct in a unique constraint,
+        # so the buckets without a professional get one of their own.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'professional', 'salon_service'],
+                name='unique_daily_revenue_bucket'
+            ),
+            models.UniqueConstraint(
+                fields=['date', 'salon_service'],
+                condition=models.Q(professional__isnull=True),
+                name='unique_daily_revenue_unassigned_bucket'
+            ),
+        ]
+
+# Defines the archive of old completed and canceled schedulings, moved out of the live table.
+class ArchivedScheduling(models.Model):
+
+    # Same id as the scheduling had in the live table.
+    id = models.BigIntegerField(primary_key=True)
+
+    # Copies of the scheduling columns.
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='archived_schedulings',
+        verbose_name='Cliente'
+    )
+    professional = models.ForeignKey(
+        Employee,
+        on_delete=models.SET_NULL,
+        related_name='archived_schedulings',
+        verbose_name='Profissional',
+        null=True
+    )
+    salon_service = models.ForeignKey(
+        SalonService,
+        on_delete=models.CASCADE,
+        related_name='archived_schedulings',
+        verbose_name='Serviço'
+    )
+    date = models.DateField("Data", null=False)
+    time = models.TimeField("Horário", null=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, verbose_name='Status do Agendamento')
+    updated_at = models.DateTimeField("Atualizado em")
+
+    # When the row was moved to the archive.
+    archived_at = models.DateTimeField("Arquivado em")
+
+    # String representation of the model.
+    def __str__(self):
+        return f"Archived scheduling {self.pk} at {self.date} {self.time}"
+
+    # Model metadata options.
+    class Meta:
+        app_label = 'scheduling'
+        db_table = 'scheduling_archive'
+
+        # The archive is only read in (date, time, id) order, by the completed report.
+        indexes = [
+            models.Index(fields=['date', 'time', 'id'], name='scheduling_archive_date_idx'),
+        ]
+
+# Defines a read-only view over the live and the archived schedulings (see migration 0007).
+class SchedulingHistory(models.Model):
+
+    client = models.ForeignKey(Client, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False)
+    professional = models.ForeignKey(Employee, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False, null=True)
+    salon_service = models.ForeignKey(SalonService, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False)
+    date = models.DateField("Data")
+    time = models.TimeField("Horário")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, verbose_name='Status do Agendamento')
+    updated_at = models.DateTimeField("Atualizado em")
+
+    # True for rows read from the archive, which can no longer be edited.
+    archived = models.BooleanField()
+
+    # Model metadata options.
+    class Meta:
+        app_label = 'scheduling'
+        db_table = 'scheduling_history'
+        managed = False
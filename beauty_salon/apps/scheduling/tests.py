@@ -1,3 +1,714 @@
-from django.test import TestCase
+# Python imports.
+import threading
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+# Django imports.
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, AsyncRequestFactory, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+# Project imports.
+from apps.client.logic import services as client_services
+from apps.client.models import Client
+from apps.employee.logic import services as employee_services
+from apps.employee.models import Employee
+from apps.salon_service.models import SalonService
+from core.cache import _version_key
+from .logic import rollups, selectors, services
+from .logic.archive import archive_schedulings
+from .logic.availability import DaySchedule, availability
+from .logic.exceptions import ValidationError
+from .logic.pagination import KeysetPaginator, decode_cursor, encode_cursor
+from .models import ArchivedScheduling, DailyRevenue, Scheduling, SchedulingHistory
+from .views import LIST_MODELS, AsyncCompletedOnlyListView, AsyncScheduledAndCanceledListView
+from home.views import AsyncHomeView
+
+
+# Builds a small set of schedulings spread over every status.
+def create_schedulings(total: int = 24) -> None:
+
+    # Related rows shared by the schedulings.
+    employees = [
+        Employee.objects.create(
+            employee_name=f"Profissional {index}",
+            employee_email=f"profissional{index}@gmail.com",
+            employee_number=f"(85) 90000-000{index}",
+            employee_cpf=f"000.000.000-0{index}",
+        )
+        for index in range(3)
+    ]
+    services = [
+        SalonService.objects.create(name_of_service=f"Serviço {index}", value_of_service=Decimal("50.00"))
+        for index in range(3)
+    ]
+    statuses = ['Agendado', 'Concluído', 'Executando', 'Cancelado']
+
+    # One client per scheduling keeps the active-scheduling constraint satisfied.
+    for index in range(total):
+        client = Client.objects.create(
+            client_name=f"Cliente Teste {index}",
+            client_email=f"cliente{index}@gmail.com",
+            client_number=f"(85) 91111-{index:04d}",
+        )
+        Scheduling.objects.create(
+            client=client,
+            professional=employees[index % len(employees)],
+            salon_service=services[index % len(services)],
+            date=date.today() + timedelta(days=index % 5),
+            time=time(8 + index % 10, 0),
+            status=statuses[index % len(statuses)],
+        )
+
+
+# Pins the number of queries issued by every scheduling list page.
+class SchedulingListQueryCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def setUp(self):
+        cache.clear()
+
+    # Each keyset-paginated list costs a single joined page query, plus the aggregate behind its ETag.
+    def test_scheduled_and_canceled_list(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('scheduling:list-scheduled-canceled'))
+        self.assertContains(response, "Cliente Teste 0")
+
+    def test_completed_and_executing_list(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('scheduling:list-completed-executing'))
+        self.assertContains(response, "Cliente Teste 1")
+
+    # The list first looks up the last archived day, to know whether the archive must be read.
+    def test_completed_only_list(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('scheduling:list-completed-only'))
+        self.assertContains(response, "Profissional 1")
+
+    def test_completed_only_list_with_date_filter(self):
+        with self.assertNumQueries(3):
+            self.client.get(reverse('scheduling:list-completed-only'), {'date': date.today().isoformat()})
+        with self.assertNumQueries(2):
+            self.client.get(reverse('scheduling:list-completed-only'), {'date': date.today().isoformat(), 'cursor': ''})
+
+    # The home dashboard reads the first page and the total of both cards in one query.
+    def test_home_dashboard(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('home:home'))
+        self.assertContains(response, "Serviço 0")
+
+    # A paginated card adds its page query; the dashboard query still brings the totals of both cards.
+    def test_home_dashboard_paginated(self):
+        first = self.client.get(reverse('home:home')).context
+        cursor = first['page_obj'].next_cursor
+        cache.clear()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('home:home'), {'cursor': cursor})
+        self.assertEqual(response.context['scheduled_total'], first['scheduled_total'])
+        self.assertEqual(response.context['active_total'], first['active_total'])
+        self.assertTrue(response.context['page_obj'].has_previous())
+        self.assertEqual(
+            [row.pk for row in response.context['completed_page_obj']],
+            [row.pk for row in first['completed_page_obj']],
+        )
+
+    # Paging one card keeps the other on its page.
+    def test_home_links_keep_both_cursors(self):
+        first = self.client.get(reverse('home:home')).context
+        cursor, completed_cursor = first['page_obj'].next_cursor, first['completed_page_obj'].next_cursor
+        response = self.client.get(reverse('home:home'), {'cursor': cursor, 'completed_cursor': completed_cursor})
+        next_page = response.context['page_obj'].next_cursor
+        next_completed = response.context['completed_page_obj'].next_cursor
+        self.assertContains(response, f'href="?cursor={next_page}&amp;completed_cursor={completed_cursor}"')
+        self.assertContains(response, f'href="?cursor={cursor}&amp;completed_cursor={next_completed}"')
+        self.assertContains(response, f'href="?completed_cursor={completed_cursor}"')
+        self.assertContains(response, f'href="?cursor={cursor}"')
+
+
+# Checks the async variants of the list views against the sync ones.
+class AsyncListViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def setUp(self):
+        cache.clear()
+
+    # Calls an async view class as the URL it would be routed to under ASGI.
+    async def get(self, view_class, url: str, data: dict = None):
+        request = AsyncRequestFactory().get(url, data or {})
+        request.resolver_match = resolve(url)
+        return await view_class.as_view()(request)
+
+    # The async pages list the same rows and carry the same validators as the sync ones.
+    async def test_async_lists_match_sync_lists(self):
+        for view_class, name in (
+            (AsyncScheduledAndCanceledListView, 'scheduling:list-scheduled-canceled'),
+            (AsyncCompletedOnlyListView, 'scheduling:list-completed-only'),
+            (AsyncHomeView, 'home:home'),
+        ):
+            with self.subTest(view=name):
+                url = reverse(name)
+                sync_response = await self.async_client.get(url)
+
+                # Drops the cached pages and slice states, keeping the data versions the ETag is built from.
+                versions = await cache.aget_many([_version_key(model) for model in LIST_MODELS])
+                await cache.aclear()
+                await cache.aset_many(versions, timeout=None)
+                response = await self.get(view_class, url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['ETag'], sync_response['ETag'])
+                for scheduling in sync_response.context['page_obj']:
+                    self.assertContains(response, scheduling.client.client_name)
+
+    # The dashboard reads a paged card and the first page of the other one concurrently.
+    async def test_async_home_with_a_cursor(self):
+        first_page, total = (await selectors.adashboard_first_pages(per_page=3))['scheduled']
+        paginator = KeysetPaginator(selectors.list_scheduled_and_canceled(), 3)
+        second_page = await paginator.aget_page(first_page.next_cursor)
+
+        response = await self.get(AsyncHomeView, reverse('home:home'), {'cursor': first_page.next_cursor})
+        self.assertContains(response, second_page.object_list[0].client.client_name)
+        self.assertContains(response, f"Agendamentos ({total})")
+
+    # The instrumentation middleware also measures requests served by the async handler.
+    async def test_middleware_under_the_async_handler(self):
+        response = await AsyncClient().get(reverse('home:home'))
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+
+# Walks the keyset paginator in both directions.
+class KeysetPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def setUp(self):
+        self.queryset = selectors.list_completed_and_executing()
+        self.expected = list(self.queryset.order_by('date', 'time', 'id').values_list('pk', flat=True))
+
+    # Following the next cursors visits every row exactly once, in order.
+    def test_forward_walk(self):
+        paginator = KeysetPaginator(self.queryset, 5)
+        page = paginator.get_page(None)
+        seen = [row.pk for row in page]
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            seen.extend(row.pk for row in page)
+        self.assertEqual(seen, self.expected)
+
+    # The last page followed by previous cursors visits every row backwards.
+    def test_backward_walk(self):
+        paginator = KeysetPaginator(self.queryset, 5)
+        page = paginator.get_page(paginator.get_page(None).last_cursor)
+        self.assertFalse(page.has_next())
+        seen = [row.pk for row in page][::-1]
+        while page.has_previous():
+            page = paginator.get_page(page.previous_cursor)
+            seen.extend(row.pk for row in reversed(list(page)))
+        self.assertEqual(seen[::-1], self.expected)
+
+    # A tampered cursor falls back to the first page.
+    def test_invalid_cursor(self):
+        self.assertEqual(decode_cursor('not-a-cursor'), (None, None))
+        page = KeysetPaginator(self.queryset, 5).get_page('not-a-cursor')
+        self.assertEqual([row.pk for row in page], self.expected[:5])
+
+    # A next cursor past the last row gives an empty page that links back to the last page.
+    def test_cursor_past_the_end(self):
+        paginator = KeysetPaginator(self.queryset, 5)
+        page = paginator.get_page(encode_cursor('n', (date(2999, 1, 1), time(0, 0), 1)))
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_next())
+        self.assertEqual(page.next_cursor, '')
+        last = paginator.get_page(page.previous_cursor)
+        self.assertEqual([row.pk for row in last], self.expected[-5:])
+
+        # The pages render instead of failing.
+        cursor = encode_cursor('n', (date(2999, 1, 1), time(0, 0), 1))
+        self.assertEqual(self.client.get(reverse('scheduling:list-scheduled-canceled'), {'cursor': cursor}).status_code, 200)
+        self.assertEqual(self.client.get(reverse('home:home'), {'cursor': cursor, 'completed_cursor': cursor}).status_code, 200)
+
+    # The dashboard query returns the same first pages as the paginator, with each panel's total.
+    def test_dashboard_first_pages(self):
+        pages = selectors.dashboard_first_pages(per_page=5)
+        for panel, queryset in (
+            ('scheduled', selectors.list_scheduled_and_canceled()),
+            ('active', selectors.list_completed_and_executing()),
+        ):
+            page, total = pages[panel]
+            expected = KeysetPaginator(queryset, 5).get_page(None)
+            self.assertEqual([row.pk for row in page], [row.pk for row in expected])
+            self.assertEqual(page.has_next(), expected.has_next())
+            self.assertEqual(total, queryset.count())
+
+
+# Checks the interval structure behind the availability index.
+class DayScheduleTests(TestCase):
+
+    def test_is_free_around_bookings(self):
+        schedule = DaySchedule([(540, 600, 1), (660, 720, 2)])
+        self.assertTrue(schedule.is_free(600, 660))
+        self.assertTrue(schedule.is_free(480, 540))
+        self.assertFalse(schedule.is_free(570, 630))
+        self.assertFalse(schedule.is_free(690, 700))
+        self.assertTrue(schedule.is_free(570, 630, exclude_id=1))
+
+    # A long legacy booking overlapping a later one still blocks the gap it covers.
+    def test_is_free_with_overlapping_bookings(self):
+        schedule = DaySchedule([(540, 720, 1), (600, 630, 2)])
+        self.assertFalse(schedule.is_free(660, 690))
+        self.assertTrue(schedule.is_free(720, 750))
+
+    def test_free_slots(self):
+        schedule = DaySchedule()
+        schedule.add(540, 600, 1)
+        self.assertEqual(schedule.free_slots(60, 480, 660, 30), [480, 600])
+        schedule.discard(1)
+        self.assertEqual(schedule.free_slots(60, 480, 660, 30), [480, 510, 540, 570, 600])
+
+
+# Checks that scheduling_create refuses to double-book a professional.
+class SchedulingAvailabilityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(
+            employee_name="Ana Souza", employee_email="ana@gmail.com",
+            employee_number="(85) 98888-0000", employee_cpf="111.111.111-11",
+        )
+        cls.service = SalonService.objects.create(
+            name_of_service="Escova", value_of_service=Decimal("50.00"), duration_of_service=60,
+        )
+        cls.clients = [
+            Client.objects.create(
+                client_name=f"Cliente Agenda {index}",
+                client_email=f"agenda{index}@gmail.com",
+                client_number=f"(85) 97777-000{index}",
+            )
+            for index in range(3)
+        ]
+        cls.day = date.today() + timedelta(days=1)
+
+    def setUp(self):
+        availability.clear()
+
+    # Books through the service layer, running the on-commit index refresh.
+    def book(self, client, start):
+        with self.captureOnCommitCallbacks(execute=True):
+            return services.scheduling_create(
+                client_id=client.pk, professional_id=self.employee.pk,
+                salon_service_id=self.service.pk, date=self.day, time=start,
+            )
+
+    def test_overlapping_booking_is_rejected(self):
+        self.book(self.clients[0], time(10, 0))
+        with self.assertRaises(ValidationError):
+            self.book(self.clients[1], time(10, 30))
+        self.book(self.clients[2], time(11, 0))
+
+    def test_free_slots_skip_bookings(self):
+        self.book(self.clients[0], time(10, 0))
+        slots = availability.free_slots(professional_id=self.employee.pk, day=self.day, duration=60)
+        self.assertIn(time(9, 0), slots)
+        self.assertNotIn(time(9, 30), slots)
+        self.assertNotIn(time(10, 0), slots)
+        self.assertIn(time(11, 0), slots)
+
+    # Cancelling a booking frees its slot again.
+    def test_cancel_frees_slot(self):
+        scheduling = self.book(self.clients[0], time(10, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            services.scheduling_cancel(scheduling=scheduling)
+        self.assertTrue(availability.is_free(
+            professional_id=self.employee.pk, day=self.day, start_time=time(10, 0), duration=60,
+        ))
+
+    # Each (professional, date) is loaded once, on first use; a write reloads only its own day.
+    def test_days_are_loaded_one_at_a_time(self):
+        self.book(self.clients[0], time(10, 0))
+        with self.assertNumQueries(1):
+            availability.is_free(professional_id=self.employee.pk, day=self.day + timedelta(days=1), start_time=time(10, 0), duration=60)
+        with self.assertNumQueries(0):
+            self.assertFalse(availability.is_free(professional_id=self.employee.pk, day=self.day, start_time=time(10, 0), duration=60))
+            availability.is_free(professional_id=self.employee.pk, day=self.day + timedelta(days=1), start_time=time(10, 0), duration=60)
+
+    # The warm-up loads every upcoming booking once, before the first request of the process.
+    @override_settings(AVAILABILITY_WARM_UP=True)
+    def test_warm_up_before_first_request(self):
+        self.book(self.clients[0], time(10, 0))
+        availability.clear()
+        django_apps.get_app_config('scheduling').ready()
+        self.client.get(reverse('home:home'))
+        with self.assertNumQueries(0):
+            self.assertFalse(availability.is_free(professional_id=self.employee.pk, day=self.day, start_time=time(10, 0), duration=60))
+            self.assertTrue(availability.is_free(professional_id=self.employee.pk, day=self.day + timedelta(days=2), start_time=time(10, 0), duration=60))
+
+        # It runs only once per process.
+        availability.clear()
+        self.client.get(reverse('home:home'))
+        with self.assertNumQueries(1):
+            availability.is_free(professional_id=self.employee.pk, day=self.day, start_time=time(10, 0), duration=60)
+
+    # The free slot search answers a whole week in a fixed number of queries.
+    def test_free_slot_search(self):
+        self.book(self.clients[0], time(10, 0))
+        url = reverse('scheduling:free-slots')
+        params = {
+            'service': self.service.pk,
+            'start': self.day.isoformat(),
+            'end': (self.day + timedelta(days=6)).isoformat(),
+        }
+        with self.assertNumQueries(3):
+            response = self.client.get(url, params)
+        slots = response.json()['slots']
+        self.assertEqual(len(slots), 7)
+        self.assertNotIn('10:00', slots[0]['times'])
+        self.assertIn('10:00', slots[1]['times'])
+
+    def test_free_slot_search_validation(self):
+        url = reverse('scheduling:free-slots')
+        self.assertEqual(self.client.get(url, {'service': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'service': 0}).status_code, 404)
+
+
+# Fires many concurrent bookings at the service layer and counts the outcomes.
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentBookingTests(TransactionTestCase):
+
+    THREADS = 16
+
+    def setUp(self):
+        availability.clear()
+        self.employee = Employee.objects.create(
+            employee_name="Bia Lima", employee_email="bia@gmail.com",
+            employee_number="(85) 96666-0000", employee_cpf="222.222.222-22",
+        )
+        self.service = SalonService.objects.create(
+            name_of_service="Corte", value_of_service=Decimal("40.00"), duration_of_service=60,
+        )
+        self.day = date.today() + timedelta(days=1)
+
+    # Runs every booking at once and returns (successes, validation errors, other exceptions).
+    def run_concurrently(self, bookings):
+        barrier = threading.Barrier(len(bookings))
+        outcomes = []
+
+        def book(kwargs):
+            try:
+                barrier.wait()
+                services.scheduling_create(
+                    professional_id=self.employee.pk, salon_service_id=self.service.pk, date=self.day, **kwargs
+                )
+                outcomes.append('booked')
+            except ValidationError:
+                outcomes.append('rejected')
+            except Exception as error:
+                outcomes.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(kwargs,)) for kwargs in bookings]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return outcomes.count('booked'), outcomes.count('rejected'), [o for o in outcomes if not isinstance(o, str)]
+
+    # Many clients race for the same professional and time: exactly one wins.
+    def test_same_slot_is_booked_once(self):
+        clients = [
+            Client.objects.create(
+                client_name=f"Cliente Corrida {index}",
+                client_email=f"corrida{index}@gmail.com",
+                client_number=f"(85) 95555-{index:04d}",
+            )
+            for index in range(self.THREADS)
+        ]
+        booked, rejected, failures = self.run_concurrently(
+            [{'client_id': client.pk, 'time': time(10, 0)} for client in clients]
+        )
+        self.assertEqual((booked, rejected, failures), (1, self.THREADS - 1, []))
+        self.assertEqual(Scheduling.objects.filter(professional=self.employee, date=self.day).count(), 1)
+
+    # One client submits many different times at once: only one becomes active.
+    def test_same_client_is_booked_once(self):
+        client = Client.objects.create(
+            client_name="Cliente Repetido", client_email="repetido@gmail.com", client_number="(85) 94444-0000",
+        )
+        booked, rejected, failures = self.run_concurrently(
+            [{'client_id': client.pk, 'time': time(8 + index % 12, 0)} for index in range(self.THREADS)]
+        )
+        self.assertEqual((booked, rejected, failures), (1, self.THREADS - 1, []))
+        self.assertEqual(Scheduling.objects.filter(client=client).count(), 1)
+
+    # Concurrent completions of the same booking count its revenue once.
+    def test_same_booking_is_completed_once(self):
+        client = Client.objects.create(
+            client_name="Cliente Concluído", client_email="concluido@gmail.com", client_number="(85) 93333-0000",
+        )
+        scheduling = services.scheduling_create(
+            client_id=client.pk, professional_id=self.employee.pk, salon_service_id=self.service.pk,
+            date=self.day, time=time(10, 0),
+        )
+        barrier = threading.Barrier(self.THREADS)
+        failures = []
+
+        def complete():
+            try:
+                instance = Scheduling.objects.get(pk=scheduling.pk)
+                barrier.wait()
+                services.scheduling_update(scheduling=instance, data={'status': 'Concluído'})
+            except Exception as error:
+                failures.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=complete) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        bucket = DailyRevenue.objects.get(date=self.day, professional=self.employee, salon_service=self.service)
+        self.assertEqual((bucket.completed_count, bucket.revenue), (1, Decimal('40.00')))
+
+
+# Checks the streamed export of the completed schedulings report.
+class CompletedExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def test_export_streams_every_completed_row(self):
+        response = self.client.get(reverse('scheduling:export-completed'))
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(lines[0], 'Data,Horário,Cliente,Profissional,Serviço,Valor,Status')
+        self.assertEqual(len(lines) - 1, Scheduling.objects.filter(status='Concluído').count())
+
+    def test_export_date_range(self):
+        day = date.today() + timedelta(days=1)
+        response = self.client.get(reverse('scheduling:export-completed'), {'start': day, 'end': day})
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        expected = Scheduling.objects.filter(status='Concluído', date=day).count()
+        self.assertEqual(len(lines) - 1, expected)
+        self.assertEqual(self.client.get(reverse('scheduling:export-completed'), {'start': 'x'}).status_code, 400)
+
+    # The "Exportar CSV" link of a date-filtered list.
+    def test_export_single_date(self):
+        day = date.today() + timedelta(days=1)
+        response = self.client.get(reverse('scheduling:export-completed'), {'date': day.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines) - 1, Scheduling.objects.filter(status='Concluído', date=day).count())
+        self.assertIn(f'_{day.isoformat()}.csv', response['Content-Disposition'])
+
+
+# Checks that the daily revenue rollup follows status changes.
+class DailyRevenueTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    # Totals read from the rollup for the whole history.
+    def report_total(self):
+        rows = selectors.revenue_report(
+            start_date=date.today() - timedelta(days=30), end_date=date.today() + timedelta(days=30)
+        )
+        return sum(row['total_completed'] for row in rows), sum((row['total_revenue'] for row in rows), Decimal('0'))
+
+    def test_status_changes_update_rollup(self):
+        rollups.rebuild_daily_revenue()
+        completed, revenue = self.report_total()
+
+        # Completing a booking adds it to its bucket.
+        scheduling = Scheduling.objects.filter(status='Agendado').first()
+        services.scheduling_update(scheduling=scheduling, data={'status': 'Concluído'})
+        self.assertEqual(self.report_total(), (completed + 1, revenue + Decimal('50.00')))
+
+        # Reopening it removes it again.
+        services.scheduling_update(scheduling=scheduling, data={'status': 'Executando'})
+        self.assertEqual(self.report_total(), (completed, revenue))
+
+        # The incrementally maintained rollup matches a full rebuild.
+        before = sorted(DailyRevenue.objects.values_list('date', 'professional_id', 'salon_service_id', 'completed_count', 'revenue'))
+        rollups.rebuild_daily_revenue()
+        after = sorted(DailyRevenue.objects.values_list('date', 'professional_id', 'salon_service_id', 'completed_count', 'revenue'))
+        self.assertEqual([row for row in before if row[3]], after)
+
+    # Deleting a client takes their completed schedulings out; deleting employees merges their buckets into one.
+    def test_deletes_keep_rollup_in_step(self):
+        rollups.rebuild_daily_revenue()
+        completed, revenue = self.report_total()
+
+        client = Scheduling.objects.filter(status='Concluído').first().client
+        client_services.client_delete(client=client)
+        self.assertEqual(self.report_total(), (completed - 1, revenue - Decimal('50.00')))
+
+        # Two professionals with buckets of the same day and service.
+        day = date.today() + timedelta(days=10)
+        service = SalonService.objects.first()
+        professionals = list(Employee.objects.all()[:2])
+        for index, professional in enumerate(professionals):
+            scheduling = Scheduling.objects.create(
+                client=Client.objects.create(
+                    client_name=f"Cliente Extra {index}",
+                    client_email=f"extra{index}@gmail.com",
+                    client_number=f"(85) 92222-000{index}",
+                ),
+                professional=professional, salon_service=service,
+                date=day, time=time(9 + index, 0), status='Agendado',
+            )
+            services.scheduling_update(scheduling=scheduling, data={'status': 'Concluído'})
+        for professional in professionals:
+            employee_services.employee_delete(employee=professional)
+
+        bucket = DailyRevenue.objects.get(date=day, professional=None, salon_service=service)
+        self.assertEqual((bucket.completed_count, bucket.revenue), (2, Decimal('100.00')))
+        self.assertEqual(self.report_total(), (completed + 1, revenue + Decimal('50.00')))
+
+        # Further changes reach the single unassigned bucket.
+        services.scheduling_update(scheduling=Scheduling.objects.get(date=day, time=time(9, 0)), data={'status': 'Executando'})
+        bucket.refresh_from_db()
+        self.assertEqual(bucket.completed_count, 1)
+
+        before = sorted(DailyRevenue.objects.filter(completed_count__gt=0).values_list(
+            'date', 'professional_id', 'salon_service_id', 'completed_count', 'revenue'
+        ), key=repr)
+        rollups.rebuild_daily_revenue()
+        after = sorted(DailyRevenue.objects.values_list(
+            'date', 'professional_id', 'salon_service_id', 'completed_count', 'revenue'
+        ), key=repr)
+        self.assertEqual(before, after)
+
+    def test_revenue_report_view(self):
+        rollups.rebuild_daily_revenue()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('scheduling:revenue-report'), {
+                'group': 'professional',
+                'start': date.today().isoformat(),
+                'end': (date.today() + timedelta(days=5)).isoformat(),
+            })
+        self.assertContains(response, "Profissional 1")
+
+
+# Checks the archival of old schedulings and the reads that reach into the archive.
+class SchedulingArchiveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+        # Moves the first eight schedulings two years back: two of each status.
+        cls.old_day = date.today() - timedelta(days=730)
+        old_ids = list(Scheduling.objects.order_by('id').values_list('id', flat=True)[:8])
+        Scheduling.objects.filter(id__in=old_ids).update(date=cls.old_day)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_moves_only_old_final_schedulings(self):
+        rollups.rebuild_daily_revenue()
+        revenue = sorted(DailyRevenue.objects.values_list('date', 'completed_count', 'revenue'))
+
+        moved = archive_schedulings(before=date.today() - timedelta(days=365), batch_size=3)
+        self.assertEqual(moved, 4)
+        self.assertEqual(ArchivedScheduling.objects.filter(status__in=['Concluído', 'Cancelado']).count(), 4)
+
+        # Active schedulings stay in the live table, however old.
+        self.assertEqual(Scheduling.objects.filter(date=self.old_day).count(), 4)
+        self.assertFalse(Scheduling.objects.filter(date=self.old_day, status__in=['Concluído', 'Cancelado']).exists())
+
+        # A rebuild of the rollup still counts the archived rows.
+        rollups.rebuild_daily_revenue()
+        self.assertEqual(sorted(DailyRevenue.objects.values_list('date', 'completed_count', 'revenue')), revenue)
+
+    def test_completed_report_reads_archive_only_when_needed(self):
+        completed = Scheduling.objects.filter(status='Concluído').count()
+        # Nothing archived yet: the whole report reads the live table.
+        self.assertIs(selectors.list_completed_only().model, Scheduling)
+        archive_schedulings(before=date.today() - timedelta(days=365))
+
+        # The whole report and old days read the history view; recent days read the live table.
+        self.assertEqual(selectors.list_completed_only().count(), completed)
+        self.assertIs(selectors.list_completed_only().model, SchedulingHistory)
+        self.assertEqual(selectors.list_completed_only(date=self.old_day.isoformat()).count(), 2)
+        self.assertIs(selectors.list_completed_only(date=date.today().isoformat()).model, Scheduling)
+        self.assertIs(selectors.list_completed_only(start_date=self.old_day).model, SchedulingHistory)
+
+        # Archived rows are listed without the edit and cancel actions.
+        response = self.client.get(reverse('scheduling:list-completed-only'), {'date': self.old_day.isoformat()})
+        self.assertContains(response, "Arquivado", count=2)
+        self.assertNotContains(response, "Editar")
+
+
+# Checks the status state machine and the bulk transition.
+class StatusTransitionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings(12)
+
+    # An update that changes nothing reads and writes nothing; a status change writes only its columns.
+    def test_update_writes_only_changed_fields(self):
+        scheduling = Scheduling.objects.filter(status='Agendado').first()
+        with CaptureQueriesContext(connection) as queries:
+            services.scheduling_update(scheduling=scheduling, data={'status': 'Agendado', 'date': scheduling.date, 'time': scheduling.time})
+        self.assertFalse([query for query in queries if 'SAVEPOINT' not in query['sql']])
+        with CaptureQueriesContext(connection) as queries:
+            services.scheduling_update(scheduling=scheduling, data={'status': 'Executando', 'time': scheduling.time})
+        update = next(query['sql'] for query in queries if query['sql'].startswith('UPDATE "scheduling" '))
+        self.assertNotIn('"time"', update)
+        self.assertEqual(Scheduling.objects.get(pk=scheduling.pk).status, 'Executando')
+
+    def test_update_rejects_forbidden_transition(self):
+        scheduling = Scheduling.objects.filter(status='Cancelado').first()
+        with self.assertRaises(ValidationError) as raised:
+            services.scheduling_update(scheduling=scheduling, data={'status': 'Concluído'})
+        self.assertIn("cannot move from 'Cancelado' to 'Concluído'", raised.exception.errors[0])
+        self.assertEqual(Scheduling.objects.get(pk=scheduling.pk).status, 'Cancelado')
+
+    def test_bulk_transition_reports_each_id(self):
+        rollups.rebuild_daily_revenue()
+        scheduled = list(Scheduling.objects.filter(status__in=['Agendado', 'Executando']).values_list('pk', flat=True))
+        canceled = Scheduling.objects.filter(status='Cancelado').values_list('pk', flat=True).first()
+        completed = Scheduling.objects.filter(status='Concluído').values_list('pk', flat=True).first()
+
+        # Every row is moved by a single UPDATE of the scheduling table.
+        with CaptureQueriesContext(connection) as queries:
+            results = services.scheduling_bulk_transition(ids=scheduled + [canceled, completed, 0], status='Concluído')
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "scheduling" ')]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual([results[pk] for pk in scheduled], [services.BULK_UPDATED] * len(scheduled))
+        self.assertEqual(results[canceled], services.BULK_NOT_ALLOWED)
+        self.assertEqual(results[completed], services.BULK_UNCHANGED)
+        self.assertEqual(results[0], services.BULK_NOT_FOUND)
+        self.assertFalse(Scheduling.objects.filter(pk__in=scheduled).exclude(status='Concluído').exists())
+
+        # The incrementally updated rollup matches a full rebuild.
+        before = sorted(DailyRevenue.objects.filter(completed_count__gt=0).values_list('date', 'professional_id', 'salon_service_id', 'completed_count', 'revenue'))
+        rollups.rebuild_daily_revenue()
+        after = sorted(DailyRevenue.objects.values_list('date', 'professional_id', 'salon_service_id', 'completed_count', 'revenue'))
+        self.assertEqual(before, after)
+
+    def test_bulk_transition_view(self):
+        ids = list(Scheduling.objects.filter(status='Agendado').values_list('pk', flat=True))
+        response = self.client.post(reverse('scheduling:scheduling-bulk-transition'), {'status': 'Cancelado', 'ids': ids})
+        self.assertEqual(response.json()['updated'], len(ids))
+        self.assertEqual(self.client.post(reverse('scheduling:scheduling-bulk-transition'), {'status': 'Pago', 'ids': ids}).status_code, 400)
+        self.assertEqual(self.client.post(reverse('scheduling:scheduling-bulk-transition'), {'status': 'Cancelado'}).status_code, 400)
 
-# Create your tests here.
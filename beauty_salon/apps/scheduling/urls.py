@@ -1,4 +1,5 @@
 # Django imports.
+from django.conf import settings
 from django.urls import path
 
 # Local application imports.
@@ -7,6 +8,12 @@ from .views import *
 # Define the name of the app
 app_name = 'scheduling'
 
+# Under ASGI the list views are served by their async variants.
+if settings.ASYNC_VIEWS:
+    ScheduledAndCanceledListView = AsyncScheduledAndCanceledListView
+    CompletedAndExecutingListView = AsyncCompletedAndExecutingListView
+    CompletedOnlyListView = AsyncCompletedOnlyListView
+
 # URL patterns for the scheduling app.
 urlpatterns = [
 
@@ -26,7 +33,24 @@ urlpatterns = [
         CompletedOnlyListView.as_view(), 
         name='list-completed-only'
     ),
+    path(
+        'revenue/', 
+        RevenueReportView.as_view(), 
+        name='revenue-report'
+    ),
+    path(
+        'completed/export/', 
+        CompletedExportView.as_view(), 
+        name='export-completed'
+    ),
     
+    # Availability search
+    path(
+        'free-slots/', 
+        FreeSlotSearchView.as_view(), 
+        name='free-slots'
+    ),
+
     # CUD Operations (Create, Update, "Delete")
     path(
         'create/', 
@@ -43,4 +67,9 @@ urlpatterns = [
         SchedulingCancelView.as_view(), 
         name='scheduling-cancel'
     ),
+    path(
+        'transition/', 
+        SchedulingBulkTransitionView.as_view(), 
+        name='scheduling-bulk-transition'
+    ),
 ]
\ No newline at end of file
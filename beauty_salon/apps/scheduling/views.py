@@ -1,15 +1,49 @@
+# Python imports.
+import csv
+from datetime import date, timedelta
+
 # Django imports.
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.views import View
-from django.core.paginator import Paginator
 from django.contrib import messages
 
 # Project imports.
 from .forms import SchedulingForm
 from .logic import services
 from .logic import selectors
+from .logic.pagination import KeysetPaginator
 from .logic.exceptions import ValidationError
 from .models import Scheduling
+from apps.client.models import Client
+from apps.employee.models import Employee
+from apps.salon_service.models import SalonService
+from core.conditional import conditional_by_instance, conditional_by_slice
+from core.pagecache import cache_page_by_version
+
+# Tables whose rows appear on the scheduling lists.
+LIST_MODELS = (Scheduling, Client, Employee, SalonService)
+
+# Change times of a scheduling row and of the rows shown next to it.
+LIST_TIMESTAMPS = ('updated_at', 'client__updated_at', 'professional__updated_at', 'salon_service__updated_at')
+
+# Schedulings each list page is cut from; their newest change and count make the ETag.
+def scheduled_and_canceled_slice(request):
+    return selectors.list_scheduled_and_canceled()
+
+def completed_and_executing_slice(request):
+    return selectors.list_completed_and_executing()
+
+def completed_only_slice(request):
+    return selectors.list_completed_only(date=request.GET.get('date'))
+
+# Longest date range accepted by the free slot search, in days.
+FREE_SLOT_MAX_DAYS = 31
+
+# Most schedulings moved by one bulk transition request.
+BULK_TRANSITION_MAX_IDS = 500
 
 
 # View to display a list of scheduled and canceled schedulings.
@@ -18,6 +52,8 @@ class ScheduledAndCanceledListView(View):
     Handles the display of a list of scheduled and canceled schedulings.
     """
 
+    @conditional_by_slice(scheduled_and_canceled_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
     def get(self, request):
         """
         Handles GET requests to display the paginated list.
@@ -25,20 +61,20 @@ class ScheduledAndCanceledListView(View):
         # Fetches the list of schedulings from the selector.
         scheduling_list = selectors.list_scheduled_and_canceled()
 
-        # Paginates the results, showing 10 items per page.
-        paginator = Paginator(scheduling_list, 10)
+        # Paginates the results by (date, time), showing 10 items per page.
+        paginator = KeysetPaginator(scheduling_list, 10)
 
-        # Gets the current page number from the request.
-        page_number = request.GET.get('page')
+        # Gets the opaque cursor of the current page from the request.
+        cursor = request.GET.get('cursor')
 
         # Gets the page object for the current page.
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginator.get_page(cursor)
 
         # Prepares the context data to be sent to the template.
         context = { 'page_obj': page_obj, 'page_title': 'Agendamentos' }
 
         # Renders the template with the provided context.
-        return render(request, 'scheduling/scheduling_seach.html', context)
+        return TemplateResponse(request, 'scheduling/scheduling_seach.html', context)
 
 
 # View to display a list of completed and executing schedulings.
@@ -47,6 +83,8 @@ class CompletedAndExecutingListView(View):
     Handles the display of a list of completed and in-progress schedulings.
     """
 
+    @conditional_by_slice(completed_and_executing_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
     def get(self, request):
         """
         Handles GET requests to display the paginated list.
@@ -54,20 +92,20 @@ class CompletedAndExecutingListView(View):
         # Fetches the list of schedulings from the selector.
         scheduling_list = selectors.list_completed_and_executing()
 
-        # Paginates the results.
-        paginator = Paginator(scheduling_list, 10)
+        # Paginates the results by (date, time).
+        paginator = KeysetPaginator(scheduling_list, 10)
 
-        # Gets the current page number.
-        page_number = request.GET.get('page')
+        # Gets the cursor of the current page.
+        cursor = request.GET.get('cursor')
 
         # Gets the page object.
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginator.get_page(cursor)
 
         # Prepares the context.
         context = { 'page_obj': page_obj, 'page_title': 'Acompanhamento' }
 
         # Renders the template.
-        return render(request, 'scheduling/scheduling_seach.html', context)
+        return TemplateResponse(request, 'scheduling/scheduling_seach.html', context)
 
 
 # View to display a report of completed schedulings only.
@@ -76,6 +114,8 @@ class CompletedOnlyListView(View):
     Handles the display of a list of completed schedulings, with an optional date filter.
     """
 
+    @conditional_by_slice(completed_only_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
     def get(self, request):
         """
         Handles GET requests to display the paginated and filtered list.
@@ -86,20 +126,224 @@ class CompletedOnlyListView(View):
         # Fetches the filtered list of schedulings.
         scheduling_list = selectors.list_completed_only(date=date_filter)
 
-        # Paginates the results.
-        paginator = Paginator(scheduling_list, 4)
+        # Paginates the results by (date, time).
+        paginator = KeysetPaginator(scheduling_list, 4)
 
-        # Gets the current page number.
-        page_number = request.GET.get('page')
+        # Gets the cursor of the current page.
+        cursor = request.GET.get('cursor')
 
         # Gets the page object.
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginator.get_page(cursor)
 
         # Prepares the context.
         context = { 'page_obj': page_obj, 'page_title': 'Relatório de Agendamentos Concluídos' }
 
         # Renders the template.
-        return render(request, 'scheduling/scheduling_seach.html', context)
+        return TemplateResponse(request, 'scheduling/scheduling_seach.html', context)
+
+
+# Async variants of the list views, routed under ASGI (see settings.ASYNC_VIEWS).
+class AsyncScheduledAndCanceledListView(ScheduledAndCanceledListView):
+    """
+    Reads the same page as ScheduledAndCanceledListView through the async ORM.
+    """
+
+    @conditional_by_slice(scheduled_and_canceled_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
+    async def get(self, request):
+        paginator = KeysetPaginator(selectors.list_scheduled_and_canceled(), 10)
+        page_obj = await paginator.aget_page(request.GET.get('cursor'))
+        context = { 'page_obj': page_obj, 'page_title': 'Agendamentos' }
+        return TemplateResponse(request, 'scheduling/scheduling_seach.html', context)
+
+
+class AsyncCompletedAndExecutingListView(CompletedAndExecutingListView):
+    """
+    Reads the same page as CompletedAndExecutingListView through the async ORM.
+    """
+
+    @conditional_by_slice(completed_and_executing_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
+    async def get(self, request):
+        paginator = KeysetPaginator(selectors.list_completed_and_executing(), 10)
+        page_obj = await paginator.aget_page(request.GET.get('cursor'))
+        context = { 'page_obj': page_obj, 'page_title': 'Acompanhamento' }
+        return TemplateResponse(request, 'scheduling/scheduling_seach.html', context)
+
+
+class AsyncCompletedOnlyListView(CompletedOnlyListView):
+    """
+    Reads the same page as CompletedOnlyListView through the async ORM.
+    """
+
+    @conditional_by_slice(completed_only_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
+    async def get(self, request):
+        # Choosing between the live table and the history view may read the archive boundary.
+        paginator = KeysetPaginator(await sync_to_async(completed_only_slice)(request), 4)
+        page_obj = await paginator.aget_page(request.GET.get('cursor'))
+        context = { 'page_obj': page_obj, 'page_title': 'Relatório de Agendamentos Concluídos' }
+        return TemplateResponse(request, 'scheduling/scheduling_seach.html', context)
+
+
+# View to display revenue per day, professional or service.
+class RevenueReportView(View):
+    """
+    Handles the display of the revenue report, read from the daily rollup.
+    """
+
+    def get(self, request):
+        """
+        Handles GET requests with optional ?start=, ?end= and ?group= (day, professional or service).
+        """
+        # Defaults to the current month.
+        today = date.today()
+        try:
+            start_date = date.fromisoformat(request.GET.get('start') or today.replace(day=1).isoformat())
+            end_date = date.fromisoformat(request.GET.get('end') or today.isoformat())
+        except ValueError:
+            return HttpResponseBadRequest("Dates must use the YYYY-MM-DD format.")
+
+        # Falls back to grouping by day for unknown groupings.
+        group_by = request.GET.get('group')
+        if group_by not in selectors.REVENUE_GROUPS:
+            group_by = 'day'
+
+        # Fetches the aggregated rows from the selector.
+        rows = selectors.revenue_report(start_date=start_date, end_date=end_date, group_by=group_by)
+
+        # Prepares the context.
+        context = {
+            'rows': rows,
+            'group_by': group_by,
+            'start_date': start_date,
+            'end_date': end_date,
+            'total_completed': sum(row['total_completed'] for row in rows),
+            'total_revenue': sum(row['total_revenue'] for row in rows),
+        }
+
+        # Renders the template.
+        return render(request, 'scheduling/revenue_report.html', context)
+
+
+# File-like object whose write() hands the formatted line back to the caller.
+class Echo:
+    def write(self, value):
+        return value
+
+
+# View streaming the completed schedulings report as CSV.
+class CompletedExportView(View):
+    """
+    Streams the completed schedulings, optionally filtered by ?date= or by a
+    ?start=&end= range, as a CSV download. Rows are read in chunks and written
+    as they arrive, so memory stays flat whatever the size of the report.
+    """
+
+    def get(self, request):
+        """
+        Handles GET requests by streaming the CSV file.
+        """
+        # Parses the optional date filters.
+        try:
+            filters = {
+                key: date.fromisoformat(request.GET[param])
+                for key, param in (('date', 'date'), ('start_date', 'start'), ('end_date', 'end'))
+                if request.GET.get(param)
+            }
+        except ValueError:
+            return HttpResponseBadRequest("Dates must use the YYYY-MM-DD format.")
+
+        # Fetches the rows lazily from the selector.
+        rows = selectors.iter_completed_export(**filters)
+
+        # Formats each row into a CSV line as the response is consumed.
+        writer = csv.writer(Echo())
+
+        def lines():
+            # The BOM lets spreadsheet tools detect UTF-8.
+            yield '\ufeff' + writer.writerow([header for _field, header in selectors.EXPORT_COLUMNS])
+            for row in rows:
+                yield writer.writerow(row)
+
+        # Names the file after the exported period.
+        period = '_'.join(value.isoformat() for value in filters.values()) or 'completo'
+        response = StreamingHttpResponse(lines(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="agendamentos_concluidos_{period}.csv"'
+        return response
+
+
+# View returning every open slot for a service over a date range.
+class FreeSlotSearchView(View):
+    """
+    Returns, as JSON, the free start times of each professional for a service
+    between two dates, so the receptionist can pick a slot instead of guessing.
+    """
+
+    def get(self, request):
+        """
+        Handles GET requests with ?service=<id>&start=<date>&end=<date>[&professional=<id>...].
+        """
+        # Collects the validation errors of the query string.
+        errors = []
+
+        # Reads the service and the date range from the query string.
+        try:
+            salon_service_id = int(request.GET.get('service', ''))
+        except ValueError:
+            salon_service_id = None
+            errors.append("A valid service id is required.")
+
+        try:
+            start_date = date.fromisoformat(request.GET.get('start') or date.today().isoformat())
+            end_date = date.fromisoformat(request.GET.get('end') or start_date.isoformat())
+        except ValueError:
+            start_date = end_date = None
+            errors.append("Dates must use the YYYY-MM-DD format.")
+
+        # Reads the optional professional filters.
+        try:
+            professional_ids = [int(pk) for pk in request.GET.getlist('professional')]
+        except ValueError:
+            professional_ids = []
+            errors.append("Professional ids must be integers.")
+
+        # Checks the date range.
+        if start_date and end_date:
+            if end_date < start_date:
+                errors.append("The end date must not be before the start date.")
+            elif end_date - start_date > timedelta(days=FREE_SLOT_MAX_DAYS):
+                errors.append(f"The date range cannot exceed {FREE_SLOT_MAX_DAYS} days.")
+
+        if errors:
+            return JsonResponse({'errors': errors}, status=400)
+
+        # Computes the open slots with the selector.
+        try:
+            slots = selectors.list_free_slots(
+                salon_service_id=salon_service_id,
+                start_date=start_date,
+                end_date=end_date,
+                professional_ids=professional_ids,
+            )
+        except SalonService.DoesNotExist:
+            return JsonResponse({'errors': ["Service not found."]}, status=404)
+
+        # Serializes dates and times as ISO strings.
+        return JsonResponse({
+            'service': salon_service_id,
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'slots': [
+                {
+                    'date': slot['date'].isoformat(),
+                    'professional_id': slot['professional_id'],
+                    'professional_name': slot['professional_name'],
+                    'times': [value.strftime('%H:%M') for value in slot['times']],
+                }
+                for slot in slots
+            ],
+        })
 
 
 # View for creating a new scheduling.
@@ -157,6 +401,7 @@ class SchedulingUpdateView(View):
     Handles the update of an existing scheduling entry.
     """
 
+    @conditional_by_instance(Scheduling, Client, Employee, SalonService)
     def get(self, request, pk: int):
         """
         Handles GET requests by displaying the form pre-filled with existing data.
@@ -225,4 +470,43 @@ class SchedulingCancelView(View):
                 messages.error(request, error_message)
         
         # Redirects to the home page on success.
-        return redirect('home:home')
\ No newline at end of file
+        return redirect('home:home')
+
+
+# View moving many schedulings to one status at once.
+class SchedulingBulkTransitionView(View):
+    """
+    Applies a status transition to every posted scheduling id, e.g. marking the
+    day's bookings as completed, and returns the outcome of each id as JSON.
+    """
+
+    def post(self, request):
+        """
+        Handles POST requests with status=<status> and one or more ids=<id>.
+        """
+        # Reads the target status and the ids from the form data.
+        status = request.POST.get('status', '')
+        try:
+            ids = [int(pk) for pk in request.POST.getlist('ids')]
+        except ValueError:
+            return JsonResponse({'errors': ["Scheduling ids must be integers."]}, status=400)
+
+        # Checks the size of the batch.
+        if not ids:
+            return JsonResponse({'errors': ["At least one scheduling id is required."]}, status=400)
+        if len(ids) > BULK_TRANSITION_MAX_IDS:
+            return JsonResponse({'errors': [f"At most {BULK_TRANSITION_MAX_IDS} schedulings can be moved at once."]}, status=400)
+
+        # Applies the transition with the service.
+        try:
+            results = services.scheduling_bulk_transition(ids=ids, status=status)
+        except ValidationError as e:
+            return JsonResponse({'errors': e.errors}, status=400)
+
+        # Reports each id, in the order it was sent.
+        return JsonResponse({
+            'status': status,
+            'updated': sum(result == services.BULK_UPDATED for result in results.values()),
+            'results': [{'id': pk, 'result': result} for pk, result in results.items()],
+        })
+
@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'beauty_salon.settings')
 
+# Serve the read-heavy pages from their async views (settings.ASYNC_VIEWS).
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+# Persistent connections would be left open by the per-request threads; use per-request or pool.
+os.environ.setdefault('DB_CONNECTION_MODE', 'per-request')
+
 application = get_asgi_application()
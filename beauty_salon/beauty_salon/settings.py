@@ -2,6 +2,7 @@
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
 
 # Middleware definition
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,6 +85,45 @@ DATABASES = {
     }
 }
 
+# How connections are handled, chosen with DB_CONNECTION_MODE:
+# - per-request: a new connection for every request;
+# - persistent: each worker thread keeps its connection for DB_CONN_MAX_AGE seconds,
+#   checked before being reused after an idle period;
+# - pool: Django's connection pool (needs psycopg 3 with psycopg-pool), holding
+#   DB_POOL_MIN_SIZE to DB_POOL_MAX_SIZE connections per process.
+# asgi.py defaults to per-request, since ASGI runs each request in a new thread.
+DB_CONNECTION_MODES = ('per-request', 'persistent', 'pool')
+DB_CONNECTION_MODE = os.getenv('DB_CONNECTION_MODE', 'persistent')
+if DB_CONNECTION_MODE not in DB_CONNECTION_MODES:
+    raise ImproperlyConfigured(f"DB_CONNECTION_MODE must be one of {', '.join(DB_CONNECTION_MODES)}.")
+
+if DB_CONNECTION_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_CONNECTION_MODE == 'pool':
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        },
+    }
+
+# Cache configuration. The local memory cache is per process: deployments with several
+# workers should point CACHE_BACKEND/CACHE_LOCATION to a shared cache (Redis, Memcached).
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'beauty-salon'),
+    }
+}
+
+# Seconds a cached catalog (services, employees) is kept; writes invalidate it earlier.
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', '300'))
+
+# Seconds a rendered list page is kept; writes through the services invalidate it earlier.
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', '300'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
@@ -102,4 +143,38 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Salon opening hours and the step between candidate scheduling slots.
+SALON_OPENING_TIME = os.getenv('SALON_OPENING_TIME', '08:00')
+SALON_CLOSING_TIME = os.getenv('SALON_CLOSING_TIME', '20:00')
+SCHEDULING_SLOT_MINUTES = int(os.getenv('SCHEDULING_SLOT_MINUTES', '30'))
+
+# Loads every upcoming booking into the availability index before the first request of each process;
+# otherwise each (professional, date) is loaded when first checked.
+AVAILABILITY_WARM_UP = os.getenv('AVAILABILITY_WARM_UP', 'False') == 'True'
+
+
+# Routes the home page and the scheduling lists to their async views; asgi.py turns it on.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+# Per-view performance budgets, keyed by URL name. Metrics: queries, sql_ms, template_ms, wall_ms.
+# Uncached list pages spend one query on the ETag state of their slice; the completed report filtered
+# by date may add one for the archive boundary, cached until the next archival. The home page reads
+# each card paginated by cursor with one more query, so its worst case has both cards paginated.
+VIEW_BUDGETS = {
+    'home:home': {'queries': 4},
+    'scheduling:list-scheduled-canceled': {'queries': 2},
+    'scheduling:list-completed-executing': {'queries': 2},
+    'scheduling:list-completed-only': {'queries': 3},
+    'scheduling:free-slots': {'queries': 3},
+    'scheduling:revenue-report': {'queries': 1},
+    'scheduling:scheduling-create': {'queries': 2},
+    'client:client-list': {'queries': 3},
+    'client:client-autocomplete': {'queries': 1},
+    'employee:employee-list': {'queries': 2},
+    'salon_service:list-salon-service': {'queries': 2},
+}
+
+# Raise instead of logging when a view exceeds its budget.
+VIEW_BUDGETS_STRICT = os.getenv('VIEW_BUDGETS_STRICT', 'False') == 'True'
@@ -0,0 +1,52 @@
+# Python imports
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Cache key holding the current data version of a model.
+def _version_key(model) -> str:
+    return f'data-version:{model._meta.label_lower}'
+
+
+# Returns the current data version of a model's table.
+def data_version(model) -> int:
+    """
+    Versions start from the current time in milliseconds, so a version key evicted
+    from the cache never comes back with a number that was already used.
+    """
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+# Moves the data version of each model forward, making every entry built from the old data unreachable.
+def bump_data_version(*models) -> None:
+
+    # Bumps now, for reads later in the same transaction, and again on commit, for entries
+    # cached by concurrent requests from the data that was about to change.
+    def bump():
+        for model in models:
+            try:
+                cache.incr(_version_key(model))
+            except ValueError:
+                cache.set(_version_key(model), time.time_ns() // 1_000_000, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+# Returns the cached value of `name` for the current data version of `model`, building it on a miss.
+def versioned(model, name: str, builder, timeout: int = None):
+    key = f'{model._meta.label_lower}:{name}:v{data_version(model)}'
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, settings.CATALOG_CACHE_TIMEOUT if timeout is None else timeout)
+    return value
@@ -0,0 +1,145 @@
+# Python imports
+import hashlib
+from functools import wraps
+
+# Django imports
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# Project imports
+from core.pagecache import query_digest, versions_key
+
+
+# Newest change time and row count of a queryset, in one aggregate query.
+def slice_state(queryset, timestamp_fields=('updated_at',)) -> tuple:
+    """
+    `timestamp_fields` may follow relations ('client__updated_at') so that a
+    change to a row shown next to the sliced one also moves the time.
+    """
+    newest = _newest_aggregates(timestamp_fields)
+    return _state(queryset.order_by().aggregate(rows=Count('pk'), **newest), newest)
+
+
+# Same as slice_state, through the async ORM.
+async def aslice_state(queryset, timestamp_fields=('updated_at',)) -> tuple:
+    newest = _newest_aggregates(timestamp_fields)
+    return _state(await queryset.order_by().aaggregate(rows=Count('pk'), **newest), newest)
+
+
+# One Max() per timestamp field, by alias.
+def _newest_aggregates(timestamp_fields) -> dict:
+    return {f'newest_{position}': Max(field) for position, field in enumerate(timestamp_fields)}
+
+
+# Reduces the aggregate row to (newest time, row count).
+def _state(row: dict, newest: dict) -> tuple:
+    times = [row[name] for name in newest if row[name] is not None]
+    return (max(times) if times else None), row['rows']
+
+
+# Answers 304 when the validators match the request, or runs the view and attaches them.
+def _conditional_response(request, etag: str, modified, render):
+    response = _not_modified(request, etag, modified)
+    if response is not None:
+        return response
+    return _attach_validators(request, render(), etag, modified)
+
+
+# Returns a 304 (or 412) response when the request's validators match, otherwise None.
+def _not_modified(request, etag: str, modified):
+    last_modified = int(modified.timestamp()) if modified is not None else None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+# Adds the ETag and Last-Modified headers to a successful response.
+def _attach_validators(request, response, etag: str, modified):
+    if request.method in ('GET', 'HEAD') and response.status_code == 200:
+        response.headers.setdefault('ETag', etag)
+        if modified is not None:
+            response.headers.setdefault('Last-Modified', http_date(int(modified.timestamp())))
+    return response
+
+
+# Key of the cached slice state of a request.
+def _slice_key(request, models) -> str:
+    return f'slice-state:{request.resolver_match.view_name}:{query_digest(request)}:{versions_key(models)}'
+
+
+# ETag of a slice: view, query string, data versions, row count and newest change time.
+def _slice_etag(request, models, state: tuple) -> str:
+    """
+    The data versions cover the writes that change a page without moving any
+    updated_at in it, such as archival, so the tag never outlives them.
+    """
+    modified, rows = state
+    stamp = modified.isoformat() if modified is not None else ''
+    tag = f'{request.resolver_match.view_name}:{query_digest(request)}:{versions_key(models)}:{rows}:{stamp}'
+    return quote_etag(hashlib.md5(tag.encode()).hexdigest())
+
+
+# Adds ETag and Last-Modified to a list view's get(), computed from the queried slice.
+def conditional_by_slice(slice_function, *models, timestamp_fields=('updated_at',)):
+    """
+    `slice_function(request)` returns the queryset the page is cut from. Its
+    newest `updated_at`, its row count and the data versions of `models` make
+    the validators; a write through the services moves the versions even when
+    no time in the slice moves. The state is cached
+    under the data versions of `models`, so a repeat request is answered with
+    304 without queries until a write goes through the services. The
+    decorated get() may be sync or async.
+    """
+    def decorator(get):
+        if iscoroutinefunction(get):
+            @wraps(get)
+            async def async_wrapper(view, request, *args, **kwargs):
+                key = await sync_to_async(_slice_key)(request, models)
+                state = await cache.aget(key)
+                if state is None:
+                    # Building the slice may itself read the database (e.g. the archive boundary).
+                    queryset = await sync_to_async(slice_function)(request)
+                    state = await aslice_state(queryset, timestamp_fields)
+                    await cache.aset(key, state, settings.PAGE_CACHE_TIMEOUT)
+
+                etag = await sync_to_async(_slice_etag)(request, models, state)
+                response = _not_modified(request, etag, state[0])
+                if response is not None:
+                    return response
+                return _attach_validators(request, await get(view, request, *args, **kwargs), etag, state[0])
+            return async_wrapper
+
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            key = _slice_key(request, models)
+            state = cache.get(key)
+            if state is None:
+                state = slice_state(slice_function(request), timestamp_fields)
+                cache.set(key, state, settings.PAGE_CACHE_TIMEOUT)
+
+            etag = _slice_etag(request, models, state)
+            return _conditional_response(request, etag, state[0], lambda: get(view, request, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Adds ETag and Last-Modified to a detail view's get(pk), computed from the row's updated_at.
+def conditional_by_instance(model, *models):
+    """
+    The data versions of `models` (the tables that fill the form's choices)
+    are part of the ETag too. An unknown pk runs the view, which answers 404.
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            modified = model._base_manager.filter(pk=kwargs['pk']).values_list('updated_at', flat=True).first()
+            if modified is None:
+                return get(view, request, *args, **kwargs)
+
+            tag = f'{model._meta.label_lower}:{kwargs["pk"]}:{modified.isoformat()}:{versions_key(models)}'
+            etag = quote_etag(hashlib.md5(tag.encode()).hexdigest())
+            return _conditional_response(request, etag, modified, lambda: get(view, request, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,132 @@
+# Python imports
+import io
+
+# Django imports
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# Project imports
+from core.cache import bump_data_version
+from core.jsonstream import iter_json_array
+
+# Rows of one model inserted per statement.
+FIXTURE_BATCH_SIZE = 5000
+
+
+# Loads fixture files by streaming their objects into batched inserts, in a single transaction.
+def load_fixtures(paths, *, batch_size: int = FIXTURE_BATCH_SIZE, use_copy: bool = False,
+                  using: str = DEFAULT_DB_ALIAS) -> dict:
+    """
+    Objects are decoded one at a time and inserted with bulk_create, or with COPY
+    on PostgreSQL when `use_copy` is set. Rows whose primary key already exists
+    are updated, as loaddata does. Foreign keys are checked once at the end and
+    the primary key sequences are reset. Returns the number of rows per model.
+    """
+    connection = connections[using]
+    use_copy = use_copy and connection.vendor == 'postgresql'
+    counts = {}
+
+    # Inserts a batch of objects of one model.
+    def flush(model, objects: list):
+        if not objects:
+            return
+        if use_copy and all(obj.pk is not None for obj in objects):
+            _copy_batch(connection, model, objects)
+        else:
+            _bulk_batch(using, model, objects)
+        counts[model] = counts.get(model, 0) + len(objects)
+
+    with transaction.atomic(using=using):
+
+        # Foreign keys may point to rows later in the file or in a later file.
+        with connection.constraint_checks_disabled():
+            for path in paths:
+                with open(path, encoding='utf-8-sig') as stream:
+                    batches = {}
+                    for deserialized in Deserializer(iter_json_array(stream), using=using):
+                        if deserialized.m2m_data:
+                            raise ValueError(f"{path}: many-to-many data is not supported by the bulk loader.")
+                        obj = deserialized.object
+                        batch = batches.setdefault(type(obj), [])
+                        batch.append(obj)
+                        if len(batch) >= batch_size:
+                            flush(type(obj), batch)
+                            batches[type(obj)] = []
+                    for model, batch in batches.items():
+                        flush(model, batch)
+
+        # Checks every foreign key of the loaded tables at once.
+        connection.check_constraints(table_names=[model._meta.db_table for model in counts])
+
+        # Moves the primary key sequences past the loaded ids.
+        statements = connection.ops.sequence_reset_sql(no_style(), list(counts))
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+        # Invalidates the caches built from the loaded tables.
+        bump_data_version(*counts)
+
+    return counts
+
+
+# Inserts a batch with bulk_create, updating the rows whose primary key already exists.
+def _bulk_batch(using: str, model, objects: list):
+    meta = model._meta
+    update_fields = [field.name for field in meta.local_concrete_fields if not field.primary_key]
+    if update_fields and all(obj.pk is not None for obj in objects):
+        model._base_manager.using(using).bulk_create(
+            objects, update_conflicts=True, unique_fields=[meta.pk.name], update_fields=update_fields,
+        )
+    else:
+        model._base_manager.using(using).bulk_create(objects)
+
+
+# Quotes a value for COPY ... (FORMAT csv): unquoted empty is NULL, quoted empty is ''.
+def _csv_value(value) -> str:
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+# Inserts a batch with COPY into a staging table, then upserts it into the model table.
+def _copy_batch(connection, model, objects: list):
+    meta = model._meta
+    quote = connection.ops.quote_name
+    fields = meta.local_concrete_fields
+    columns = ', '.join(quote(field.column) for field in fields)
+    table = quote(meta.db_table)
+    staging = quote(f'{meta.db_table}_fixture_load')
+
+    # Serializes the batch as CSV, with the values bulk_create would send.
+    data = io.StringIO()
+    for obj in objects:
+        data.write(','.join(
+            _csv_value(field.get_db_prep_save(field.pre_save(obj, True), connection)) for field in fields
+        ))
+        data.write('\n')
+    data.seek(0)
+
+    updates = ', '.join(
+        f'{quote(field.column)} = EXCLUDED.{quote(field.column)}' for field in fields if not field.primary_key
+    )
+    conflict = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TEMPORARY TABLE IF NOT EXISTS {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP')
+        cursor.execute(f'TRUNCATE {staging}')
+        copy_sql = f'COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)'
+
+        # psycopg2 exposes copy_expert, psycopg 3 a copy() context manager.
+        if hasattr(cursor.cursor, 'copy_expert'):
+            cursor.cursor.copy_expert(copy_sql, data)
+        else:
+            with cursor.cursor.copy(copy_sql) as copy:
+                copy.write(data.getvalue())
+
+        cursor.execute(
+            f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} '
+            f'ON CONFLICT ({quote(meta.pk.column)}) {conflict}'
+        )
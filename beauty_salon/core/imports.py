@@ -0,0 +1,154 @@
+# Python imports
+import csv
+import io
+import os
+from itertools import islice
+
+# Django imports
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+# Project imports
+from core.cache import bump_data_version
+from core.jsonstream import iter_json_array
+
+# File formats accepted by the bulk imports.
+IMPORT_FORMATS = ('csv', 'json')
+
+
+# Infers the import format from a file name, or returns None.
+def format_from_name(name: str):
+    extension = os.path.splitext(name or '')[1].lstrip('.').lower()
+    return extension if extension in IMPORT_FORMATS else None
+
+
+# Yields the records of a CSV (with a header row) or JSON array file as dictionaries.
+def iter_records(stream, file_format: str):
+    if file_format == 'csv':
+        for record in csv.DictReader(stream):
+            yield {(key or '').strip().lstrip('\ufeff'): value for key, value in record.items()}
+    elif file_format == 'json':
+        for record in iter_json_array(stream):
+            if not isinstance(record, dict):
+                raise ValueError("Cada item do arquivo JSON deve ser um objeto.")
+            yield record
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {file_format}.")
+
+
+# Runs an import function over an uploaded file; unreadable files raise ValueError.
+def import_upload(upload, import_function) -> dict:
+    file_format = format_from_name(upload.name)
+    if file_format is None:
+        raise ValueError("Envie um arquivo .csv ou .json.")
+
+    # Streams the upload through the import, chunk by chunk.
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        return import_function(iter_records(stream, file_format))
+    except UnicodeDecodeError:
+        raise ValueError("O arquivo deve estar codificado em UTF-8.")
+
+
+# Splits an iterable of records into numbered chunks: lists of (row_number, record).
+def iter_chunks(records, chunk_size: int):
+    numbered = enumerate(records, start=1)
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Reads a field of an imported record as a string.
+def record_value(record: dict, field: str) -> str:
+    value = record.get(field)
+    return '' if value is None else str(value)
+
+
+# Validates, deduplicates and inserts records in chunks: one lookup query and one bulk insert per chunk.
+def import_in_chunks(records, *, model, fields: tuple, validate, conflict_messages: dict, duplicate_messages: dict,
+                     race_message: str, chunk_size: int, start_row: int = 0, on_chunk=None) -> dict:
+    """
+    `validate(**values)` returns (errors, normalized data), as the create services do.
+    `conflict_messages` and `duplicate_messages` map each unique field to the error
+    of a value already stored or repeated inside the file.
+
+    Each chunk is committed in its own transaction and then reported to
+    `on_chunk(last_row, created)`, so an interrupted import can be resumed by
+    passing the last reported row as `start_row`; earlier rows are skipped.
+
+    Returns {'created': int, 'errors': [(row_number, [messages])]}.
+    """
+    created = 0
+    errors = []
+
+    # Values already accepted earlier in the file, to catch repeated rows.
+    seen = {field: set() for field in duplicate_messages}
+
+    for chunk in iter_chunks(records, chunk_size):
+        last_row = chunk[-1][0]
+        chunk = [(row_number, record) for row_number, record in chunk if row_number > start_row]
+        pending = []
+
+        # Applies the field rules of the create service, without touching the database.
+        for row_number, record in chunk:
+            row_errors, data = validate(**{field: record_value(record, field) for field in fields})
+            if not row_errors:
+                row_errors = [message for field, message in duplicate_messages.items() if data[field] in seen[field]]
+            if row_errors:
+                errors.append((row_number, row_errors))
+                continue
+            for field in seen:
+                seen[field].add(data[field])
+            pending.append((row_number, data))
+
+        # Fetches, in one query, the stored rows that collide with any row of the chunk.
+        taken = {field: set() for field in conflict_messages}
+        if pending:
+            lookup = Q()
+            for field in conflict_messages:
+                lookup |= Q(**{f'{field}__in': [data[field] for _, data in pending]})
+            for row in model.objects.filter(lookup).values_list(*conflict_messages):
+                for field, value in zip(conflict_messages, row):
+                    taken[field].add(value)
+
+        new_rows = []
+        for row_number, data in pending:
+            row_errors = [message for field, message in conflict_messages.items() if data[field] in taken[field]]
+            if row_errors:
+                errors.append((row_number, row_errors))
+            else:
+                new_rows.append((row_number, model(**data)))
+
+        inserted = _insert_chunk(model, new_rows, errors, race_message)
+        if inserted:
+            bump_data_version(model)
+        created += inserted
+        if on_chunk is not None and last_row > start_row:
+            on_chunk(last_row, created)
+
+    errors.sort(key=lambda error: error[0])
+    return {'created': created, 'errors': errors}
+
+
+# Inserts a chunk in one statement, falling back to row by row if a concurrent insert collides.
+def _insert_chunk(model, new_rows: list, errors: list, race_message: str) -> int:
+    if not new_rows:
+        return 0
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([instance for _, instance in new_rows])
+        return len(new_rows)
+    except IntegrityError:
+        pass
+
+    created = 0
+    for row_number, instance in new_rows:
+        try:
+            with transaction.atomic():
+                instance.save()
+            created += 1
+        except IntegrityError:
+            errors.append((row_number, [race_message]))
+    return created
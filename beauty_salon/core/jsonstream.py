@@ -0,0 +1,67 @@
+# Python imports
+import json
+
+# Characters skipped before the array opens (a UTF-8 BOM included) and between its items.
+_LEADING = ' \t\r\n\ufeff'
+_SEPARATORS = ' \t\r\n,'
+
+
+# Yields the items of a top-level JSON array one at a time, reading the stream in chunks.
+def iter_json_array(stream, chunk_size: int = 64 * 1024):
+    """
+    Only the item being decoded is held in memory, so arbitrarily large arrays
+    (fixtures, imports) can be processed with flat memory usage.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+
+    # Appends the next chunk, dropping what was already consumed.
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8')
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        # Skips whitespace (and commas, once inside the array).
+        skipped = _SEPARATORS if started else _LEADING
+        while position < len(buffer) and buffer[position] in skipped:
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array.")
+            fill()
+            continue
+
+        # Opens the array.
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError("Expected a JSON array.")
+            started = True
+            position += 1
+            continue
+
+        # Closes the array.
+        if buffer[position] == ']':
+            return
+
+        # Decodes the next item, reading more when it is cut by the end of the buffer.
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+
+        position = end
+        yield item
@@ -0,0 +1,44 @@
+# Standard library imports
+from datetime import date, timedelta
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Project imports
+from apps.scheduling.logic.archive import ARCHIVE_BATCH_SIZE, archive_schedulings
+
+# A custom management command moving old schedulings out of the live table; meant to run from cron.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = (
+        "Moves completed and canceled schedulings older than a cutoff to the archive table. "
+        "Archived rows still appear in the completed report and the revenue rollup."
+    )
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=365, help="Archive schedulings dated more than N days ago.")
+        parser.add_argument("--before", help="Archive schedulings dated before this day (YYYY-MM-DD). Overrides --older-than-days.")
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Rows moved per transaction.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+
+        # Parses the cutoff day.
+        if options["before"]:
+            try:
+                before = date.fromisoformat(options["before"])
+            except ValueError:
+                raise CommandError("Dates must use the YYYY-MM-DD format.")
+        else:
+            before = timezone.localdate() - timedelta(days=options["older_than_days"])
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        # Moves the rows.
+        moved = archive_schedulings(before=before, batch_size=options["batch_size"])
+
+        # Display a success message.
+        self.stdout.write(self.style.SUCCESS(f"{moved} schedulings dated before {before} archived."))
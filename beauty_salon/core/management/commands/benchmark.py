@@ -0,0 +1,180 @@
+# Standard library imports
+import json
+import platform
+import statistics
+import time
+from datetime import date, datetime
+
+# Django imports
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+# Project imports
+from apps.client.models import Client
+from apps.employee.models import Employee
+from apps.salon_service.models import SalonService
+from apps.scheduling.models import Scheduling
+from core.stats import percentile
+
+# Model whose primary keys fill the <int:pk> argument of each namespace.
+PK_MODELS = {
+    "client": Client,
+    "employee": Employee,
+    "salon_service": SalonService,
+    "scheduling": Scheduling,
+}
+
+# Namespaces that are not part of the application.
+SKIPPED_NAMESPACES = {"admin"}
+
+# Cache states each page is measured in: "cold" clears the cache before every request, so the view
+# reads the database; "warm" repeats the request, so it is served from the page and ETag caches.
+PHASES = ("cold", "warm")
+
+
+# Walks the URL configuration and yields (name, pattern) for every named view.
+def iter_named_patterns(patterns, namespace: str = None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if child_namespace in SKIPPED_NAMESPACES:
+                continue
+            yield from iter_named_patterns(pattern.url_patterns, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield (f"{namespace}:{pattern.name}" if namespace else pattern.name), pattern
+
+
+# A custom management command benchmarking every GET page through the Django test client.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = (
+        "Benchmarks every URL in beauty_salon/urls.py, with a cold and a warm cache, and writes p50/p95/p99 "
+        "latency and queries per request to JSON. The cold runs clear the configured cache before every request."
+    )
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Measured requests per URL.")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per URL.")
+        parser.add_argument("--output", help="Path of the JSON report.")
+        parser.add_argument("--compare", help="Previous JSON report to compare against.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+        client = TestClient(raise_request_exception=False)
+        results = {}
+
+        # Benchmarks each URL that answers GET requests, cold then warm.
+        for name, url in self.collect_urls():
+            results[name] = {"url": url}
+            statuses = set()
+            for phase in PHASES:
+                latencies, queries = [], []
+
+                for iteration in range(options["warmup"] + options["requests"]):
+                    if phase == "cold":
+                        cache.clear()
+                    with CaptureQueriesContext(connection) as captured:
+                        start = time.perf_counter()
+                        response = client.get(url)
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+
+                    if iteration >= options["warmup"]:
+                        latencies.append(elapsed_ms)
+                        queries.append(len(captured.captured_queries))
+                        statuses.add(response.status_code)
+
+                latencies.sort()
+                result = results[name][phase] = {
+                    "p50_ms": round(percentile(latencies, 0.50), 3),
+                    "p95_ms": round(percentile(latencies, 0.95), 3),
+                    "p99_ms": round(percentile(latencies, 0.99), 3),
+                    "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+                    "queries": max(queries, default=0),
+                }
+                self.stdout.write(
+                    f"{name:45} {phase:4} p50={result['p50_ms']:9.2f}ms p95={result['p95_ms']:9.2f}ms "
+                    f"p99={result['p99_ms']:9.2f}ms queries={result['queries']}"
+                )
+            results[name]["status"] = sorted(statuses)
+
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "rows": {label: model.objects.count() for label, model in PK_MODELS.items()},
+            "requests_per_url": options["requests"],
+            "results": results,
+        }
+
+        # Writes the report.
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+        # Compares with a previous run.
+        if options["compare"]:
+            self.compare(report, options["compare"])
+
+    # Returns (name, url) for every named GET view, filling path arguments with existing rows.
+    def collect_urls(self) -> list:
+        urls = []
+        for name, pattern in iter_named_patterns(get_resolver().url_patterns):
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None and not hasattr(view_class, "get"):
+                continue
+
+            kwargs = {}
+            if "pk" in pattern.pattern.converters:
+                model = PK_MODELS.get(name.split(":")[0])
+                pk = model.objects.values_list("pk", flat=True).order_by("pk").first() if model else None
+                if pk is None:
+                    self.stdout.write(self.style.WARNING(f"Skipping {name}: no row to address."))
+                    continue
+                kwargs["pk"] = pk
+
+            url = reverse(name, kwargs=kwargs)
+
+            # Endpoints that need query parameters get a representative request.
+            if name == "scheduling:free-slots":
+                service = SalonService.objects.values_list("pk", flat=True).order_by("pk").first()
+                if service is None:
+                    continue
+                url += f"?service={service}&start={date.today().isoformat()}"
+            elif name == "client:client-autocomplete":
+                url += "?q=an"
+
+            urls.append((name, url))
+        return urls
+
+    # Prints the relative change of p50/p95 and the query delta against a previous report.
+    def compare(self, report: dict, path: str):
+        try:
+            with open(path, encoding="utf-8") as previous_file:
+                previous = json.load(previous_file)["results"]
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f"Could not read {path}: {error}")
+
+        self.stdout.write(self.style.WARNING(f"== Compared with {path}"))
+        for name, current in report["results"].items():
+            before = previous.get(name)
+            if not before:
+                continue
+            for phase in PHASES:
+                # Reports written before the cache phases hold a single, uncached measurement.
+                earlier = before.get(phase, before if phase == "cold" else None)
+                if not earlier:
+                    continue
+                changes = []
+                for metric in ("p50_ms", "p95_ms"):
+                    now = current[phase][metric]
+                    delta = (now - earlier[metric]) / earlier[metric] * 100 if earlier[metric] else 0.0
+                    changes.append(f"{metric} {earlier[metric]:.2f} -> {now:.2f} ({delta:+.1f}%)")
+                changes.append(f"queries {earlier['queries']} -> {current[phase]['queries']}")
+                self.stdout.write(f"{name:45} {phase:4} " + ", ".join(changes))
@@ -0,0 +1,141 @@
+# Standard library imports
+import asyncio
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from core.stats import percentile
+
+# Pages served by the async views under ASGI.
+DEFAULT_PATHS = ["/", "/scheduling/", "/scheduling/active/", "/scheduling/completed/"]
+
+
+# Sends one GET over a new connection and returns (status, elapsed seconds).
+async def fetch(host: str, port: int, path: str, timeout: float) -> tuple:
+    start = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+
+        # Reads the rest of the response; the server closes the connection after it.
+        await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - start
+
+
+# Keeps `concurrency` requests in flight until `total` have been sent; returns the per-request outcomes.
+async def run_load(url: str, paths: list, total: int, concurrency: int, timeout: float) -> tuple:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    base = parts.path.rstrip("/")
+    latencies, errors = [], 0
+    queue = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in queue:
+            try:
+                status, elapsed = await fetch(host, port, base + paths[index % len(paths)], timeout)
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+                errors += 1
+                continue
+            if status >= 400:
+                errors += 1
+            else:
+                latencies.append(elapsed * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+# A custom management command comparing the throughput of a WSGI and an ASGI deployment under concurrent load.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = (
+        "Sends concurrent GETs to the home page and the scheduling lists of running servers and reports "
+        "throughput and p50/p95/p99 latency for each. Start the servers first, on the same database, e.g. "
+        "`gunicorn beauty_salon.wsgi -w 4 -b :8000` and `uvicorn beauty_salon.asgi:application --workers 4 "
+        "--port 8001`, then run `benchmarkasgi --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001`."
+    )
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", action="append", required=True, metavar="NAME=URL",
+            help="Server to load, as name=base URL. Repeat to compare servers.",
+        )
+        parser.add_argument("--path", action="append", dest="paths", help="Path to request. Repeatable; defaults to the async pages.")
+        parser.add_argument("--concurrency", type=int, default=200, help="Requests kept in flight.")
+        parser.add_argument("--requests", type=int, default=5000, help="Measured requests per server.")
+        parser.add_argument("--warmup", type=int, default=200, help="Unmeasured requests per server.")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a request counts as failed.")
+        parser.add_argument("--output", help="Path of the JSON report.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, separator, url = target.partition("=")
+            if not separator or not urlsplit(url).hostname:
+                raise CommandError(f"Expected --target name=http://host:port, got {target!r}.")
+            targets.append((name, url))
+
+        paths = options["paths"] or DEFAULT_PATHS
+        results = {}
+
+        # Loads each server in turn, so they do not compete for the database.
+        for name, url in targets:
+            asyncio.run(run_load(url, paths, options["warmup"], options["concurrency"], options["timeout"]))
+            latencies, errors, seconds = asyncio.run(
+                run_load(url, paths, options["requests"], options["concurrency"], options["timeout"])
+            )
+
+            latencies.sort()
+            results[name] = {
+                "url": url,
+                "requests": options["requests"],
+                "errors": errors,
+                "throughput_rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+                "p50_ms": round(percentile(latencies, 0.50), 3),
+                "p95_ms": round(percentile(latencies, 0.95), 3),
+                "p99_ms": round(percentile(latencies, 0.99), 3),
+                "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            }
+            result = results[name]
+            self.stdout.write(
+                f"{name:10} {result['throughput_rps']:9.1f} req/s p50={result['p50_ms']:9.2f}ms "
+                f"p95={result['p95_ms']:9.2f}ms p99={result['p99_ms']:9.2f}ms errors={errors}"
+            )
+
+        # Relative throughput of every server against the first one.
+        baseline_name, baseline = next(iter(results.items()))
+        for name, result in list(results.items())[1:]:
+            if baseline["throughput_rps"]:
+                change = (result["throughput_rps"] - baseline["throughput_rps"]) / baseline["throughput_rps"] * 100
+                self.stdout.write(self.style.WARNING(f"{name} vs {baseline_name}: {change:+.1f}% throughput"))
+
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "concurrency": options["concurrency"],
+            "paths": paths,
+            "results": results,
+        }
+
+        # Writes the report.
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
@@ -0,0 +1,145 @@
+# Standard library imports
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client as TestClient
+
+# Project imports
+from core.stats import percentile
+
+# Pages measured by default: short list requests, where connection setup weighs the most.
+DEFAULT_PATHS = ["/scheduling/", "/client/", "/"]
+
+
+# A custom management command comparing request latency across the database connection modes.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = (
+        "Measures per-request latency of a few pages under each DB_CONNECTION_MODE (per-request, persistent, "
+        "pool), against the configured PostgreSQL database. Each mode runs in its own process, so the "
+        "settings are built exactly as in a deployment. Pool mode needs psycopg 3 and psycopg-pool."
+    )
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode", action="append", dest="modes", choices=settings.DB_CONNECTION_MODES,
+            help="Connection mode to measure. Repeatable; defaults to all of them.",
+        )
+        parser.add_argument("--path", action="append", dest="paths", help="Path to request. Repeatable.")
+        parser.add_argument("--requests", type=int, default=300, help="Measured requests per mode.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per mode.")
+        parser.add_argument("--output", help="Path of the JSON report.")
+        parser.add_argument("--measure", action="store_true", help="Internal: measure the current mode and print JSON.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+        paths = options["paths"] or DEFAULT_PATHS
+        if options["measure"]:
+            self.stdout.write(json.dumps(self.measure(paths, options["requests"], options["warmup"])))
+            return
+
+        if connection.vendor != "postgresql":
+            raise CommandError("The connection benchmark needs the PostgreSQL database.")
+
+        results = {}
+        for mode in options["modes"] or settings.DB_CONNECTION_MODES:
+            result = self.run_mode(mode, paths, options)
+            results[mode] = result
+            if "error" in result:
+                self.stdout.write(self.style.WARNING(f"{mode:12} skipped: {result['error']}"))
+                continue
+            self.stdout.write(
+                f"{mode:12} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+                f"p99={result['p99_ms']:8.2f}ms mean={result['mean_ms']:8.2f}ms "
+                f"connections opened={result['connections_opened']}"
+            )
+
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "paths": paths,
+            "requests_per_mode": options["requests"],
+            "results": results,
+        }
+
+        # Writes the report.
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+    # Runs the measurement of one mode in a child process and returns its result.
+    def run_mode(self, mode: str, paths: list, options: dict) -> dict:
+        command = [
+            sys.executable, sys.argv[0], "benchmarkconnections", "--measure",
+            "--requests", str(options["requests"]), "--warmup", str(options["warmup"]),
+        ]
+        for path in paths:
+            command += ["--path", path]
+
+        child = subprocess.run(
+            command, env={**os.environ, "DB_CONNECTION_MODE": mode}, capture_output=True, text=True,
+        )
+        if child.returncode != 0:
+            error = child.stderr.strip().rpartition("CommandError: ")[2] or f"exit status {child.returncode}"
+            return {"error": " ".join(error.split())}
+        return json.loads(child.stdout.strip().splitlines()[-1])
+
+    # Requests the pages through the full request cycle and times each one.
+    def measure(self, paths: list, total: int, warmup: int) -> dict:
+        client = TestClient()
+        opened = 0
+
+        def count_connection(sender, **kwargs):
+            nonlocal opened
+            opened += 1
+
+        connection_created.connect(count_connection)
+        latencies, statuses = [], set()
+        for iteration in range(warmup + total):
+
+            # A unique query string misses the page and ETag caches, so every request reaches the database.
+            path = paths[iteration % len(paths)]
+            start = time.perf_counter()
+
+            # The test client leaves connections open; a server's handler releases them around each request.
+            close_old_connections()
+            try:
+                response = client.get(path, {"bench": iteration})
+            except Exception as error:
+                raise CommandError(f"{type(error).__name__}: {error}")
+            close_old_connections()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            if iteration == warmup - 1:
+                opened = 0
+            if iteration >= warmup:
+                latencies.append(elapsed_ms)
+                statuses.add(response.status_code)
+        connection_created.disconnect(count_connection)
+
+        # Failed pages would time the error handling, not the connection.
+        failed = [status for status in statuses if status >= 400]
+        if failed:
+            raise CommandError(f"Requests answered with status {failed[0]}.")
+
+        latencies.sort()
+        return {
+            "status": sorted(statuses),
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            "connections_opened": opened,
+        }
@@ -0,0 +1,45 @@
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+# Project imports
+from apps.scheduling.logic import selectors
+from apps.scheduling.logic.pagination import KEYSET_ORDERING
+
+# A custom management command to print the query plan of every scheduling list selector.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = "Prints EXPLAIN ANALYZE (EXPLAIN QUERY PLAN on SQLite) for each scheduling list selector."
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Date (YYYY-MM-DD) used for the list_completed_only filter.")
+        parser.add_argument("--page-size", type=int, default=10, help="Rows fetched per page, as in the list views.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+
+        # Selectors to explain, as the list views call them.
+        queries = {
+            "list_scheduled_and_canceled": selectors.list_scheduled_and_canceled(),
+            "list_completed_and_executing": selectors.list_completed_and_executing(),
+            "list_completed_only": selectors.list_completed_only(),
+        }
+        if options["date"]:
+            queries["list_completed_only(date)"] = selectors.list_completed_only(date=options["date"])
+
+        # ANALYZE runs the query, which is only supported by PostgreSQL.
+        explain_options = {"analyze": True, "buffers": True} if connection.vendor == "postgresql" else {}
+
+        # Explain the first page of each selector, exactly as the keyset paginator reads it.
+        for name, queryset in queries.items():
+            page = queryset.order_by(*KEYSET_ORDERING)[:options["page_size"] + 1]
+
+            self.stdout.write(self.style.WARNING(f"== {name}"))
+            self.stdout.write(str(page.query))
+            self.stdout.write(page.explain(**explain_options))
+            self.stdout.write("")
+
+        # Display a final message.
+        self.stdout.write(self.style.SUCCESS(f"Explained {len(queries)} selectors on {connection.vendor}."))
@@ -0,0 +1,13 @@
+# Project imports
+from apps.client.logic.imports import IMPORT_CHUNK_SIZE, import_clients
+from core.management.imports import ImportCommand
+
+# A custom management command to import clients from a CSV or JSON file.
+class Command(ImportCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = "Imports clients (client_name, client_email, client_number) from a CSV or JSON file, in chunks."
+
+    label = "clients"
+    chunk_size = IMPORT_CHUNK_SIZE
+    import_function = staticmethod(import_clients)
@@ -0,0 +1,16 @@
+# Project imports
+from apps.employee.logic.imports import IMPORT_CHUNK_SIZE, import_employees
+from core.management.imports import ImportCommand
+
+# A custom management command to import employees from a CSV or JSON file.
+class Command(ImportCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = (
+        "Imports employees (employee_name, employee_email, employee_number, employee_cpf) from a CSV or JSON file, "
+        "in chunks, validating CPF check digits."
+    )
+
+    label = "employees"
+    chunk_size = IMPORT_CHUNK_SIZE
+    import_function = staticmethod(import_employees)
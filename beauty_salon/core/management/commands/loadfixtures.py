@@ -1,9 +1,23 @@
 # Standard library imports
 import os
+import time
 
 # Django imports
+from django.conf import settings
 from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import connection
+
+# Project imports
+from apps.client.models import Client
+from apps.employee.models import Employee
+from apps.salon_service.models import SalonService
+from apps.scheduling.models import Scheduling
+from core.cache import bump_data_version
+from core.fixtures import FIXTURE_BATCH_SIZE, load_fixtures
+
+# Ways of inserting the fixture rows.
+LOADERS = ("bulk", "copy", "loaddata")
 
 # A custom management command to load initial data.
 class Command(BaseCommand):
@@ -11,6 +25,14 @@ class Command(BaseCommand):
     # Help message displayed when the command is run with --help.
     help = "Initializes the database with project fixtures."
 
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loader", choices=LOADERS, default="bulk",
+            help="bulk: streamed batches of bulk_create (default); copy: PostgreSQL COPY; loaddata: Django's loaddata.",
+        )
+        parser.add_argument("--batch-size", type=int, default=FIXTURE_BATCH_SIZE, help="Rows per insert statement.")
+
     # The main logic of the command.
     def handle(self, *args, **options):
         
@@ -35,7 +57,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING("Loading fixtures..."))
 
         # Root directory where fixture files are located.
-        fixture_directory = 'beauty_salon/fixtures'
+        fixture_directory = os.path.join(settings.BASE_DIR, 'beauty_salon', 'fixtures')
 
         # List of fixture files to be loaded in the correct order.
         fixture_files = [
@@ -44,27 +66,54 @@ class Command(BaseCommand):
             "salon_service.json",     
             "scheduling.json"   
         ]
+        fixture_paths = [os.path.join(fixture_directory, fixture_name) for fixture_name in fixture_files]
 
-        # Iterate over each fixture file.
-        for fixture_name in fixture_files:
-            # Attempt to load each fixture.
-            try:
-                # Display a message before loading a specific fixture.
-                self.stdout.write(self.style.WARNING(f"Loading fixture: {fixture_name}"))
+        # COPY is only available on PostgreSQL.
+        loader = options["loader"]
+        if loader == "copy" and connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING("COPY needs PostgreSQL; using bulk inserts instead."))
+            loader = "bulk"
 
-                # Construct the full path to the fixture file.
-                fixture_path = os.path.join(fixture_directory, fixture_name)
-                
-                # Execute the loaddata command with the full path.
-                call_command("loaddata", fixture_path)
-                
-                # Display a success message for the loaded fixture.
-                self.stdout.write(self.style.SUCCESS(f"Fixture '{fixture_name}' loaded successfully."))
-            # Catch any errors during fixture loading.
+        start = time.perf_counter()
+
+        # Streams every file into batched inserts, in one transaction.
+        if loader in ("bulk", "copy"):
+            try:
+                counts = load_fixtures(fixture_paths, batch_size=options["batch_size"], use_copy=loader == "copy")
             except Exception as e:
                 # Display an error message and exit.
-                self.stdout.write(self.style.ERROR(f"Error loading fixture '{fixture_name}': {e}"))
+                self.stdout.write(self.style.ERROR(f"Error loading fixtures: {e}"))
                 return
+            for model, count in counts.items():
+                self.stdout.write(self.style.SUCCESS(f"{count} {model._meta.label} rows loaded."))
+
+        # Otherwise loads each file with loaddata.
+        else:
+            # Iterate over each fixture file.
+            for fixture_name, fixture_path in zip(fixture_files, fixture_paths):
+                # Attempt to load each fixture.
+                try:
+                    # Display a message before loading a specific fixture.
+                    self.stdout.write(self.style.WARNING(f"Loading fixture: {fixture_name}"))
+
+                    # Execute the loaddata command with the full path.
+                    call_command("loaddata", fixture_path)
+                
+                    # Display a success message for the loaded fixture.
+                    self.stdout.write(self.style.SUCCESS(f"Fixture '{fixture_name}' loaded successfully."))
+                # Catch any errors during fixture loading.
+                except Exception as e:
+                    # Display an error message and exit.
+                    self.stdout.write(self.style.ERROR(f"Error loading fixture '{fixture_name}': {e}"))
+                    return
+
+            # loaddata bypasses the services, so the cached pages and catalogs are invalidated here.
+            bump_data_version(Client, Employee, SalonService, Scheduling)
+
+        self.stdout.write(f"Fixtures loaded in {time.perf_counter() - start:.2f}s.")
+
+        # Backfill the daily revenue rollup from the loaded schedulings.
+        call_command("rebuildrevenue")
 
         # Display a final success message.
         self.stdout.write(self.style.SUCCESS("Database initialization process completed."))
\ No newline at end of file
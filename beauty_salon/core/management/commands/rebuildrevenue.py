@@ -0,0 +1,38 @@
+# Standard library imports
+from datetime import date
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from apps.scheduling.logic.rollups import rebuild_daily_revenue
+
+# A custom management command to backfill the daily revenue rollup.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = "Rebuilds the daily revenue rollup from the completed schedulings."
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First day (YYYY-MM-DD) to rebuild. Defaults to the whole history.")
+        parser.add_argument("--end", help="Last day (YYYY-MM-DD) to rebuild. Defaults to the whole history.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+
+        # Parses the optional date range.
+        try:
+            start_date = date.fromisoformat(options["start"]) if options["start"] else None
+            end_date = date.fromisoformat(options["end"]) if options["end"] else None
+        except ValueError:
+            raise CommandError("Dates must use the YYYY-MM-DD format.")
+
+        # Display a warning before rebuilding.
+        self.stdout.write(self.style.WARNING("Rebuilding the daily revenue rollup..."))
+
+        # Replaces the buckets of the range.
+        created = rebuild_daily_revenue(start_date=start_date, end_date=end_date)
+
+        # Display a success message.
+        self.stdout.write(self.style.SUCCESS(f"Daily revenue rebuilt: {created} buckets written."))
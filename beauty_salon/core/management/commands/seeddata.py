@@ -0,0 +1,169 @@
+# Standard library imports
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+# Project imports
+from apps.client.models import Client
+from apps.employee.models import Employee
+from apps.salon_service.models import SalonService
+from apps.scheduling.logic.rollups import rebuild_daily_revenue
+from apps.scheduling.models import Scheduling
+from core.cache import bump_data_version
+from core.validation import cpf_check_digits, format_cpf
+
+# Row counts of each seeding tier: (schedulings, clients, employees, services).
+TIERS = {
+    "10k": (10_000, 5_000, 20, 15),
+    "100k": (100_000, 50_000, 50, 25),
+    "1m": (1_000_000, 250_000, 100, 40),
+}
+
+# Rows inserted per bulk_create call.
+BATCH_SIZE = 5_000
+
+# Name parts used to build realistic full names.
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela", "João",
+               "Larissa", "Marcos", "Natália", "Otávio", "Patrícia", "Rafael", "Sofia", "Thiago", "Vitória", "Yuri"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+              "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo", "Melo", "Barbosa", "Cardoso", "Rocha", "Dias"]
+SERVICE_NAMES = ["Corte", "Escova", "Hidratação", "Coloração", "Luzes", "Manicure", "Pedicure", "Design de Sobrancelha",
+                 "Maquiagem", "Progressiva"]
+DOMAINS = ["gmail.com", "hotmail.com", "outlook.com"]
+
+
+# Builds a valid CPF, check digits included, from a sequence number.
+def build_cpf(number: int) -> str:
+    base = f"{number:09d}"[-9:]
+    return format_cpf(base + cpf_check_digits(base))
+
+
+# Formats a sequence number as a unique mobile phone number.
+def build_phone(number: int, prefix: int) -> str:
+    digits = f"{prefix:02d}9{number:08d}"
+    return f"({digits[0:2]}) {digits[2:7]}-{digits[7:11]}"
+
+
+# A custom management command to seed the database with synthetic data.
+class Command(BaseCommand):
+
+    # Help message displayed when the command is run with --help.
+    help = "Seeds clients, employees, services and schedulings with realistic status and date distributions."
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument("--tier", choices=TIERS, default="10k", help="Size of the data set to generate.")
+        parser.add_argument("--schedulings", type=int, help="Overrides the number of schedulings of the tier.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, for reproducible data sets.")
+        parser.add_argument("--clear", action="store_true", help="Deletes every existing row before seeding.")
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+        total_schedulings, total_clients, total_employees, total_services = TIERS[options["tier"]]
+        if options["schedulings"]:
+            total_schedulings = options["schedulings"]
+        rng = random.Random(options["seed"])
+
+        # Optionally start from an empty database.
+        if options["clear"]:
+            self.stdout.write(self.style.WARNING("Deleting existing data..."))
+            for model in (Scheduling, Client, Employee, SalonService):
+                model.objects.all().delete()
+        elif Client.objects.filter(client_email__startswith="seed.").exists():
+            raise CommandError("Seed data already exists; run again with --clear.")
+
+        with transaction.atomic():
+            services = self.seed_services(total_services, rng)
+            employees = self.seed_employees(total_employees)
+            clients = self.seed_clients(total_clients, rng)
+            self.seed_schedulings(total_schedulings, clients, employees, services, rng)
+            rebuild_daily_revenue()
+            bump_data_version(Client, Employee, SalonService, Scheduling)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {total_schedulings} schedulings, {total_clients} clients, "
+            f"{total_employees} employees and {total_services} services."
+        ))
+
+    # Inserts the salon services.
+    def seed_services(self, total: int, rng: random.Random) -> list:
+        services = [
+            SalonService(
+                name_of_service=f"{SERVICE_NAMES[index % len(SERVICE_NAMES)]} {index // len(SERVICE_NAMES) + 1}",
+                value_of_service=Decimal(rng.randrange(3000, 40000)) / 100,
+                duration_of_service=rng.choice([30, 30, 45, 60, 60, 90, 120]),
+            )
+            for index in range(total)
+        ]
+        return [service.pk for service in SalonService.objects.bulk_create(services, batch_size=BATCH_SIZE)]
+
+    # Inserts the professionals.
+    def seed_employees(self, total: int) -> list:
+        employees = [
+            Employee(
+                employee_name=f"{FIRST_NAMES[index % 20]} {LAST_NAMES[(index // 20) % 20]} Profissional",
+                employee_email=f"seed.employee{index}@{DOMAINS[index % 3]}",
+                employee_number=build_phone(index, 11),
+                employee_cpf=build_cpf(index + 1),
+            )
+            for index in range(total)
+        ]
+        return [employee.pk for employee in Employee.objects.bulk_create(employees, batch_size=BATCH_SIZE)]
+
+    # Inserts the clients in batches.
+    def seed_clients(self, total: int, rng: random.Random) -> list:
+        pks = []
+        for offset in range(0, total, BATCH_SIZE):
+            batch = [
+                Client(
+                    client_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    client_email=f"seed.client{index}@{DOMAINS[index % 3]}",
+                    client_number=build_phone(index, 85),
+                )
+                for index in range(offset, min(offset + BATCH_SIZE, total))
+            ]
+            pks.extend(client.pk for client in Client.objects.bulk_create(batch))
+        return pks
+
+    # Inserts the schedulings: two years of history plus the next month of bookings.
+    def seed_schedulings(self, total: int, clients: list, employees: list, services: list, rng: random.Random):
+        today = date.today()
+        opening_slots = [time(hour, minute) for hour in range(8, 20) for minute in (0, 30)]
+
+        # Only one active scheduling per client is allowed, so active ones take clients in turn.
+        active_clients = iter(clients)
+
+        for offset in range(0, total, BATCH_SIZE):
+            batch = []
+            for _ in range(min(BATCH_SIZE, total - offset)):
+                day = today + timedelta(days=rng.randint(-730, 30))
+
+                # Past bookings are mostly completed, future ones mostly scheduled.
+                if day < today:
+                    status = "Concluído" if rng.random() < 0.85 else "Cancelado"
+                elif day == today:
+                    status = rng.choices(["Executando", "Agendado", "Concluído", "Cancelado"], [3, 4, 2, 1])[0]
+                else:
+                    status = "Agendado" if rng.random() < 0.9 else "Cancelado"
+
+                if status in ("Agendado", "Executando"):
+                    client_id = next(active_clients, None)
+                    if client_id is None:
+                        status, client_id = "Cancelado", rng.choice(clients)
+                else:
+                    client_id = rng.choice(clients)
+
+                batch.append(Scheduling(
+                    client_id=client_id,
+                    professional_id=rng.choice(employees),
+                    salon_service_id=rng.choice(services),
+                    date=day,
+                    time=rng.choice(opening_slots),
+                    status=status,
+                ))
+            Scheduling.objects.bulk_create(batch)
+            self.stdout.write(f"  {offset + len(batch)}/{total} schedulings")
@@ -0,0 +1,98 @@
+# Standard library imports
+import csv
+import json
+import os
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project imports
+from core.imports import IMPORT_FORMATS, format_from_name, iter_records
+
+
+# Base of the commands importing a CSV or JSON file in chunks, with resumable progress.
+class ImportCommand(BaseCommand):
+
+    # Plural name of the imported rows, for the summary.
+    label = "rows"
+
+    # Default number of rows per chunk.
+    chunk_size = 1000
+
+    # Function running the import: import_function(records, chunk_size=..., start_row=..., on_chunk=...).
+    # Set by each command, wrapped in staticmethod.
+    import_function = None
+
+    # Declares the command line options.
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with a header row) or JSON array of objects.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="File format. Inferred from the extension by default.")
+        parser.add_argument("--chunk-size", type=int, default=self.chunk_size, help="Rows validated and inserted together.")
+        parser.add_argument("--errors", help="Path of a CSV report with the rejected rows.")
+        parser.add_argument(
+            "--progress",
+            help="Checkpoint file. Updated after each committed chunk; if it exists, the import resumes after its last row.",
+        )
+
+    # The main logic of the command.
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or format_from_name(path)
+        if file_format is None:
+            raise CommandError("Could not infer the file format; use --format.")
+
+        # Resumes after the last committed chunk of a previous run on the same file.
+        start_row = self.read_progress(options["progress"], path)
+        if start_row:
+            self.stdout.write(self.style.WARNING(f"Resuming after row {start_row}."))
+
+        # Records the last committed row after each chunk.
+        def on_chunk(last_row, created):
+            if options["progress"]:
+                with open(options["progress"], "w", encoding="utf-8") as checkpoint:
+                    json.dump({"source": os.path.abspath(path), "last_row": last_row}, checkpoint)
+            self.stdout.write(f"  {last_row} rows processed, {created} {self.label} created")
+
+        # Streams the file through the import.
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as source:
+                result = self.import_function(
+                    iter_records(source, file_format),
+                    chunk_size=options["chunk_size"],
+                    start_row=start_row,
+                    on_chunk=on_chunk,
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Could not import {path}: {error}")
+
+        # The checkpoint is only needed while the import is incomplete.
+        if options["progress"] and os.path.exists(options["progress"]):
+            os.remove(options["progress"])
+
+        # Writes the rejected rows, appending to the report of the interrupted run.
+        if options["errors"]:
+            mode = "a" if start_row and os.path.exists(options["errors"]) else "w"
+            with open(options["errors"], mode, encoding="utf-8", newline="") as report:
+                writer = csv.writer(report)
+                if mode == "w":
+                    writer.writerow(["row", "errors"])
+                for row_number, messages in result["errors"]:
+                    writer.writerow([row_number, " | ".join(messages)])
+
+        # Display a summary.
+        self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} {self.label}."))
+        if result["errors"]:
+            self.stdout.write(self.style.WARNING(f"{len(result['errors'])} rows rejected."))
+
+    # Returns the last committed row of a checkpoint for this file, or 0.
+    def read_progress(self, progress_path: str, path: str) -> int:
+        if not progress_path or not os.path.exists(progress_path):
+            return 0
+        try:
+            with open(progress_path, encoding="utf-8") as checkpoint:
+                progress = json.load(checkpoint)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Could not read {progress_path}: {error}")
+        if progress.get("source") != os.path.abspath(path):
+            raise CommandError(f"{progress_path} belongs to the import of {progress.get('source')}.")
+        return int(progress.get("last_row", 0))
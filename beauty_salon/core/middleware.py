@@ -0,0 +1,176 @@
+# Python imports
+import contextvars
+import logging
+import time
+from contextlib import ExitStack
+
+# Django imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+
+# Project imports
+from .stats import request_stats
+
+logger = logging.getLogger('beauty_salon.performance')
+
+# Measurements of the request being processed in the current thread or task.
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+# Raised in strict mode when a view goes over its budget.
+class ViewBudgetExceeded(AssertionError):
+    pass
+
+
+# Counters gathered while a single request is processed.
+class RequestMetrics:
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+    # Database execute wrapper counting queries and their duration.
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - start
+
+
+# Wraps Template.render once so top-level render time is added to the current request.
+def _instrument_templates():
+    original_render = Template.render
+    if getattr(original_render, 'instrumented', False):
+        return
+
+    def render(self, context):
+        metrics = _current.get()
+        if metrics is None:
+            return original_render(self, context)
+
+        # Included templates are already covered by the outer render.
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_seconds += time.perf_counter() - start
+
+    render.instrumented = True
+    Template.render = render
+
+
+# Middleware measuring query count, SQL time, template time and wall time per view.
+class PerformanceMiddleware:
+    """
+    Exposes the measurements as a Server-Timing header, appends them to the rolling
+    request_stats store and checks them against the per-view budgets declared in
+    settings.VIEW_BUDGETS. Budgets are logged when exceeded, or raised as
+    ViewBudgetExceeded when settings.VIEW_BUDGETS_STRICT is on.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        _instrument_templates()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+
+        # Every configured database reports to the same counters.
+        try:
+            with self.measure_queries(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self.finish(request, response, metrics, start)
+
+    # Same as __call__, for the async handler (ASGI with async views).
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+
+        # Database connections belong to a thread: the counters are installed, and removed, in the
+        # thread the async ORM runs this request's queries in.
+        try:
+            stack = await sync_to_async(self.measure_queries)(metrics)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+
+        return self.finish(request, response, metrics, start)
+
+    # Installs the query counter on every configured database.
+    @staticmethod
+    def measure_queries(metrics: RequestMetrics) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    # Records the sample, sets the Server-Timing header and checks the budget.
+    def finish(self, request, response, metrics: RequestMetrics, start: float):
+        wall_seconds = time.perf_counter() - start
+
+        # Names the sample after the resolved URL, falling back to the path.
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else request.path
+
+        sample = {
+            'queries': metrics.queries,
+            'sql_ms': round(metrics.sql_seconds * 1000, 3),
+            'template_ms': round(metrics.template_seconds * 1000, 3),
+            'wall_ms': round(wall_seconds * 1000, 3),
+        }
+        request_stats.record(view_name, sample)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={sample["sql_ms"]};desc="{sample["queries"]} queries"',
+            f'tpl;dur={sample["template_ms"]}',
+            f'total;dur={sample["wall_ms"]}',
+        ])
+
+        self.check_budget(view_name, sample)
+        return response
+
+    # Compares a sample with the budget of its view.
+    def check_budget(self, view_name: str, sample: dict):
+        budget = getattr(settings, 'VIEW_BUDGETS', {}).get(view_name)
+        if not budget:
+            return
+
+        exceeded = [
+            f"{metric}={sample[metric]} (budget {limit})"
+            for metric, limit in budget.items()
+            if sample.get(metric, 0) > limit
+        ]
+        if not exceeded:
+            return
+
+        message = f"View '{view_name}' exceeded its budget: {', '.join(exceeded)}"
+        if getattr(settings, 'VIEW_BUDGETS_STRICT', False):
+            raise ViewBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,95 @@
+# Python imports
+import hashlib
+from functools import wraps
+
+# Django imports
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.response import TemplateResponse
+
+# Project imports
+from core.cache import data_version
+
+# Rendered in place of the CSRF token, which is per visitor, and swapped back on every response.
+CSRF_PLACEHOLDER = '__page_cache_csrf_token__'
+
+
+# Digest of the query string (page, filters), independent of the parameter order.
+def query_digest(request) -> str:
+    query = sorted(request.GET.lists())
+    return hashlib.md5(repr(query).encode()).hexdigest() if query else ''
+
+
+# Joins the data versions of the models into one key part.
+def versions_key(models) -> str:
+    return '.'.join(str(data_version(model)) for model in models)
+
+
+# Builds the cache key of a page: view, query string and data versions.
+def page_cache_key(request, models) -> str:
+    return f'page:{request.resolver_match.view_name}:{query_digest(request)}:{versions_key(models)}'
+
+
+# Caches the rendered page of a view's get() until the data of any of the models changes.
+def cache_page_by_version(*models):
+    """
+    The decorated get(), sync or async, must return a TemplateResponse. Repeat
+    requests for the same page and filters are answered from the cache without
+    touching the database or the template engine; any write that bumps the
+    data version of one of the models makes the cached page unreachable.
+    """
+    def decorator(get):
+        if iscoroutinefunction(get):
+            @wraps(get)
+            async def async_wrapper(view, request, *args, **kwargs):
+                key = await sync_to_async(page_cache_key)(request, models)
+                html = await cache.aget(key)
+                if html is not None:
+                    return _serve(request, HttpResponse(), html)
+
+                response = await get(view, request, *args, **kwargs)
+                if not _cacheable(response):
+                    return response
+                html = await sync_to_async(_render)(response)
+                await cache.aset(key, html, settings.PAGE_CACHE_TIMEOUT)
+                return _serve(request, response, html)
+            return async_wrapper
+
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            key = page_cache_key(request, models)
+            html = cache.get(key)
+            if html is not None:
+                return _serve(request, HttpResponse(), html)
+
+            response = get(view, request, *args, **kwargs)
+            if not _cacheable(response):
+                return response
+            html = _render(response)
+            cache.set(key, html, settings.PAGE_CACHE_TIMEOUT)
+            return _serve(request, response, html)
+        return wrapper
+    return decorator
+
+
+# Only successful template responses are stored.
+def _cacheable(response) -> bool:
+    return isinstance(response, TemplateResponse) and response.status_code == 200
+
+
+# Renders the page with the placeholder token and returns its HTML.
+def _render(response) -> str:
+    response.context_data['csrf_token'] = CSRF_PLACEHOLDER
+    response.render()
+    return response.content.decode(response.charset)
+
+
+# Puts this visitor's token back into the page.
+def _serve(request, response, html: str):
+    if CSRF_PLACEHOLDER in html:
+        html = html.replace(CSRF_PLACEHOLDER, get_token(request))
+    response.content = html
+    return response
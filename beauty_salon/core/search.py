@@ -0,0 +1,194 @@
+# Python imports
+import re
+from dataclasses import dataclass
+
+# Django imports
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+
+# Accented letters folded by the search, in both cases, and what they fold to.
+ACCENTED = 'áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ'
+UNACCENTED = 'aaaaaeeeeiiiiooooouuuucn' * 2
+_FOLD = str.maketrans(ACCENTED, UNACCENTED)
+
+# Joins the columns of the searched document.
+SEPARATOR = " || ' ' || "
+
+# Punctuation of formatted phone numbers and CPFs, ignored by the search.
+_DOCUMENT_PUNCTUATION = '() -.'
+
+# Accents folded per nested replace() chain on SQLite.
+_FOLD_STEP = 16
+
+# The FTS5 trigram tokenizer needs SQLite 3.34; older versions fall back to unindexed lookups.
+TRIGRAM_SQLITE_VERSION = (3, 34, 0)
+
+
+# Describes the searchable columns of a table.
+@dataclass(frozen=True)
+class SearchIndex:
+    table: str
+    text_columns: tuple
+    # Formatted numbers (phone, CPF), searched by their digits.
+    digit_columns: tuple = ()
+
+    # Name of the FTS5 shadow table on SQLite.
+    @property
+    def fts_table(self) -> str:
+        return f'{self.table}_search'
+
+    # Names of the triggers keeping the FTS5 table in sync on SQLite, by event.
+    @property
+    def fts_triggers(self) -> dict:
+        return {event: f'{self.fts_table}_{event}' for event in ('insert', 'delete', 'update')}
+
+    # Name of the trigram index on PostgreSQL.
+    @property
+    def trigram_index(self) -> str:
+        return f'{self.table}_search_trgm_idx'
+
+    # SQL expressions of the indexed values, with an optional row prefix ("new.").
+    def column_sql(self, prefix: str = '') -> list:
+        columns = [f'{prefix}{column}' for column in self.text_columns]
+        for column in self.digit_columns:
+            expression = f'{prefix}{column}'
+            for char in _DOCUMENT_PUNCTUATION:
+                expression = f"replace({expression}, '{char}', '')"
+            columns.append(expression)
+        return columns
+
+    # SQL of the normalized document searched on PostgreSQL; the trigram index is built on it.
+    def document_sql(self) -> str:
+        return f"search_normalize({SEPARATOR.join(self.column_sql())})"
+
+    # SQL of the same document on SQLite, which has no translate(): the accents are folded by replace(),
+    # in nested subqueries so the chain stays within the depth the SQLite parser accepts.
+    def sqlite_document_sql(self, prefix: str = '') -> str:
+        query = f"SELECT lower({SEPARATOR.join(self.column_sql(prefix))}) AS document"
+        pairs = list(zip(ACCENTED, UNACCENTED))
+        for start in range(0, len(pairs), _FOLD_STEP):
+            expression = 'document'
+            for accented, unaccented in pairs[start:start + _FOLD_STEP]:
+                expression = f"replace({expression}, '{accented}', '{unaccented}')"
+            query = f"SELECT {expression} AS document FROM ({query})"
+        return f"({query})"
+
+
+# Lowercases and strips the accents of a text, as search_normalize does in SQL.
+def normalize_search_text(text: str) -> str:
+    return (text or '').lower().translate(_FOLD)
+
+
+# Splits a query into normalized words; runs of words without letters ("(85) 9777-0") become one run of digits.
+def search_terms(query: str) -> list:
+    terms = []
+    number = ''
+    for word in normalize_search_text(query).split() + ['']:
+        if word and not any(char.isalpha() for char in word):
+            number += re.sub(r'[()\-.]', '', word)
+            continue
+        for term in (number, word):
+            if term and term not in terms:
+                terms.append(term)
+        number = ''
+    return terms
+
+
+# Quotes the GLOB wildcards of a term.
+def _glob_literal(term: str) -> str:
+    return re.sub(r'([*?\[])', r'[\1]', term)
+
+
+# Filters a queryset to the rows whose normalized document contains every word of the query.
+def search_filter(queryset, index: SearchIndex, query: str):
+    """
+    Both databases match substrings of the same normalized document: PostgreSQL
+    through the trigram index on search_normalize(...), SQLite through an FTS5
+    table with the trigram tokenizer. Other databases, and SQLite before 3.34,
+    fall back to unindexed icontains lookups, which do not fold accents.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    connection = connections[queryset.db]
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        queryset = queryset.annotate(search_document=RawSQL(index.document_sql(), []))
+        for term in terms:
+            queryset = queryset.filter(search_document__contains=term)
+        return queryset
+
+    if vendor == 'sqlite' and connection.Database.sqlite_version_info >= TRIGRAM_SQLITE_VERSION:
+        # Trigrams need three characters; shorter terms scan the (narrow) FTS5 table.
+        conditions, params = [], []
+        phrases = ['"{}"'.format(term.replace('"', '""')) for term in terms if len(term) >= 3]
+        if phrases:
+            conditions.append(f'{index.fts_table} MATCH %s')
+            params.append(' AND '.join(phrases))
+        for term in terms:
+            if len(term) < 3:
+                conditions.append('document GLOB %s')
+                params.append(f'*{_glob_literal(term)}*')
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {index.fts_table} WHERE {" AND ".join(conditions)}', params
+        ))
+
+    for term in terms:
+        lookup = Q()
+        for column in index.text_columns + index.digit_columns:
+            lookup |= Q(**{f'{column}__icontains': term})
+        queryset = queryset.filter(lookup)
+    return queryset
+
+
+# Recreates the SQLite triggers of an index and refills its FTS5 table, when the triggers are missing.
+def repair_search_index(connection, index: SearchIndex) -> bool:
+    """
+    SQLite drops the triggers of a table whenever a migration rebuilds it (to
+    add, alter or remove a column), and rows written meanwhile never reach the
+    FTS5 table. Runs after every migrate; returns True when it had to repair.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [index.table]
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if set(index.fts_triggers.values()) <= existing:
+            return False
+
+        # The FTS5 table is created by the migrations; until they ran there is nothing to repair.
+        cursor.execute(f"SELECT name FROM pragma_table_info('{index.fts_table}')")
+        if [row[0] for row in cursor.fetchall()] != ['document']:
+            return False
+
+        insert = (
+            f'INSERT INTO {index.fts_table} (rowid, document) '
+            f'VALUES (new.id, {index.sqlite_document_sql("new.")});'
+        )
+        delete = f'DELETE FROM {index.fts_table} WHERE rowid = old.id;'
+        bodies = {'insert': insert, 'delete': delete, 'update': delete + ' ' + insert}
+        for event, name in index.fts_triggers.items():
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {name} AFTER {event.upper()} ON {index.table} BEGIN {bodies[event]} END'
+            )
+
+        # Rows written without the triggers are indexed again.
+        cursor.execute(f'DELETE FROM {index.fts_table}')
+        cursor.execute(
+            f'INSERT INTO {index.fts_table} (rowid, document) SELECT id, {index.sqlite_document_sql()} FROM {index.table}'
+        )
+    return True
+
+
+# Repairs an index after every migrate of its app; called from AppConfig.ready().
+def repair_after_migrate(app_config, index: SearchIndex):
+    def repair(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+        repair_search_index(connections[using], index)
+
+    post_migrate.connect(repair, sender=app_config, weak=False, dispatch_uid=f'repair-search-{index.table}')
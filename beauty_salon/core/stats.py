@@ -0,0 +1,63 @@
+# Python imports
+import threading
+from collections import defaultdict, deque
+
+# Metrics recorded for every request.
+METRICS = ('queries', 'sql_ms', 'template_ms', 'wall_ms')
+
+
+# Returns the value at the given percentile of an already sorted list.
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+# Rolling, in-process store of per-view request metrics.
+class RequestStats:
+    """
+    Keeps the last `window` samples of every view, keyed by URL name, so the cost
+    of each page can be inspected without an external metrics system.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    # Appends one request sample to the view's window.
+    def record(self, view_name: str, sample: dict):
+        with self._lock:
+            self._samples[view_name].append(sample)
+
+    # Returns the raw samples of a view.
+    def samples(self, view_name: str) -> list:
+        with self._lock:
+            return list(self._samples.get(view_name, ()))
+
+    # Summarizes every view as request count plus p50/p95/max of each metric.
+    def summary(self) -> dict:
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+
+        summary = {}
+        for view_name, samples in snapshot.items():
+            summary[view_name] = {'requests': len(samples)}
+            for metric in METRICS:
+                values = sorted(sample[metric] for sample in samples)
+                summary[view_name][metric] = {
+                    'p50': percentile(values, 0.50),
+                    'p95': percentile(values, 0.95),
+                    'max': values[-1],
+                }
+        return summary
+
+    # Drops every sample.
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+# Process-wide request statistics.
+request_stats = RequestStats()
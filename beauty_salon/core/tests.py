@@ -0,0 +1,186 @@
+# Python imports.
+import os
+from datetime import date, time
+
+# Django imports.
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+# Project imports.
+from apps.client.logic import services as client_services
+from apps.client.models import Client
+from apps.scheduling.logic.pagination import NEXT, encode_cursor
+from apps.scheduling.models import Scheduling
+from apps.scheduling.tests import create_schedulings
+from .cache import bump_data_version
+from .fixtures import load_fixtures
+from .middleware import ViewBudgetExceeded
+from .pagecache import CSRF_PLACEHOLDER
+from .stats import request_stats
+
+
+# Checks the request instrumentation middleware.
+class PerformanceMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def setUp(self):
+        cache.clear()
+        request_stats.clear()
+
+    # Each response carries its timings and lands in the stats store.
+    def test_server_timing_and_stats(self):
+        response = self.client.get(reverse('home:home'))
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.assertIn('tpl;dur=', response['Server-Timing'])
+
+        sample = request_stats.samples('home:home')[0]
+        self.assertEqual(sample['queries'], 2)
+        self.assertGreater(sample['template_ms'], 0)
+        self.assertEqual(request_stats.summary()['home:home']['requests'], 1)
+
+    @override_settings(VIEW_BUDGETS={'home:home': {'queries': 1}}, VIEW_BUDGETS_STRICT=True)
+    def test_strict_budget_raises(self):
+        with self.assertRaises(ViewBudgetExceeded):
+            self.client.get(reverse('home:home'))
+
+    @override_settings(VIEW_BUDGETS={'home:home': {'queries': 1}}, VIEW_BUDGETS_STRICT=False)
+    def test_budget_is_logged(self):
+        with self.assertLogs('beauty_salon.performance', level='WARNING'):
+            self.client.get(reverse('home:home'))
+
+    # Every list page stays within the budgets declared in settings.
+    @override_settings(VIEW_BUDGETS_STRICT=True)
+    def test_configured_budgets(self):
+        for view_name in settings.VIEW_BUDGETS:
+            with self.subTest(view=view_name):
+                self.assertLess(self.client.get(reverse(view_name)).status_code, 500)
+
+        # The home page with both cards paginated is its worst case.
+        cursor = encode_cursor(NEXT, (date.today(), time(8, 0), 0))
+        response = self.client.get(reverse('home:home'), {'cursor': cursor, 'completed_cursor': cursor})
+        self.assertLess(response.status_code, 500)
+
+
+# Checks the streaming fixture loader.
+class FixtureLoaderTests(TestCase):
+
+    fixture_paths = [
+        os.path.join(settings.BASE_DIR, 'beauty_salon', 'fixtures', name)
+        for name in ('client.json', 'employee.json', 'salon_service.json', 'scheduling.json')
+    ]
+
+    # Loading twice updates the existing rows, and new rows get ids past the loaded ones.
+    def test_load_is_repeatable_and_resets_sequences(self):
+        counts = load_fixtures(self.fixture_paths, batch_size=7)
+        self.assertEqual(counts[Scheduling], Scheduling.objects.count())
+
+        Client.objects.filter(pk=1).update(client_name="Nome Alterado")
+        load_fixtures(self.fixture_paths, batch_size=7, use_copy=True)
+        self.assertEqual(Scheduling.objects.count(), counts[Scheduling])
+        self.assertNotEqual(Client.objects.get(pk=1).client_name, "Nome Alterado")
+
+        client = Client.objects.create(client_name="Nova Cliente", client_email="nova@gmail.com", client_number="(85) 90000-0001")
+        self.assertGreater(client.pk, max(Client.objects.exclude(pk=client.pk).values_list('pk', flat=True)))
+
+
+# Checks the rendered page cache of the list views.
+class PageCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def setUp(self):
+        cache.clear()
+
+    # A repeat request is served without queries, until a write bumps the data version.
+    def test_repeat_request_is_cached_until_a_write(self):
+        url = reverse('client:client-list')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, "Cliente Teste 0")
+
+        client = Client.objects.order_by('client_name').first()
+        client_services.client_update(client=client, data={'client_name': "Aaa Renomeada"})
+        self.assertContains(self.client.get(url), "Aaa Renomeada")
+
+    # Each page and filter is cached apart.
+    def test_query_string_is_part_of_the_key(self):
+        url = reverse('client:client-list')
+        self.client.get(url)
+        response = self.client.get(url, {'q': "nada encontrado"})
+        self.assertContains(response, "Nenhum cliente encontrado.")
+
+    # The cached page carries the token of the visitor, not a shared one.
+    def test_csrf_token_is_filled_per_request(self):
+        url = reverse('client:client-list')
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        self.assertIn('csrftoken', response.cookies)
+
+
+# Checks the ETag and Last-Modified validators of the list and detail views.
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_schedulings()
+
+    def setUp(self):
+        cache.clear()
+
+    # A matching ETag is answered with 304, without queries once the slice state is cached.
+    def test_list_answers_not_modified(self):
+        url = reverse('scheduling:list-scheduled-canceled')
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    # Renaming a client shown on the list, or deleting a row of it, changes the ETag.
+    def test_list_etag_follows_related_changes_and_deletes(self):
+        url = reverse('scheduling:list-scheduled-canceled')
+        etag = self.client.get(url)['ETag']
+
+        scheduling = Scheduling.objects.filter(status='Agendado').select_related('client').first()
+        client_services.client_update(client=scheduling.client, data={'client_name': "Nome Novo"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        Scheduling.objects.filter(pk=scheduling.pk).delete()
+        cache.clear()
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    # A write that moves no change time in the slice, such as an archival, still changes the ETag.
+    def test_list_etag_follows_data_versions(self):
+        url = reverse('scheduling:list-scheduled-canceled')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        bump_data_version(Scheduling)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    # The update form is validated by the row's own updated_at.
+    def test_detail_view(self):
+        client = Client.objects.first()
+        url = reverse('client:client-update', args=[client.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        client_services.client_update(client=client, data={'client_name': "Outro Nome"})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,53 @@
+# Django imports
+from django.db import models
+
+
+# Keeps the column values a row was read with, so the update services can save only what changed.
+class LoadedValuesMixin:
+    """
+    Forms write the submitted values onto the instance before the services see
+    it, so the instance itself cannot tell what changed; the values read from
+    the database can.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+# Returns the names in `values` whose value differs from the one the instance was read with.
+def changed_fields(instance, values: dict) -> list:
+    """
+    Related objects are compared by primary key. Every field counts as changed
+    on an instance that was not read from the database.
+    """
+    loaded = getattr(instance, '_loaded_values', None)
+    changed = []
+    for name, value in values.items():
+        field = instance._meta.get_field(name)
+        if isinstance(value, models.Model):
+            value = value.pk
+        if loaded is None or field.attname not in loaded or loaded[field.attname] != value:
+            changed.append(name)
+    return changed
+
+
+# Saves only the given fields, plus the auto_now ones; returns False without a query when there are none.
+def save_changed(instance, fields: list) -> bool:
+    if not fields:
+        return False
+
+    meta = instance._meta
+    update_fields = list(fields) + [
+        field.name for field in meta.concrete_fields if getattr(field, 'auto_now', False) and field.name not in fields
+    ]
+    instance.save(update_fields=update_fields)
+
+    # The saved values are now the stored ones.
+    if hasattr(instance, '_loaded_values'):
+        for name in update_fields:
+            attname = meta.get_field(name).attname
+            instance._loaded_values[attname] = getattr(instance, attname)
+    return True
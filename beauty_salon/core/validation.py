@@ -0,0 +1,119 @@
+# Python imports
+import re
+from contextlib import contextmanager
+from functools import reduce
+from operator import or_
+
+# Django imports
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
+# Define allowed email domains for validation.
+ALLOWED_DOMAINS = ["gmail", "hotmail", "outlook"]
+
+
+# Keeps only the digits of a phone number or document.
+def only_digits(value: str) -> str:
+    return re.sub(r'\D', '', value or '')
+
+
+# Formats 11 phone digits as (XX) XXXXX-XXXX.
+def format_phone(digits: str) -> str:
+    return f"({digits[0:2]}) {digits[2:7]}-{digits[7:11]}"
+
+
+# Formats the first digits of a phone number the way stored numbers start: "8597" -> "(85) 97".
+def format_phone_prefix(digits: str) -> str:
+    prefix = f"({digits[0:2]}"
+    if len(digits) > 2:
+        prefix += f") {digits[2:7]}"
+    if len(digits) > 7:
+        prefix += f"-{digits[7:11]}"
+    return prefix
+
+
+# Formats 11 CPF digits as XXX.XXX.XXX-XX.
+def format_cpf(digits: str) -> str:
+    return f"{digits[0:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:11]}"
+
+
+# Computes the two check digits of the first nine CPF digits.
+def cpf_check_digits(base: str) -> str:
+    digits = [int(char) for char in base[:9]]
+    for length in (9, 10):
+        total = sum(digit * weight for digit, weight in zip(digits, range(length + 1, 1, -1)))
+        digits.append(0 if total % 11 < 2 else 11 - total % 11)
+    return f"{digits[9]}{digits[10]}"
+
+
+# Checks the length and the check digits of a CPF; repeated digits (111.111.111-11) are rejected.
+def is_valid_cpf(digits: str) -> bool:
+    if len(digits) != 11 or not digits.isdigit() or len(set(digits)) == 1:
+        return False
+    return digits[9:] == cpf_check_digits(digits)
+
+
+# Normalizes an email address for storage and comparison.
+def normalize_email(email: str) -> str:
+    return (email or '').strip().lower()
+
+
+# Checks whether a name has at least two words.
+def is_full_name(name: str) -> bool:
+    return len((name or '').strip().split()) >= 2
+
+
+# Returns the error message of an email outside the allowed domains, or None.
+def email_domain_error(email: str):
+    try:
+        domain_part = email.split('@')[1]
+        main_domain = domain_part.split('.')[0]
+    # Catches emails without an '@' symbol.
+    except IndexError:
+        return "Formato de E-mail inválido."
+    if main_domain.lower() not in ALLOWED_DOMAINS:
+        return f"O domínio '{main_domain}' não é permitido. Use gmail, hotmail ou outlook."
+    return None
+
+
+# Finds which of the given unique fields are already taken, in a single query.
+def find_conflicts(queryset: QuerySet, values: dict, *, exclude_pk: int = None) -> set:
+    """
+    `values` maps field names to already normalized values. Rows matching any of
+    them are fetched at once and the fields whose stored value collides are returned.
+    """
+    if not values:
+        return set()
+
+    rows = queryset.filter(reduce(or_, (Q(**{field: value}) for field, value in values.items())))
+    if exclude_pk is not None:
+        rows = rows.exclude(pk=exclude_pk)
+
+    conflicts = set()
+    for row in rows.values_list(*values.keys()):
+        conflicts.update(field for field, stored in zip(values.keys(), row) if stored == values[field])
+    return conflicts
+
+
+# Reports a unique value stored by a concurrent request between the conflict check and the enclosed write.
+@contextmanager
+def reporting_conflicts(queryset: QuerySet, values: dict, messages: dict, error_class, *, exclude_pk: int = None):
+    """
+    The unique constraints reject such a write; it is rolled back to a savepoint
+    and `error_class` is raised with the message of each field now in use, as
+    the check would have. Without unique values to write, no savepoint is taken.
+    """
+    if not values:
+        yield
+        return
+
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as error:
+        conflicts = find_conflicts(queryset, values, exclude_pk=exclude_pk)
+        errors = [message for field, message in messages.items() if field in conflicts]
+        if not errors:
+            raise
+        raise error_class(errors) from error
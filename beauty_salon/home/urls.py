@@ -1,9 +1,10 @@
 # home/urls.py
+from django.conf import settings
 from django.urls import path
 from .views import *
 
 app_name = 'home' # Define o nome da aplicação para usar nas URLs
 
 urlpatterns = [
-    path('', HomeView.as_view(), name='home'),
+    path('', (AsyncHomeView if settings.ASYNC_VIEWS else HomeView).as_view(), name='home'),
 ]
\ No newline at end of file
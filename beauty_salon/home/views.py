@@ -1,32 +1,92 @@
-from django.shortcuts import render
-from django.core.paginator import Paginator
+import asyncio
+
+from django.template.response import TemplateResponse
 from django.views import View
 
 # Importe os seletores do seu app de agendamento
 from apps.scheduling.logic import selectors
+from apps.scheduling.logic.pagination import KeysetPaginator
+from apps.scheduling.views import LIST_MODELS, LIST_TIMESTAMPS
+from core.conditional import conditional_by_slice
+from core.pagecache import cache_page_by_version
+
+# Itens por página em cada card do dashboard.
+DASHBOARD_PAGE_SIZE = 3
+
+# Schedulings shown on either card of the dashboard.
+def dashboard_slice(request):
+    return selectors.list_scheduled_and_canceled() | selectors.list_completed_and_executing()
 
 class HomeView(View):
+    @conditional_by_slice(dashboard_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
     def get(self, request):
-        # 1. Busca a lista de agendamentos (Agendados e Cancelados) para o primeiro card
-        scheduled_list = selectors.list_scheduled_and_canceled()
-        
-        # 2. Busca a lista de acompanhamento (Concluídos e Executando) para o segundo card
-        active_list = selectors.list_completed_and_executing()
+        cursor = request.GET.get('cursor')
+        completed_cursor = request.GET.get('completed_cursor')
 
-        # 3. Paginação para a primeira lista (parâmetro 'page')
-        paginator_scheduled = Paginator(scheduled_list, 3) # 5 itens por página
-        page_number_scheduled = request.GET.get('page')
-        page_obj = paginator_scheduled.get_page(page_number_scheduled)
+        # 1. Uma única consulta traz a primeira página e o total de cada card; de um card paginado vem só o total
+        first_pages = selectors.dashboard_first_pages(
+            per_page=DASHBOARD_PAGE_SIZE, paginated=paginated_panels(request),
+        )
+        page_obj, scheduled_total = first_pages['scheduled']
+        completed_page_obj, active_total = first_pages['active']
 
-        # 4. Paginação para a segunda lista (parâmetro 'completed_page')
-        paginator_active = Paginator(active_list, 3) # 5 itens por página
-        page_number_active = request.GET.get('completed_page')
-        completed_page_obj = paginator_active.get_page(page_number_active)
+        # 2. Paginação por cursor do primeiro card (parâmetro 'cursor'), só quando o usuário navega
+        if cursor:
+            paginator_scheduled = KeysetPaginator(selectors.list_scheduled_and_canceled(), DASHBOARD_PAGE_SIZE)
+            page_obj = paginator_scheduled.get_page(cursor)
+
+        # 3. Paginação por cursor do segundo card (parâmetro 'completed_cursor')
+        if completed_cursor:
+            paginator_active = KeysetPaginator(selectors.list_completed_and_executing(), DASHBOARD_PAGE_SIZE)
+            completed_page_obj = paginator_active.get_page(completed_cursor)
 
         context = {
             'page_obj': page_obj,
             'completed_page_obj': completed_page_obj,
+            'scheduled_total': scheduled_total,
+            'active_total': active_total,
         }
         
-        return render(request, 'home/home.html', context)
+        return TemplateResponse(request, 'home/home.html', context)
+
+
+# Variante assíncrona do HomeView, usada sob ASGI (veja settings.ASYNC_VIEWS)
+class AsyncHomeView(HomeView):
+    @conditional_by_slice(dashboard_slice, *LIST_MODELS, timestamp_fields=LIST_TIMESTAMPS)
+    @cache_page_by_version(*LIST_MODELS)
+    async def get(self, request):
+        # 1. As consultas independentes (primeiras páginas e páginas navegadas) rodam juntas
+        first_pages, page_obj, completed_page_obj = await asyncio.gather(
+            selectors.adashboard_first_pages(per_page=DASHBOARD_PAGE_SIZE, paginated=paginated_panels(request)),
+            cursor_page(selectors.list_scheduled_and_canceled(), request.GET.get('cursor')),
+            cursor_page(selectors.list_completed_and_executing(), request.GET.get('completed_cursor')),
+        )
+
+        # 2. Sem cursor, cada card usa a primeira página da consulta do dashboard
+        first_scheduled, scheduled_total = first_pages['scheduled']
+        first_active, active_total = first_pages['active']
+
+        context = {
+            'page_obj': first_scheduled if page_obj is None else page_obj,
+            'completed_page_obj': first_active if completed_page_obj is None else completed_page_obj,
+            'scheduled_total': scheduled_total,
+            'active_total': active_total,
+        }
+
+        return TemplateResponse(request, 'home/home.html', context)
+
+
+# Lê a página de um card pelo cursor, ou None quando o card está na primeira página
+async def cursor_page(queryset, cursor):
+    if not cursor:
+        return None
+    return await KeysetPaginator(queryset, DASHBOARD_PAGE_SIZE).aget_page(cursor)
+
 
+# Cards do dashboard navegados por cursor nesta requisição
+def paginated_panels(request):
+    return tuple(
+        panel for panel, param in (('scheduled', 'cursor'), ('active', 'completed_cursor'))
+        if request.GET.get(param)
+    )